@@ -0,0 +1,292 @@
+"""
+Agent Router for EduMentor AI
+Classifies a query once and dispatches it to specialist agents in parallel
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from bounded_pool import BoundedPool
+from keyword_matcher import get_keyword_matcher
+from session_manager import ConversationMemory
+from subject_classifier import get_subject_classifier
+
+# Phrases asking for practice material; these also get a quiz from the assessment agent
+QUIZ_TRIGGERS = ("quiz", "test me", "practice questions", "practice problems")
+
+
+class _CandidateSession:
+    """Stand-in session for one fan-out call, with its own copy of the conversation"""
+
+    __slots__ = ("conversation",)
+
+    def __init__(self, conversation: ConversationMemory):
+        self.conversation = conversation
+
+    def add_interaction(self, query: str, response: str, metadata: Dict = None):
+        pass  # The router records the winning exchange on the real session
+
+
+class _Dispatch:
+    """One routed query: what is running, what has come back, and when to wake up next"""
+
+    def __init__(self, router: "AgentRouter", query: str, session=None):
+        self.router = router
+        self.query = query
+        self.session = session
+        self.memory = session.conversation if session is not None else None
+        self.plan = router.plan(query)
+        self.start = time.perf_counter()
+        self.deadline = self.start + router.budget
+        self.next_hedge = self.start + router.hedge_after
+        self.backups = self.plan["answer_roles"][1:]
+        self.running: Dict[Any, tuple] = {}  # future -> (role, started)
+        self.answer = self.winner = None
+        self.extras: Dict[str, str] = {}
+        self.timed_out: List[str] = []
+        self.rejected: List[str] = []
+        self.hedged = False
+
+        primary = self.plan["answer_roles"][0]
+        self._launch(primary, router._primary, router._answer, primary, query, self.memory)
+        for role in self.plan["extras"]:
+            self._launch(role, router._primary, router._extra, role, self.plan)
+
+    def _launch(self, role: str, lane: BoundedPool, task, *args):
+        future = lane.submit(task, *args)
+        if future is None:
+            self.rejected.append(role)
+        else:
+            self.running[future] = (role, time.perf_counter())
+
+    def step(self):
+        """(futures, timeout) to wait on next, or None when the query is settled"""
+        router, plan = self.router, self.plan
+        while True:
+            now = time.perf_counter()
+            answering = any(role not in plan["extras"] for role, _ in self.running.values())
+            if self.answer is None and self.backups and (now >= self.next_hedge or not answering):
+                role = self.backups.pop(0)
+                self._launch(role, router._hedges, router._answer, role, self.query, self.memory)
+                self.hedged = True
+                self.next_hedge = now + router.hedge_after
+                continue
+
+            for future, (role, started) in list(self.running.items()):
+                if now >= started + router.timeouts.get(role, router.budget):
+                    del self.running[future]
+                    self.timed_out.append(role)
+
+            waiting_for = [future for future, (role, _) in self.running.items()
+                           if self.answer is None or role in plan["extras"]]
+            if not waiting_for or now >= self.deadline:
+                return None
+
+            wake = min([self.deadline] + [started + router.timeouts.get(role, router.budget)
+                                          for role, started in self.running.values()])
+            if self.answer is None and self.backups:
+                wake = min(wake, self.next_hedge)
+            return waiting_for, max(0.0, wake - now)
+
+    def collect(self, done):
+        """Take in the results of finished futures"""
+        for future in done:
+            role, _ = self.running.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"⚠️ {role} agent failed: {e}")
+                continue
+            if role in self.plan["extras"]:
+                self.extras[role] = result
+            elif self.answer is None and self.router._good(result):
+                self.answer, self.winner = result, role
+
+    def finish(self) -> Dict:
+        """Fall back if nobody answered, record the exchange, and build the result"""
+        router, plan = self.router, self.plan
+        if self.answer is None:
+            # Nobody answered in time: the rule-based base agent always can, instantly
+            from agents import EduMentorAgent
+            fallback = router.agents[router.answer_roles[-1]]
+            self.answer = EduMentorAgent.assist(fallback, self.query, _CandidateSession(ConversationMemory()))
+            self.winner = "fallback"
+
+        merged = [role for role in plan["extras"] if role in self.extras]
+        text = "\n\n".join([self.answer] + [self.extras[role] for role in merged])
+        latency = time.perf_counter() - self.start
+
+        if self.session is not None:
+            self.memory.append({"role": "user", "content": self.query})
+            self.memory.append({"role": "assistant", "content": text})
+            self.session.add_interaction(self.query, text, {
+                "latency": latency, "agent": self.winner,
+                "subject": plan["subjects"][0] if plan["subjects"] else None
+            })
+
+        with router._lock:
+            stats = router.stats
+            stats["requests"] += 1
+            stats["hedged"] += self.hedged
+            stats["timeouts"] += len(self.timed_out)
+            stats["rejected"] += len(self.rejected)
+            stats["fallbacks"] += self.winner == "fallback"
+            stats["answered_by"][self.winner] = stats["answered_by"].get(self.winner, 0) + 1
+
+        return {
+            "answer": text,
+            "agent": self.winner,
+            "intent": plan["intent"],
+            "subjects": plan["subjects"],
+            "merged": merged,
+            "hedged": self.hedged,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "latency_ms": round(latency * 1000, 1)
+        }
+
+
+def _wake_on_any(futures, loop, woken):
+    """Resolve `woken` on `loop` as soon as one of the (thread pool) futures is done"""
+
+    def wake(_):
+        try:
+            loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+        except RuntimeError:
+            pass  # The loop has closed; nobody is waiting any more
+
+    for future in futures:
+        future.add_done_callback(wake)
+
+
+class AgentRouter:
+    """Front door for the specialist agents
+
+    Each query is classified once (intent, subjects, whether it asks for a
+    quiz). The first agent in `answer_roles` is asked straight away; if it
+    has not answered after `hedge_after` seconds (or fails), the next one
+    is asked too, and so on: a hedged request, so one slow upstream does
+    not set the tail latency. The first good answer wins. Extra work such
+    as a quiz runs concurrently and is merged in if it finishes within
+    the `budget`. Each role may have its own timeout; calls past it are
+    abandoned (they finish in the background, their result unused).
+
+    First calls and extras run on one pool of `workers` threads, hedges on
+    a second pool of `hedge_workers`, so a stuck upstream cannot starve
+    the backups. Abandoned calls keep their thread until they return;
+    when a pool has no free thread the call is refused rather than queued
+    (counted in `stats["rejected"]`) and the router moves on to the next
+    agent or the local fallback answer.
+
+    Candidates run against a fork of the session's conversation, so losing
+    answers leave no trace; only the returned exchange is recorded.
+    """
+
+    def __init__(self, agents: Dict[str, Any], answer_roles: Sequence[str] = ("gemini", "tutor", "general"),
+                 budget: float = 5.0, hedge_after: float = 0.5, timeouts: Optional[Dict[str, float]] = None,
+                 workers: int = 8, hedge_workers: Optional[int] = None):
+        self.agents = dict(agents)
+        self.answer_roles = [role for role in answer_roles if role in self.agents]
+        if not self.answer_roles:
+            raise ValueError(f"No answering agent among {list(answer_roles)}")
+        self.budget = budget
+        self.hedge_after = hedge_after
+        self.timeouts = dict(timeouts or {})
+        self.workers = workers
+        self.hedge_workers = hedge_workers or workers
+        self.quiz_matcher = get_keyword_matcher(QUIZ_TRIGGERS)
+        self.stats = {"requests": 0, "hedged": 0, "answered_by": {}, "timeouts": 0, "rejected": 0, "fallbacks": 0}
+        self._primary = BoundedPool(self.workers, "agent-router")
+        self._hedges = BoundedPool(self.hedge_workers, "agent-router-hedge")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls, api_key: Optional[str] = None, **options) -> "AgentRouter":
+        """Router over a TutorAgent and an AssessmentAgent, led by a GeminiAgent when one is usable"""
+        from agents import AssessmentAgent, GeminiAgent, TutorAgent
+
+        agents = {"tutor": TutorAgent(), "assessment": AssessmentAgent()}
+        if api_key:
+            gemini = GeminiAgent(api_key=api_key)
+            if gemini.gemini_available:
+                agents["gemini"] = gemini
+        return cls(agents, **options)
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+    def plan(self, query: str) -> Dict:
+        """Classify the query once: intent, subjects, and which agents to involve"""
+        from agents import INTENT_ROUTER
+
+        match = INTENT_ROUTER.route(query)
+        subjects = get_subject_classifier().classify(query)
+        extras = []
+        if "assessment" in self.agents and self.quiz_matcher.find(query):
+            extras.append("quiz")
+
+        concept = match.entity("concept")
+        return {
+            "intent": match.intent,
+            "subjects": subjects,
+            "topic": concept[0] if concept else (subjects[0] if subjects else query),
+            "answer_roles": list(self.answer_roles),
+            "extras": extras
+        }
+
+    def _answer(self, role: str, query: str, memory: Optional[ConversationMemory]) -> str:
+        conversation = memory.fork() if memory is not None else ConversationMemory()
+        return self.agents[role].assist(query, _CandidateSession(conversation))
+
+    def _extra(self, role: str, plan: Dict) -> str:
+        if role == "quiz":
+            return self.agents["assessment"].generate_content(plan["topic"], content_type="quiz")
+        raise ValueError(f"Unknown extra task: {role}")
+
+    @staticmethod
+    def _good(answer: Any) -> bool:
+        return isinstance(answer, str) and bool(answer.strip())
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def route(self, query: str, session=None) -> Dict:
+        """Answer a query through the agents; returns the answer and how it was produced"""
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        dispatch = _Dispatch(self, query, session)
+        while (pending := dispatch.step()) is not None:
+            futures, timeout = pending
+            done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            dispatch.collect(done)
+        return dispatch.finish()
+
+    def ask(self, query: str, session=None) -> str:
+        """Just the answer text"""
+        return self.route(query, session)["answer"]
+
+    async def route_async(self, query: str, session=None) -> Dict:
+        """route() for asyncio callers: waits on the event loop, holding no extra thread"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        dispatch = _Dispatch(self, query, session)
+        while (pending := dispatch.step()) is not None:
+            futures, timeout = pending
+            woken = loop.create_future()
+            _wake_on_any(futures, loop, woken)
+            try:
+                await asyncio.wait_for(woken, timeout)
+            except asyncio.TimeoutError:
+                pass
+            dispatch.collect([future for future in futures if future.done()])
+        return dispatch.finish()
+
+    def close(self):
+        """Stop the worker threads"""
+        self._primary.close()
+        self._hedges.close()
+
+
+__all__ = ['AgentRouter', 'QUIZ_TRIGGERS']
@@ -4,66 +4,228 @@ Defines specialized educational agents including ROOT_AGENT
 """
 
 import random
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+import model_client
+from session_manager import ConversationMemory
+from subject_classifier import get_subject_classifier
+from intent_router import IntentRouter
+from templates import TemplateRegistry
+from text_utils import tokenize_response
+from tools import format_response_stream, aformat_response_stream
+
+# Defaults copied into every agent's own knowledge base
+DEFAULT_KNOWLEDGE_BASE = {
+    "subjects": ["Math", "Science", "History", "Literature", "Programming"],
+    "levels": ["Beginner", "Intermediate", "Advanced"],
+    "teaching_styles": ["Socratic", "Demonstrative", "Interactive", "Problem-Based"]
+}
+
+# Intent triggers and entities shared by every agent; extend at runtime with
+# INTENT_ROUTER.add_intent / add_entity (the automaton is rebuilt lazily)
+INTENT_ROUTER = IntentRouter()
+INTENT_ROUTER.add_intent("explain", ["explain"])
+INTENT_ROUTER.add_intent("define", ["what is"])
+INTENT_ROUTER.add_intent("instructions", ["how to"])
+INTENT_ROUTER.add_intent("example", ["example"])
+INTENT_ROUTER.add_entities("concept", {
+    "photosynthesis": "Photosynthesis is the process by which plants convert light energy into chemical energy...",
+    "pythagorean theorem": "The Pythagorean theorem states that in a right triangle, the square of the hypotenuse equals the sum of squares of the other two sides...",
+    "french revolution": "The French Revolution (1789-1799) was a period of radical social and political upheaval in France..."
+})
+INTENT_ROUTER.add_entities("example", {
+    "math": "Example: If a triangle has sides 3 and 4, the hypotenuse is √(3² + 4²) = 5",
+    "science": "Example: In photosynthesis, 6CO₂ + 6H₂O → C₆H₁₂O₆ + 6O₂",
+    "history": "Example: The Storming of the Bastille on July 14, 1789, marked a turning point in the French Revolution"
+})
+
+EVALUATION_FEEDBACK = [
+    "Good understanding of the concept",
+    "Clear explanation with room for more detail",
+    "Accurate response demonstrating comprehension",
+    "Well-structured answer with relevant points"
+]
+
 class EduMentorAgent:
     """Base educational AI agent with core capabilities"""
     
+    router = INTENT_ROUTER
+    intent_handlers = {
+        "explain": "_explain_concept",
+        "define": "_define_concept",
+        "instructions": "_provide_instructions",
+        "example": "_give_example"
+    }
+    
+    # Model settings for agents that opt into a pooled model (see use_model)
+    api_key = None
+    model_name = None
+    model_config = None
+    _model = None
+    _knowledge_store = None
+    
+    # Optional retrieval.Retriever over local course material
+    retriever = None
+    retrieval_k = 3
+    retrieval_min_score = 0.2
+    
+    # Upper bound on conversation context sent to a model, in tokens
+    context_token_budget = 1000
+    
+    # Rendered with TemplateRegistry: compiled once, only the requested type is filled
+    content_templates = TemplateRegistry({
+        "lesson": """
+            📚 Lesson: {topic}
+            Level: {level}
+            
+            Learning Objectives:
+            1. Understand key concepts of {topic}
+            2. Apply knowledge to solve problems
+            3. Connect {topic} to real-world applications
+            
+            Key Concepts:
+            • Concept 1: Fundamental principle
+            • Concept 2: Core mechanism
+            • Concept 3: Practical implications
+            
+            Activities:
+            1. Guided practice
+            2. Group discussion
+            3. Assessment quiz
+            """,
+        
+        "quiz": """
+            📝 Quiz: {topic}
+            
+            Question 1: What is the main concept of {topic}?
+            A) Option A
+            B) Option B
+            C) Option C
+            D) Option D
+            
+            Question 2: How does {topic} apply in real life?
+            [Short answer question]
+            
+            Question 3: True or False: {topic} is only theoretical.
+            """,
+        
+        "assignment": """
+            📋 Assignment: {topic}
+            Due: One week from today
+            
+            Task: Research and write about {topic}
+            
+            Requirements:
+            • 500-1000 words
+            • Include at least 3 references
+            • Provide real-world examples
+            • Submit in PDF format
+            
+            Grading Rubric:
+            • Content (40%)
+            • Structure (30%)
+            • Examples (20%)
+            • References (10%)
+            """
+    })
+    
     def __init__(self, name="EduMentor", specialization="General Education"):
         self.name = name
         self.specialization = specialization
         self.knowledge_base = self._initialize_knowledge_base()
-        self.conversation_history = []
+        self.conversation_history = ConversationMemory()  # Used when no session is given
         self.created_at = datetime.now()
         
         print(f"✅ {self.name} Agent initialized ({specialization})")
     
     def _initialize_knowledge_base(self):
         """Initialize agent's knowledge base"""
-        return {
-            "subjects": ["Math", "Science", "History", "Literature", "Programming"],
-            "levels": ["Beginner", "Intermediate", "Advanced"],
-            "teaching_styles": ["Socratic", "Demonstrative", "Interactive", "Problem-Based"]
-        }
+        return {key: list(values) for key, values in DEFAULT_KNOWLEDGE_BASE.items()}
+    
+    @property
+    def knowledge_store(self):
+        """Shared memory-mapped curriculum store (None if none is installed yet)"""
+        if self._knowledge_store is None:
+            from knowledge_store import get_knowledge_store
+            self._knowledge_store = get_knowledge_store()  # Stays None until one can be loaded
+        return self._knowledge_store or None
+    
+    @knowledge_store.setter
+    def knowledge_store(self, store):
+        self._knowledge_store = store
     
-    def assist(self, query):
+    def use_model(self, api_key, model_name=None, **model_config):
+        """Opt this agent into a model handle from the shared client registry"""
+        self.api_key = api_key
+        self.model_name = model_name or self.model_name or model_client.DEFAULT_MODEL
+        self.model_config = model_config or self.model_config
+        self._model = None
+        return self
+    
+    @property
+    def model(self):
+        """Pooled model handle, resolved on first access (None if not opted in)"""
+        if self._model is None and self.api_key:
+            self._model = model_client.registry.get(
+                self.api_key, self.model_name or model_client.DEFAULT_MODEL,
+                **(self.model_config or {})
+            )
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
+    
+    def _memory(self, session=None):
+        """Conversation memory for a session (the agent's own when there is none)"""
+        return session.conversation if session is not None else self.conversation_history
+    
+    def assist(self, query, session=None):
         """Process educational queries"""
-        self.conversation_history.append({"role": "user", "content": query})
-        
-        # Process query based on specialization
-        if "explain" in query.lower():
-            response = self._explain_concept(query)
-        elif "what is" in query.lower():
-            response = self._define_concept(query)
-        elif "how to" in query.lower():
-            response = self._provide_instructions(query)
-        elif "example" in query.lower():
-            response = self._give_example(query)
-        else:
-            response = self._general_response(query)
-        
-        self.conversation_history.append({"role": "assistant", "content": response})
+        memory = self._memory(session)
+        memory.append({"role": "user", "content": query})
+        response = self._local_answer(query)
+        memory.append({"role": "assistant", "content": response})
         return response
     
-    def _explain_concept(self, query):
+    def _local_answer(self, query):
+        """Rule-based answer, without touching conversation memory"""
+        # Process query based on specialization (one scan finds intent and entities)
+        match = self.router.route(query)
+        handler = getattr(self, self.intent_handlers.get(match.intent, "_general_response"))
+        return handler(query, match)
+    
+    def _explain_concept(self, query, match=None):
         """Explain educational concepts"""
-        concepts = {
-            "photosynthesis": "Photosynthesis is the process by which plants convert light energy into chemical energy...",
-            "pythagorean theorem": "The Pythagorean theorem states that in a right triangle, the square of the hypotenuse equals the sum of squares of the other two sides...",
-            "french revolution": "The French Revolution (1789-1799) was a period of radical social and political upheaval in France..."
-        }
+        concept = (match or self.router.route(query)).entity("concept")
+        if concept:
+            return concept[1]
         
-        for concept, explanation in concepts.items():
-            if concept in query.lower():
-                return explanation
+        # Fall back to the (much larger) on-disk curriculum, if one is installed
+        store = self.knowledge_store
+        if store is not None:
+            found = store.find_concept(query)
+            if found:
+                return found[1]
+        
+        retrieved = self._retrieved_answer(query)
+        if retrieved:
+            return retrieved
         
         return f"I'll explain '{query}'. This is a fundamental concept involving key principles that build upon basic understanding."
     
-    def _define_concept(self, query):
+    def _define_concept(self, query, match=None):
         """Define concepts clearly"""
+        retrieved = self._retrieved_answer(query)
+        if retrieved:
+            return retrieved
+        
         return f"Definition: '{query}' refers to a core concept in education that involves understanding fundamental principles."
     
-    def _provide_instructions(self, query):
+    def _provide_instructions(self, query, match=None):
         """Provide step-by-step instructions"""
         steps = [
             "First, understand the problem statement",
@@ -75,22 +237,20 @@ class EduMentorAgent:
         
         return f"For '{query}', follow these steps:\n" + "\n".join([f"{i+1}. {step}" for i, step in enumerate(steps)])
     
-    def _give_example(self, query):
+    def _give_example(self, query, match=None):
         """Provide examples"""
-        examples = {
-            "math": "Example: If a triangle has sides 3 and 4, the hypotenuse is √(3² + 4²) = 5",
-            "science": "Example: In photosynthesis, 6CO₂ + 6H₂O → C₆H₁₂O₆ + 6O₂",
-            "history": "Example: The Storming of the Bastille on July 14, 1789, marked a turning point in the French Revolution"
-        }
-        
-        for category, example in examples.items():
-            if category in query.lower():
-                return example
+        example = (match or self.router.route(query)).entity("example")
+        if example:
+            return example[1]
         
         return f"Here's an example related to '{query}': This demonstrates the practical application of the concept."
     
-    def _general_response(self, query):
+    def _general_response(self, query, match=None):
         """Generate general educational response"""
+        retrieved = self._retrieved_answer(query)
+        if retrieved:
+            return retrieved
+        
         responses = [
             f"Based on your question about '{query}', here's what you need to know...",
             f"That's an excellent question about '{query}'! The key points are...",
@@ -100,6 +260,19 @@ class EduMentorAgent:
         
         return random.choice(responses)
     
+    def _retrieve(self, query):
+        """Course-material passages relevant to the query (none without a retriever)"""
+        if self.retriever is None:
+            return []
+        return self.retriever.retrieve(query, self.retrieval_k, self.retrieval_min_score)
+    
+    def _retrieved_answer(self, query):
+        """Answer directly from the best retrieved passage, if any"""
+        passages = self._retrieve(query)
+        if not passages:
+            return None
+        return f"From the course material ({passages[0]['source']}):\n{passages[0]['text']}"
+    
     def evaluate(self, student_response, correct_answer=None):
         """Evaluate student responses"""
         if correct_answer:
@@ -108,24 +281,51 @@ class EduMentorAgent:
         else:
             score = random.randint(70, 95)
         
-        feedbacks = [
-            "Good understanding of the concept",
-            "Clear explanation with room for more detail",
-            "Accurate response demonstrating comprehension",
-            "Well-structured answer with relevant points"
-        ]
-        
+        return self._evaluation_result(score)
+    
+    def _evaluation_result(self, score):
+        """Result schema shared by evaluate and evaluate_batch"""
         return {
             "score": round(score, 1),
-            "feedback": random.choice(feedbacks),
+            "feedback": random.choice(EVALUATION_FEEDBACK),
             "strengths": ["Conceptual understanding", "Clarity"],
             "areas_for_improvement": ["Add more examples", "Connect to related concepts"]
         }
     
+    def evaluate_batch(self, student_responses, correct_answers=None, metric="jaccard"):
+        """Evaluate many responses at once; returns one evaluate()-style result each
+        
+        Each distinct reference answer is tokenized once for the whole batch
+        and scores are computed with NumPy (grading.batch_similarity).
+        `metric` is "jaccard" (same scores as evaluate) or "cosine".
+        """
+        from grading import batch_similarity
+        
+        if correct_answers is None:
+            correct_answers = [None] * len(student_responses)
+        if len(correct_answers) != len(student_responses):
+            raise ValueError("student_responses and correct_answers must have the same length")
+        
+        graded = [i for i, answer in enumerate(correct_answers) if answer]
+        similarities = batch_similarity(
+            [student_responses[i] for i in graded],
+            [correct_answers[i] for i in graded],
+            metric
+        )
+        scores = (similarities * 100).clip(60, 100)
+        
+        results = [None] * len(student_responses)
+        for i, score in zip(graded, scores.tolist()):
+            results[i] = self._evaluation_result(score)
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = self._evaluation_result(random.randint(70, 95))
+        return results
+    
     def _calculate_similarity(self, response1, response2):
         """Simple similarity calculation"""
-        words1 = set(response1.lower().split())
-        words2 = set(response2.lower().split())
+        words1 = tokenize_response(response1)
+        words2 = tokenize_response(response2)
         
         if not words1 or not words2:
             return 0.0
@@ -137,154 +337,502 @@ class EduMentorAgent:
     
     def generate_content(self, topic, level="Intermediate", content_type="lesson"):
         """Generate educational content"""
-        templates = {
-            "lesson": f"""
-            📚 Lesson: {topic}
-            Level: {level}
-            
-            Learning Objectives:
-            1. Understand key concepts of {topic}
-            2. Apply knowledge to solve problems
-            3. Connect {topic} to real-world applications
-            
-            Key Concepts:
-            • Concept 1: Fundamental principle
-            • Concept 2: Core mechanism
-            • Concept 3: Practical implications
-            
-            Activities:
-            1. Guided practice
-            2. Group discussion
-            3. Assessment quiz
-            """,
-            
-            "quiz": f"""
-            📝 Quiz: {topic}
-            
-            Question 1: What is the main concept of {topic}?
-            A) Option A
-            B) Option B
-            C) Option C
-            D) Option D
-            
-            Question 2: How does {topic} apply in real life?
-            [Short answer question]
-            
-            Question 3: True or False: {topic} is only theoretical.
-            """,
-            
-            "assignment": f"""
-            📋 Assignment: {topic}
-            Due: One week from today
-            
-            Task: Research and write about {topic}
-            
-            Requirements:
-            • 500-1000 words
-            • Include at least 3 references
-            • Provide real-world examples
-            • Submit in PDF format
-            
-            Grading Rubric:
-            • Content (40%)
-            • Structure (30%)
-            • Examples (20%)
-            • References (10%)
-            """
-        }
-        
-        return templates.get(content_type, templates["lesson"])
+        name = content_type if content_type in self.content_templates else "lesson"
+        return self.content_templates.render(name, topic=topic, level=level)
+    
+    def generate_content_many(self, topics, level="Intermediate", content_type="lesson"):
+        """Generate one content type for many topics (e.g. a whole syllabus)"""
+        name = content_type if content_type in self.content_templates else "lesson"
+        return self.content_templates.render_many(name, ({"topic": topic} for topic in topics), level=level)
     
     def get_stats(self):
         """Get agent statistics"""
         return {
             "name": self.name,
             "specialization": self.specialization,
-            "conversations": len(self.conversation_history) // 2,
+            "conversations": self.conversation_history.total_turns // 2,
             "active_since": self.created_at.strftime("%Y-%m-%d %H:%M"),
             "knowledge_subjects": len(self.knowledge_base["subjects"])
         }
 
 
+class SpeculativeAnswer:
+    """Immediate answer to a query, plus a future for the model's answer
+    
+    `text` is what the student sees straight away and `source` says where
+    it came from ("model" if the model beat the deadline, else "cache" or
+    "local"). `final` resolves to the model's answer when it arrives, or
+    to `text` if the model call fails. The conversation only takes in the
+    model's late answer once a consumer receives it: through result() or
+    the `on_final` callback of assist_speculative.
+    """
+    
+    __slots__ = ("text", "source", "final", "latency", "_on_delivery", "_lock")
+    
+    def __init__(self, text, source, final, latency, on_delivery=None):
+        self.text = text
+        self.source = source
+        self.final = final
+        self.latency = latency
+        self._on_delivery = on_delivery
+        self._lock = threading.Lock()
+    
+    @property
+    def speculative(self):
+        return self.source != "model"
+    
+    def result(self, timeout=None):
+        """Best answer: waits for the model's if it is still in flight"""
+        text = self.final.result(timeout)
+        self._delivered(text)
+        return text
+    
+    def _delivered(self, text):
+        """Run the delivery hook, once"""
+        with self._lock:
+            on_delivery, self._on_delivery = self._on_delivery, None
+        if on_delivery is not None:
+            on_delivery(text)
+
+
+_speculation_pool = None
+_speculation_pool_lock = threading.Lock()
+
+def _speculation_executor():
+    """Shared threads running model calls for speculative assists; full means answer locally"""
+    global _speculation_pool
+    if _speculation_pool is None:
+        with _speculation_pool_lock:
+            if _speculation_pool is None:
+                from bounded_pool import BoundedPool
+                _speculation_pool = BoundedPool(16, "speculative-assist")
+    return _speculation_pool
+
+
 class GeminiAgent(EduMentorAgent):
-    """Agent using Google's Gemini API"""
+    """Agent using Google's Gemini API
+    
+    With `fast_path_deadline` (seconds) set, assist() never waits longer
+    than that for the model: see assist_speculative.
+    """
     
-    def __init__(self, api_key=None):
+    model_name = model_client.DEFAULT_MODEL
+    fast_path_deadline = None
+    answer_cache_size = 256
+    
+    def __init__(self, api_key=None, model_name=None, fast_path_deadline=None, **model_config):
         super().__init__(name="GeminiEdu", specialization="Advanced AI Tutoring")
         
-        self.api_key = api_key
         self.gemini_available = False
+        if fast_path_deadline is not None:
+            self.fast_path_deadline = fast_path_deadline
+        self._answer_cache = OrderedDict()  # Normalized query -> last model answer
+        self._answer_cache_lock = threading.Lock()
         
         if api_key and api_key != "DEMO_KEY":
+            # The SDK is imported and configured on first use, not here
+            self.use_model(api_key, model_name, **model_config)
+            self.gemini_available = model_client.sdk_available()
+            if not self.gemini_available:
+                print("⚠️ Gemini initialization failed: google-generativeai is not installed")
+        else:
+            self.api_key = api_key
+            print("⚠️ No valid API key - using fallback mode")
+    
+    @property
+    def model(self):
+        """Gemini model handle from the shared registry, created on first access"""
+        if self._model is None and self.gemini_available:
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
-                self.gemini_available = True
+                self._model = EduMentorAgent.model.fget(self)
                 print("✅ Gemini AI initialized")
             except Exception as e:
                 print(f"⚠️ Gemini initialization failed: {e}")
-        else:
-            print("⚠️ No valid API key - using fallback mode")
+                self.gemini_available = False
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
     
-    def assist(self, query):
-        """Enhanced assistance using Gemini AI"""
+    def _model_prompt(self, query, memory=None):
+        """Prompt sent to Gemini: recent conversation plus retrieved course material"""
+        sections = []
+        
+        history = memory.build_context(self.context_token_budget) if memory else ""
+        if history:
+            sections.append(f"CONVERSATION SO FAR:\n{history}")
+        
+        passages = self._retrieve(query)
+        if passages:
+            material = "\n\n".join(f"[{i+1}] {p['text']}" for i, p in enumerate(passages))
+            sections.append(
+                "Use the following course material to answer the student's question.\n\n"
+                f"COURSE MATERIAL:\n{material}"
+            )
+        
+        if not sections:
+            return query
+        return "\n\n".join(sections + [f"STUDENT QUERY: {query}"])
+    
+    def _remember(self, memory, query, response):
+        """Record a model-answered exchange"""
+        memory.append({"role": "user", "content": query})
+        memory.append({"role": "assistant", "content": response})
+    
+    def assist(self, query, session=None):
+        """Enhanced assistance using Gemini AI
+        
+        With fast_path_deadline set only the immediate answer is returned;
+        a late model answer is cached for the next asker, not delivered.
+        """
+        if self.gemini_available and self.fast_path_deadline is not None:
+            return self.assist_speculative(query, session).text
+        
         if self.gemini_available:
+            memory = self._memory(session)
             try:
-                response = self.model.generate_content(query)
+                response = self.model.generate_content(self._model_prompt(query, memory))
+                self._remember(memory, query, response.text)
+                self._cache_answer(query, response.text)
                 return response.text
             except Exception as e:
                 print(f"⚠️ Gemini API error: {e}")
         
         # Fallback to parent class
-        return super().assist(query)
+        return super().assist(query, session)
+    
+    def _cache_answer(self, query, text):
+        with self._answer_cache_lock:
+            key = " ".join(query.lower().split())
+            self._answer_cache[key] = text
+            self._answer_cache.move_to_end(key)
+            if len(self._answer_cache) > self.answer_cache_size:
+                self._answer_cache.popitem(last=False)
+    
+    def _cached_answer(self, query):
+        with self._answer_cache_lock:
+            return self._answer_cache.get(" ".join(query.lower().split()))
+    
+    def assist_speculative(self, query, session=None, deadline=None, on_final=None):
+        """Answer within `deadline` seconds whatever the model's latency
+        
+        The model call starts at once, unless all 16 model threads are
+        busy: then the cached or local answer is returned and no call is
+        made. If the model answers within the deadline (default:
+        fast_path_deadline, else 1s) that answer is returned.
+        Otherwise an earlier model answer to the same query, or the local
+        rule-based answer, is returned immediately. The model's answer is
+        attached to the same session interaction (as its "final") when it
+        arrives, and passed to `on_final(text)`; once on_final or result()
+        has handed it over, it replaces the speculative answer in the
+        conversation.
+        """
+        from concurrent.futures import Future, TimeoutError as FutureTimeout
+        
+        deadline = deadline if deadline is not None else (self.fast_path_deadline or 1.0)
+        memory = self._memory(session)
+        started = time.perf_counter()
+        final = Future()
+        
+        if not self.gemini_available:
+            text = self.assist(query, session)
+            final.set_result(text)
+            return SpeculativeAnswer(text, "local", final, time.perf_counter() - started)
+        
+        prompt = self._model_prompt(query, memory)
+        call = _speculation_executor().submit(lambda: self.model.generate_content(prompt).text)
+        if call is None:
+            # Every model thread is stuck on the upstream: answer now and make no call
+            cached = self._cached_answer(query)
+            source = "cache" if cached is not None else "local"
+            text = cached if cached is not None else self._local_answer(query)
+            latency = time.perf_counter() - started
+            self._remember(memory, query, text)
+            if session is not None:
+                session.add_interaction(query, text, {"latency": latency, "source": source})
+            final.set_result(text)
+            return SpeculativeAnswer(text, source, final, latency)
+        try:
+            text = call.result(timeout=deadline)
+        except FutureTimeout:
+            pass
+        except Exception as e:
+            print(f"⚠️ Gemini API error: {e}")
+            fallback = EduMentorAgent.assist(self, query, session)
+            latency = time.perf_counter() - started
+            if session is not None:
+                session.add_interaction(query, fallback, {"latency": latency, "source": "local"})
+            final.set_result(fallback)
+            return SpeculativeAnswer(fallback, "local", final, latency)
+        else:
+            latency = time.perf_counter() - started
+            self._remember(memory, query, text)
+            self._cache_answer(query, text)
+            if session is not None:
+                session.add_interaction(query, text, {"latency": latency, "source": "model"})
+            final.set_result(text)
+            return SpeculativeAnswer(text, "model", final, latency)
+        
+        # The model is late: answer now, deliver its answer when it lands
+        cached = self._cached_answer(query)
+        source = "cache" if cached is not None else "local"
+        text = cached if cached is not None else self._local_answer(query)
+        latency = time.perf_counter() - started
+        spoken = {"role": "assistant", "content": text}
+        memory.append({"role": "user", "content": query})
+        memory.append(spoken)
+        interaction = None
+        if session is not None:
+            interaction = session.add_interaction(query, text, {"latency": latency, "source": source, "speculative": True})
+        
+        def on_delivery(final_text):
+            if final_text is not text:
+                memory.replace(spoken, {"role": "assistant", "content": final_text})
+        
+        answer = SpeculativeAnswer(text, source, final, latency, on_delivery)
+        
+        def deliver(call):
+            try:
+                model_text = call.result()
+            except Exception as e:
+                print(f"⚠️ Gemini API error: {e}")
+                final.set_result(text)
+                return
+            self._cache_answer(query, model_text)
+            if interaction is not None:
+                session.record_final(interaction, model_text, {
+                    "latency": time.perf_counter() - started, "source": "model", "replaces": source})
+            final.set_result(model_text)
+            if on_final is not None:
+                try:
+                    on_final(model_text)
+                except Exception as e:
+                    print(f"⚠️ on_final callback failed: {e!r}")
+                    return
+                try:
+                    answer._delivered(model_text)
+                except Exception as e:
+                    print(f"⚠️ Could not record the delivered answer: {e!r}")
+        
+        call.add_done_callback(deliver)
+        return answer
+
+    def assist_stream(self, query, session=None, **format_options):
+        """Stream assistance chunk by chunk as Gemini generates it
+
+        Pass format_response options (max_length, include_summary) to get
+        formatted pieces instead of raw chunks. The full text is recorded
+        in `session` once the stream is exhausted.
+        """
+        chunks = self._stream_chunks(query, session)
+        if format_options:
+            return format_response_stream(chunks, **format_options)
+        return chunks
+
+    def assist_stream_async(self, query, session=None, **format_options):
+        """Async-generator variant of assist_stream"""
+        chunks = self._stream_chunks_async(query, session)
+        if format_options:
+            return aformat_response_stream(chunks, **format_options)
+        return chunks
+
+    def _stream_chunks(self, query, session=None):
+        """Yield raw response chunks, falling back to the base agent"""
+        started = time.perf_counter()
+        parts = []
+        memory = self._memory(session)
+
+        if self.gemini_available:
+            try:
+                for chunk in self.model.generate_content(self._model_prompt(query, memory), stream=True):
+                    parts.append(chunk.text)
+                    yield parts[-1]
+            except Exception as e:
+                print(f"⚠️ Gemini API error: {e}")
+            if parts:
+                self._remember(memory, query, "".join(parts))
+
+        # Fallback to parent class (only if nothing was streamed yet)
+        if not parts:
+            parts.append(super().assist(query, session))
+            yield parts[-1]
+
+        if session is not None:
+            session.add_interaction(query, "".join(parts), {"latency": time.perf_counter() - started})
+
+    async def _stream_chunks_async(self, query, session=None):
+        """Async counterpart of _stream_chunks"""
+        started = time.perf_counter()
+        parts = []
+        memory = self._memory(session)
+
+        if self.gemini_available:
+            try:
+                response = await self.model.generate_content_async(self._model_prompt(query, memory), stream=True)
+                async for chunk in response:
+                    parts.append(chunk.text)
+                    yield parts[-1]
+            except Exception as e:
+                print(f"⚠️ Gemini API error: {e}")
+            if parts:
+                self._remember(memory, query, "".join(parts))
+
+        if not parts:
+            parts.append(super().assist(query, session))
+            yield parts[-1]
+
+        if session is not None:
+            session.add_interaction(query, "".join(parts), {"latency": time.perf_counter() - started})
 
 
 class TutorAgent(EduMentorAgent):
-    """Specialized tutor agent for one-on-one instruction"""
+    """Specialized tutor agent for one-on-one instruction
     
-    def __init__(self):
+    `student_profiles` is a bounded LRU cache (student_profiles.ProfileCache)
+    loaded from a MemoryBank. Each graded answer updates a student's
+    exponentially weighted statistics in O(1), and the difficulty level is
+    read from those statistics rather than recomputed from history.
+    `review_queue` (review_queue.ReviewQueue) schedules what each student
+    should review next.
+    """
+    
+    def __init__(self, memory_bank=None, cache_size=1024, alpha=0.2):
         super().__init__(name="TutorBot", specialization="Personalized Tutoring")
-        self.student_profiles = {}
+        from review_queue import ReviewQueue
+        from student_profiles import ProfileCache
+        self.student_profiles = ProfileCache(memory_bank, capacity=cache_size, alpha=alpha)
+        self.review_queue = ReviewQueue(memory_bank)
+    
+    def record_score(self, student_id, score, session=None):
+        """Fold a score into the student's profile; returns the difficulty level"""
+        profile = self.student_profiles.get(student_id)
+        profile.update(score, self.student_profiles.alpha)
+        level = profile.adjust_level()
+        if session is not None and session.context_memory["difficulty_level"] != level:
+            session.update_difficulty(level)
+        return level
+    
+    def evaluate_student(self, student_id, student_response, correct_answer=None, session=None):
+        """evaluate() plus a profile update; adds the resulting difficulty_level"""
+        result = self.evaluate(student_response, correct_answer)
+        result["difficulty_level"] = self.record_score(student_id, result["score"], session)
+        return result
+    
+    def get_difficulty(self, student_id, age=None, subject="general"):
+        """Student's current level; with `age`, the age-based tools level shifted by performance"""
+        profile = self.student_profiles.get(student_id)
+        if age is None:
+            return profile.difficulty
+        
+        from tools import get_difficulty_level
+        return get_difficulty_level(age, subject, profile.mean if profile.count else None)
+    
+    def record_review(self, student_id, item_id, quality):
+        """Grade a review of an item 0-5; returns when it is next due (epoch seconds)"""
+        return self.review_queue.review(student_id, item_id, quality)
+    
+    def next_reviews(self, student_id, k=10):
+        """Items the student should review now, most overdue first"""
+        return self.review_queue.next_due(student_id, k)
+    
+    def save_profiles(self):
+        """Write changed profiles and review cards back to the memory bank"""
+        self.student_profiles.flush()
+        self.review_queue.flush()
 
 
 class AssessmentAgent(EduMentorAgent):
-    """Specialized assessment agent for evaluation"""
+    """Specialized assessment agent for evaluation
     
-    def __init__(self):
+    Batch grading runs on a process pool (see grading.GradingPool) that
+    receives the rubrics once at start-up; results stream back shard by
+    shard and are stored in `analytics_data`, a columnar GradeTable.
+    """
+    
+    def __init__(self, rubrics=None, workers=None):
         super().__init__(name="AssessorBot", specialization="Assessment & Analytics")
-        self.rubrics = {}
-        self.analytics_data = []
+        from grading import GradeTable
+        
+        self.rubrics = dict(rubrics or {})  # rubric -> {question: reference answer}
+        self.workers = workers
+        self.analytics_data = GradeTable()
+        self._pool = None
+    
+    def add_rubric(self, name, answers):
+        """Register (or replace) a rubric of {question: reference answer}"""
+        self.rubrics[name] = dict(answers)
+        self.close()  # Workers hold the old rubrics; restart on next use
+    
+    def _grading_pool(self):
+        if self._pool is None:
+            from grading import GradingPool
+            self._pool = GradingPool(self.rubrics, self.workers)
+        return self._pool
+    
+    def _graded_shards(self, submissions, shard_size):
+        """Yield (start_row, results) per shard as the pool finishes them"""
+        students = [s["student_id"] for s in submissions]
+        rubrics = [s["rubric"] for s in submissions]
+        questions = [s["question"] for s in submissions]
+        responses = [s["response"] for s in submissions]
+        
+        pool = self._grading_pool()
+        for start, scores in pool.imap_shards(rubrics, questions, responses, shard_size):
+            end = start + len(scores)
+            self.analytics_data.append(students[start:end], rubrics[start:end], questions[start:end], scores)
+            yield start, [
+                {
+                    "submission_id": submission.get("submission_id", row),
+                    "student_id": submission["student_id"],
+                    "rubric": submission["rubric"],
+                    "question": submission["question"],
+                    "score": None if score != score else round(score, 1)  # NaN: not graded
+                }
+                for row, submission, score in zip(range(start, end), submissions[start:end], scores.tolist())
+            ]
+    
+    def grade_stream(self, submissions, shard_size=2000):
+        """Grade submissions, yielding results as each shard finishes
+        
+        Each submission is a dict with "student_id", "rubric", "question"
+        and "response" (plus an optional "submission_id", defaulting to its
+        position). Scores use the evaluate() scale; unknown questions get None.
+        """
+        for _, results in self._graded_shards(list(submissions), shard_size):
+            yield from results
+    
+    def grade_submissions(self, submissions, shard_size=2000):
+        """Grade submissions; results are returned in input order"""
+        submissions = list(submissions)
+        results = [None] * len(submissions)
+        for start, shard in self._graded_shards(submissions, shard_size):
+            results[start:start + len(shard)] = shard
+        return results
+    
+    def close(self):
+        """Stop the grading worker processes (also done when the agent is garbage-collected)"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
 
 
 # ============================================
 # ROOT AGENT DEFINITION
 # ============================================
 
-# Create the main root agent instance
-ROOT_AGENT = EduMentorAgent(
-    name="EduMentorRoot",
-    specialization="Primary Educational AI Assistant"
-)
-
-# Add enhanced capabilities
-ROOT_AGENT.version = "1.0.0"
-ROOT_AGENT.is_root = True
-ROOT_AGENT.capabilities = [
-    "Real-time educational Q&A",
-    "Multi-subject expertise",
-    "Content generation",
-    "Student assessment",
-    "Personalized learning paths"
-]
-
-# Enhanced assist method for root agent
-def root_enhanced_assist(query):
-    """Enhanced assistance for root agent"""
-    enhanced_prompt = f"""
+# Prompt text around the student's query, built once rather than per request
+_ROOT_PROMPT_HEAD = """
     As the primary educational AI assistant (EduMentorRoot), provide a comprehensive response:
     
-    STUDENT QUERY: {query}
+    STUDENT QUERY: """
+_ROOT_PROMPT_TAIL = """
     
     Please ensure your response:
     1. Is clear and educational
@@ -293,59 +841,118 @@ def root_enhanced_assist(query):
     4. Suggests further learning
     5. Is engaging and encouraging
     """
+
+class RootAgent(EduMentorAgent):
+    """The shared primary agent (ROOT_AGENT), safe to call from many threads or tasks
+    
+    Usage and conversation counters are sharded per thread
+    (usage_stats.UsageStats) and conversation state belongs to the
+    caller's session; a call without one gets a fresh memory of its own,
+    so concurrent (or consecutive) requests share no mutable state.
+    """
+    
+    version = "1.0.0"
+    is_root = True
+    capabilities = [
+        "Real-time educational Q&A",
+        "Multi-subject expertise",
+        "Content generation",
+        "Student assessment",
+        "Personalized learning paths"
+    ]
+    
+    def __init__(self):
+        super().__init__(name="EduMentorRoot", specialization="Primary Educational AI Assistant")
+        from usage_stats import UsageStats
+        self.usage_stats = UsageStats()
+    
+    def _memory(self, session=None):
+        """Session memory, else a throwaway memory local to this request"""
+        return session.conversation if session is not None else ConversationMemory()
+    
+    def assist(self, query, session=None):
+        """Answer a query, counting the exchange"""
+        self.usage_stats.record_conversation()
+        return super().assist(query, session)
+    
+    def enhanced_assist(self, query, session=None):
+        """Enhanced assistance for root agent"""
+        return self.assist(_ROOT_PROMPT_HEAD + query + _ROOT_PROMPT_TAIL, session)
+    
+    def get_stats(self):
+        """Get agent statistics"""
+        stats = super().get_stats()
+        stats["conversations"] = self.usage_stats.conversations
+        return stats
     
-    # Use parent's assist method with enhanced prompt
-    return EduMentorAgent.assist(ROOT_AGENT, enhanced_prompt)
+    def track_and_assist(self, query, session=None):
+        """Track usage and provide assistance"""
+        self.usage_stats.record(get_subject_classifier().classify(query))
+        return self.enhanced_assist(query, session)
+    
+    def get_root_stats(self):
+        """Get detailed statistics about root agent"""
+        usage = self.usage_stats.snapshot()
+        return {
+            "agent_name": self.name,
+            "specialization": self.specialization,
+            "version": self.version,
+            "is_root": self.is_root,
+            "total_requests": usage["total_requests"],
+            "subjects_covered": list(usage["subjects_covered"]),
+            "last_active": usage["last_active"].strftime("%Y-%m-%d %H:%M:%S"),
+            "capabilities": self.capabilities,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S")
+        }
 
-# Attach the enhanced method
-ROOT_AGENT.enhanced_assist = root_enhanced_assist
 
-# Add usage tracking
-ROOT_AGENT.usage_stats = {
-    "total_requests": 0,
-    "subjects_covered": set(),
-    "last_active": datetime.now()
-}
+_root_agent = None
+_root_agent_lock = threading.Lock()
 
-def track_and_assist(query):
-    """Track usage and provide assistance"""
-    ROOT_AGENT.usage_stats["total_requests"] += 1
-    ROOT_AGENT.usage_stats["last_active"] = datetime.now()
-    
-    # Track subjects
-    subjects = ["math", "science", "history", "programming", "literature"]
-    for subject in subjects:
-        if subject in query.lower():
-            ROOT_AGENT.usage_stats["subjects_covered"].add(subject)
-    
-    return ROOT_AGENT.enhanced_assist(query)
+def _create_root_agent():
+    """Build the root agent"""
+    agent = RootAgent()
+    print(f"✅ Root Agent '{agent.name}' initialized with enhanced capabilities")
+    return agent
 
-ROOT_AGENT.track_and_assist = track_and_assist
+def get_root_agent():
+    """Return the shared root agent, creating it on first use"""
+    global _root_agent
+    if _root_agent is None:
+        with _root_agent_lock:
+            if _root_agent is None:
+                _root_agent = _create_root_agent()
+    return _root_agent
 
-# Get detailed stats method
-def get_root_stats():
-    """Get detailed statistics about root agent"""
-    return {
-        "agent_name": ROOT_AGENT.name,
-        "specialization": ROOT_AGENT.specialization,
-        "version": ROOT_AGENT.version,
-        "is_root": ROOT_AGENT.is_root,
-        "total_requests": ROOT_AGENT.usage_stats["total_requests"],
-        "subjects_covered": list(ROOT_AGENT.usage_stats["subjects_covered"]),
-        "last_active": ROOT_AGENT.usage_stats["last_active"].strftime("%Y-%m-%d %H:%M:%S"),
-        "capabilities": ROOT_AGENT.capabilities,
-        "created_at": ROOT_AGENT.created_at.strftime("%Y-%m-%d %H:%M:%S")
-    }
+def __getattr__(name):
+    # ROOT_AGENT is built lazily so importing this module has no side effects
+    if name == "ROOT_AGENT":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Module-level entry points, kept for existing callers
+def root_enhanced_assist(query, session=None):
+    """Enhanced assistance for root agent"""
+    return get_root_agent().enhanced_assist(query, session)
 
-ROOT_AGENT.get_root_stats = get_root_stats
+def track_and_assist(query, session=None):
+    """Track usage and provide assistance"""
+    return get_root_agent().track_and_assist(query, session)
 
-print(f"✅ Root Agent '{ROOT_AGENT.name}' initialized with enhanced capabilities")
+def get_root_stats():
+    """Get detailed statistics about root agent"""
+    return get_root_agent().get_root_stats()
 
 # Export all agents - MUST BE AT THE END OF THE FILE
 __all__ = [
     'EduMentorAgent',
     'GeminiAgent',
+    'SpeculativeAnswer',
     'TutorAgent',
     'AssessmentAgent',
-    'ROOT_AGENT'
+    'RootAgent',
+    'INTENT_ROUTER',
+    'tokenize_response',
+    'ROOT_AGENT',
+    'get_root_agent'
             ]
@@ -0,0 +1,269 @@
+"""
+Interaction Analytics for EduMentor AI
+Columnar, partitioned on-disk store of interactions with vectorized queries
+"""
+
+import atexit
+import json
+import math
+import os
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from dictionary_encoder import DictionaryEncoder
+
+
+# Buffered rows would be lost at exit: one hook flushes every store still alive
+_open_stores: "weakref.WeakSet[InteractionStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except OSError as e:
+            print(f"⚠️ Could not flush analytics to {store.directory}: {e}")
+
+
+class InteractionStore:
+    """Append-only interaction log stored as memory-mapped NumPy columns
+
+    Each row is (timestamp, student_id, subject, latency, score). Rows are
+    buffered in memory and written every `partition_rows` rows, on flush()
+    and at interpreter exit, as a partition directory holding one .npy
+    file per column; student and subject are dictionary-encoded int32
+    codes whose values are saved with each partition (dictionaries.json).
+    Partitions are written under a temporary name and renamed into place
+    with a unique name, so several processes can share a directory and a
+    crash never leaves a half-written partition behind. They are opened
+    memory-mapped, so queries read only the columns they use; a column
+    spanning several partitions (or with buffered rows) is concatenated
+    into one in-memory array on every query, so only a store with a
+    single partition and nothing buffered is queried without copying.
+    """
+
+    CATEGORICAL = ("student_id", "subject")
+    DTYPES = {
+        "timestamp": np.float64,
+        "student_id": np.int32,
+        "subject": np.int32,
+        "latency": np.float32,
+        "score": np.float32
+    }
+
+    def __init__(self, directory: str = "analytics", partition_rows: int = 65536):
+        self.directory = directory
+        self.partition_rows = partition_rows
+        os.makedirs(directory, exist_ok=True)
+        self._dictionaries = {name: DictionaryEncoder() for name in self.CATEGORICAL}
+        self._buffer: Dict[str, List] = {name: [] for name in self.DTYPES}
+        self._partitions: List[Dict[str, np.ndarray]] = []
+        self._lock = threading.Lock()
+        self._load()
+        _open_stores.add(self)  # Flushed at exit; held weakly so the store can be collected
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _load(self):
+        for entry in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, entry)
+            if entry.startswith("part-") and os.path.isdir(path):
+                try:
+                    self._attach(path)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"⚠️ Skipping unreadable analytics partition {entry}: {e}")
+
+    def _attach(self, path: str):
+        """Open a partition memory-mapped, mapping its codes onto this store's dictionaries"""
+        partition = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in self.DTYPES}
+        with open(os.path.join(path, "dictionaries.json"), "r") as f:
+            local = json.load(f)
+        for name in self.CATEGORICAL:
+            mapping = self._dictionaries[name].encode(local[name])
+            if not np.array_equal(mapping, np.arange(len(mapping))):
+                partition[name] = mapping[partition[name]]  # Codes differ from ours: remap (copies)
+        self._partitions.append(partition)
+
+    def append(self, student_id: str, subject: Optional[str] = None, latency: Optional[float] = None,
+               score: Optional[float] = None, timestamp: Optional[float] = None):
+        """Record one interaction (missing latency/score are stored as NaN)"""
+        with self._lock:
+            buffer = self._buffer
+            buffer["timestamp"].append(time.time() if timestamp is None else timestamp)
+            buffer["student_id"].append(student_id)
+            buffer["subject"].append(subject or "general")
+            buffer["latency"].append(math.nan if latency is None else latency)
+            buffer["score"].append(math.nan if score is None else score)
+            if len(buffer["timestamp"]) >= self.partition_rows:
+                self._write_partition()
+
+    def append_many(self, rows: Iterable[Dict[str, Any]]):
+        """Record many interactions given as dicts with the append() arguments"""
+        for row in rows:
+            self.append(**row)
+
+    def _write_partition(self):
+        """Encode the buffer, write it as a new partition and reopen it memory-mapped"""
+        buffer = self._buffer
+        if not buffer["timestamp"]:
+            return
+        # Time-ordered and unique across processes sharing the directory
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        staging = os.path.join(self.directory, f".{name}.tmp")
+        os.makedirs(staging)
+
+        for column, dtype in self.DTYPES.items():
+            if column in self._dictionaries:
+                values = self._dictionaries[column].encode(buffer[column])
+            else:
+                values = np.asarray(buffer[column], dtype=dtype)
+            np.save(os.path.join(staging, f"{column}.npy"), values)
+        # The partition carries the dictionaries its codes refer to; a reader whose
+        # dictionaries grew the same way (this process, or a later reload) needs no remap
+        with open(os.path.join(staging, "dictionaries.json"), "w") as f:
+            json.dump({column: self._dictionaries[column].values for column in self.CATEGORICAL}, f)
+
+        path = os.path.join(self.directory, name)
+        os.rename(staging, path)
+        self._buffer = {column: [] for column in self.DTYPES}
+        self._attach(path)
+
+    def flush(self):
+        """Write buffered rows to disk"""
+        with self._lock:
+            self._write_partition()
+
+    def close(self):
+        """Flush; the store stays readable"""
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Columns
+    # ------------------------------------------------------------------
+    def column(self, name: str) -> np.ndarray:
+        """Whole column as one array (codes for categorical columns)"""
+        with self._lock:
+            parts = [partition[name] for partition in self._partitions]
+            buffered = self._buffer[name]
+            if buffered:
+                if name in self._dictionaries:
+                    parts.append(self._dictionaries[name].encode(buffered))
+                else:
+                    parts.append(np.asarray(buffered, dtype=self.DTYPES[name]))
+        if not parts:
+            return np.empty(0, dtype=self.DTYPES[name])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def values(self, name: str) -> List[str]:
+        """Dictionary of a categorical column (index = code)"""
+        return self._dictionaries[name].values
+
+    def _mask(self, student_id: Optional[str] = None, since: Optional[float] = None) -> Optional[np.ndarray]:
+        mask = None
+        if student_id is not None:
+            mask = self.column("student_id") == self._dictionaries["student_id"].code(student_id)
+        if since is not None:
+            recent = self.column("timestamp") >= since
+            mask = recent if mask is None else mask & recent
+        return mask
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def subject_volume(self, student_id: Optional[str] = None, since: Optional[float] = None) -> Dict[str, int]:
+        """Number of interactions per subject"""
+        subjects = self.column("subject")
+        mask = self._mask(student_id, since)
+        if mask is not None:
+            subjects = subjects[mask]
+        counts = np.bincount(subjects, minlength=len(self.values("subject")))
+        return {subject: int(count) for subject, count in zip(self.values("subject"), counts) if count}
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 90, 99), by_subject: bool = False,
+                            student_id: Optional[str] = None, since: Optional[float] = None) -> Dict:
+        """Latency percentiles in seconds, overall or per subject"""
+        latency = self.column("latency")
+        subjects = self.column("subject") if by_subject else None
+        mask = self._mask(student_id, since)
+        valid = ~np.isnan(latency)
+        mask = valid if mask is None else mask & valid
+        latency = latency[mask]
+
+        def summarize(values):
+            if not len(values):
+                return {}
+            return {f"p{p:g}": round(float(q), 4) for p, q in zip(percentiles, np.percentile(values, percentiles))}
+
+        if not by_subject:
+            return summarize(latency)
+        subjects = subjects[mask]
+        order = np.argsort(subjects, kind="stable")
+        codes, starts = np.unique(subjects[order], return_index=True)
+        names = self.values("subject")
+        return {
+            names[code]: summarize(group)
+            for code, group in zip(codes.tolist(), np.split(latency[order], starts[1:]))
+        }
+
+    def subject_scores(self, student_id: Optional[str] = None, since: Optional[float] = None) -> Dict[str, Dict]:
+        """Mean score and number of scored interactions per subject"""
+        scores = self.column("score")
+        subjects = self.column("subject")
+        mask = self._mask(student_id, since)
+        scored = ~np.isnan(scores)
+        mask = scored if mask is None else mask & scored
+        subjects, scores = subjects[mask], scores[mask]
+
+        size = len(self.values("subject"))
+        counts = np.bincount(subjects, minlength=size)
+        totals = np.bincount(subjects, weights=scores, minlength=size)
+        return {
+            subject: {"mean_score": round(float(totals[code] / counts[code]), 1), "count": int(counts[code])}
+            for code, subject in enumerate(self.values("subject")) if counts[code]
+        }
+
+    def weak_areas(self, student_id: Optional[str] = None, threshold: float = 70.0,
+                   min_count: int = 3) -> List[str]:
+        """Subjects whose mean score is below `threshold`, weakest first"""
+        scores = self.subject_scores(student_id)
+        weak = [(stats["mean_score"], subject) for subject, stats in scores.items()
+                if stats["count"] >= min_count and stats["mean_score"] < threshold]
+        return [subject for _, subject in sorted(weak)]
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def to_pandas(self):
+        """DataFrame with categorical student_id/subject and a datetime timestamp"""
+        import pandas as pd
+
+        data = {"timestamp": (self.column("timestamp") * 1e6).astype("datetime64[us]")}
+        for name in ("student_id", "subject"):
+            data[name] = pd.Categorical.from_codes(self.column(name), dtype=pd.CategoricalDtype(list(self.values(name))))
+        for name in ("latency", "score"):
+            data[name] = self.column(name)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """pyarrow Table with dictionary-encoded student_id/subject (needs pyarrow)"""
+        import pyarrow as pa
+
+        columns = {"timestamp": pa.array(self.column("timestamp"))}
+        for name in ("student_id", "subject"):
+            columns[name] = pa.DictionaryArray.from_arrays(self.column(name), self.values(name))
+        for name in ("latency", "score"):
+            columns[name] = pa.array(self.column(name), from_pandas=True)
+        return pa.table(columns)
+
+    def __len__(self):
+        return sum(len(partition["timestamp"]) for partition in self._partitions) + len(self._buffer["timestamp"])
+
+
+__all__ = ['InteractionStore']
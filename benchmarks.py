@@ -0,0 +1,1145 @@
+"""
+Benchmarks for EduMentor AI
+Performance measurements and budget checks for the agent system
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+# Import-time budgets (milliseconds, best of several fresh interpreters)
+IMPORT_BUDGETS_MS = {
+    "agents": 100,
+    "tools": 75,
+    "observability": 75
+}
+
+def bench_import_time(module: str, repeats: int = 5) -> Dict:
+    """Measure the cost of importing a module in a fresh interpreter"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]) * 1000)
+
+    budget = IMPORT_BUDGETS_MS.get(module)
+    return {
+        "benchmark": f"import {module}",
+        "best_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "budget_ms": budget,
+        "within_budget": budget is None or min(timings) <= budget
+    }
+
+def run_import_benchmarks(repeats: int = 5) -> List[Dict]:
+    """Benchmark imports of all budgeted modules"""
+    return [bench_import_time(module, repeats) for module in IMPORT_BUDGETS_MS]
+
+def _percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def _latency_summary(samples: List[float]) -> Dict:
+    """p50/p99/mean of latencies given in seconds, reported in microseconds"""
+    return {
+        "p50_us": round(_percentile(samples, 50) * 1e6, 2),
+        "p99_us": round(_percentile(samples, 99) * 1e6, 2),
+        "mean_us": round(statistics.fmean(samples) * 1e6, 2) if samples else 0.0
+    }
+
+def bench_intent_router(num_concepts: int = 10000, num_queries: int = 2000, seed: int = 0) -> List[Dict]:
+    """Route queries against a router with many registered concepts"""
+    from intent_router import IntentRouter
+
+    rng = random.Random(seed)
+    concepts = {f"concept {i} of {rng.choice(['algebra', 'biology', 'poetry'])}": f"Explanation {i}"
+                for i in range(num_concepts)}
+    names = list(concepts)
+    triggers = ["explain", "what is", "how to", "example", "tell me about"]
+    queries = [f"{rng.choice(triggers)} {rng.choice(names)} please" for _ in range(num_queries)]
+
+    router = IntentRouter()
+    for priority, trigger in enumerate(triggers[:4]):
+        router.add_intent(trigger, [trigger], priority)
+    router.add_entities("concept", concepts)
+
+    start = time.perf_counter()
+    router.route("warm up")
+    build_seconds = time.perf_counter() - start
+
+    routed = []
+    for query in queries:
+        start = time.perf_counter()
+        router.route(query)
+        routed.append(time.perf_counter() - start)
+
+    # Baseline: the original if/elif chain plus a linear scan over concepts
+    scanned = []
+    for query in queries[:200]:
+        start = time.perf_counter()
+        lowered = query.lower()
+        next((t for t in triggers[:4] if t in lowered), None)
+        next((c for c in concepts if c in lowered), None)
+        scanned.append(time.perf_counter() - start)
+
+    return [
+        dict({"benchmark": f"intent_router.route ({num_concepts} concepts)",
+              "build_ms": round(build_seconds * 1000, 2)}, **_latency_summary(routed)),
+        dict({"benchmark": f"linear scan ({num_concepts} concepts)"}, **_latency_summary(scanned))
+    ]
+
+def bench_retrieval(num_chunks: int = 1000000, dimensions: int = 128, partitions: int = 1024,
+                    nprobe: int = 8, num_queries: int = 500, seed: int = 0) -> List[Dict]:
+    """p50/p99 top-k retrieval latency over synthetic chunk embeddings"""
+    import numpy as np
+    from retrieval import VectorIndex
+
+    rng = np.random.default_rng(seed)
+    # Clustered synthetic embeddings, generated block by block to bound memory
+    topics = rng.standard_normal((4096, dimensions)).astype(np.float32)
+
+    def blocks():
+        for start in range(0, num_chunks, 65536):
+            size = min(65536, num_chunks - start)
+            centres = topics[rng.integers(0, len(topics), size)]
+            yield centres + 0.3 * rng.standard_normal((size, dimensions)).astype(np.float32)
+
+    start = time.perf_counter()
+    index = VectorIndex.build(blocks(), partitions=partitions)
+    build_seconds = time.perf_counter() - start
+
+    queries = topics[rng.integers(0, len(topics), num_queries)]
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    searched = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, k=5, nprobe=nprobe)
+        searched.append(time.perf_counter() - start)
+
+    return [dict({
+        "benchmark": f"retrieval top-5 ({num_chunks} chunks, {partitions} partitions, nprobe={nprobe})",
+        "build_s": round(build_seconds, 2),
+        "index_mb": round((index.codes.nbytes + index.scales.nbytes + index.ids.nbytes) / 1e6, 1)
+    }, **_latency_summary(searched))]
+
+def _synthetic_answers(count: int, seed: int = 0, vocabulary: int = 2000,
+                       words: int = 60) -> List[str]:
+    """Synthetic free-text answers drawn from a shared vocabulary"""
+    rng = random.Random(seed)
+    terms = [f"term{i}" for i in range(vocabulary)]
+    return [" ".join(rng.choice(terms) for _ in range(rng.randint(words // 2, words)))
+            for _ in range(count)]
+
+def _quietly(factory):
+    """Build an object without its start-up banner"""
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        return factory()
+
+def bench_batch_grading(num_responses: int = 10000, seed: int = 0) -> List[Dict]:
+    """evaluate() in a loop versus evaluate_batch() on one class's submissions"""
+    from agents import EduMentorAgent
+
+    agent = _quietly(EduMentorAgent)
+    # A class answering a 20-question quiz: many responses per reference answer
+    responses = _synthetic_answers(num_responses, seed)
+    references = _synthetic_answers(20, seed + 1)
+    answers = [references[i % len(references)] for i in range(num_responses)]
+
+    start = time.perf_counter()
+    looped = [agent.evaluate(r, a)["score"] for r, a in zip(responses, answers)]
+    loop_seconds = time.perf_counter() - start
+
+    agent.evaluate_batch(responses[:10], answers[:10])  # Warm up NumPy/pandas imports
+
+    start = time.perf_counter()
+    batched = [result["score"] for result in agent.evaluate_batch(responses, answers)]
+    batch_seconds = time.perf_counter() - start
+
+    return [{
+        "benchmark": f"grading ({num_responses} responses)",
+        "loop_ms": round(loop_seconds * 1000, 1),
+        "batch_ms": round(batch_seconds * 1000, 1),
+        "speedup": round(loop_seconds / batch_seconds, 2),
+        "scores_match": looped == batched
+    }]
+
+def bench_plagiarism(num_submissions: int = 100000, planted: int = 1000, seed: int = 0) -> List[Dict]:
+    """MinHash/LSH indexing and near-duplicate recall on a synthetic cohort"""
+    from plagiarism import MinHashLSH
+
+    rng = random.Random(seed)
+    submissions = _synthetic_answers(num_submissions, seed, vocabulary=20000, words=120)
+
+    # Plant near-copies: an earlier submission with ~10% of its words replaced
+    pairs = []
+    for copy_index in rng.sample(range(num_submissions // 2, num_submissions), planted):
+        source_index = rng.randrange(num_submissions // 2)
+        words = submissions[source_index].split()
+        for i in rng.sample(range(len(words)), len(words) // 10):
+            words[i] = f"edit{rng.randrange(10 ** 6)}"
+        submissions[copy_index] = " ".join(words)
+        pairs.append((source_index, copy_index))
+
+    index = MinHashLSH()
+    start = time.perf_counter()
+    for i, text in enumerate(submissions):
+        index.add(i, text)
+    add_seconds = time.perf_counter() - start
+
+    queried = []
+    found = 0
+    for source_index, copy_index in pairs:
+        start = time.perf_counter()
+        matches = index.query_id(copy_index, threshold=0.6)
+        queried.append(time.perf_counter() - start)
+        found += any(match_id == source_index for match_id, _ in matches)
+
+    return [dict({
+        "benchmark": f"plagiarism index ({num_submissions} submissions)",
+        "adds_per_s": round(num_submissions / add_seconds),
+        "planted_recall": round(found / max(planted, 1), 3)
+    }, **_latency_summary(queried))]
+
+def bench_assessment_pool(num_submissions: int = 200000, workers: List[int] = None,
+                          seed: int = 0) -> List[Dict]:
+    """Grading throughput of AssessmentAgent for increasing worker counts"""
+    import os
+    from agents import AssessmentAgent
+
+    references = _synthetic_answers(20, seed + 1)
+    rubric = {f"q{i}": answer for i, answer in enumerate(references)}
+    submissions = [
+        {"student_id": f"student{i % 500}", "rubric": "quiz", "question": f"q{i % 20}", "response": response}
+        for i, response in enumerate(_synthetic_answers(num_submissions, seed))
+    ]
+
+    results = []
+    baseline = None
+    for count in workers or sorted({1, os.cpu_count() or 1}):
+        agent = _quietly(lambda: AssessmentAgent({"quiz": rubric}, workers=count))
+        agent.grade_submissions(submissions[:count * 100], shard_size=100)  # Start the workers
+
+        start = time.perf_counter()
+        agent.grade_submissions(submissions)
+        seconds = time.perf_counter() - start
+        agent.close()
+
+        baseline = baseline or seconds
+        results.append({
+            "benchmark": f"assessment pool ({num_submissions} submissions, {count} workers)",
+            "per_s": round(num_submissions / seconds),
+            "speedup": round(baseline / seconds, 2),
+            "analytics_mb": round(agent.analytics_data.nbytes / 1e6, 2)
+        })
+    return results
+
+def bench_tutor_profiles(num_students: int = 5000, history: int = 2000, num_updates: int = 100000,
+                         cache_size: int = 1024, seed: int = 0) -> List[Dict]:
+    """Adaptive-difficulty updates for students with long score histories"""
+    import os
+    import tempfile
+    from agents import TutorAgent
+    from session_manager import MemoryBank
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        bank = MemoryBank(os.path.join(directory, "memory_bank.json"))
+        for student in range(num_students):
+            bank.memories[f"student{student}"] = {
+                "score": [{"timestamp": "", "content": {"score": rng.randint(50, 100)}} for _ in range(history // 100)]
+            }
+        # A few students with the full history (replayed once, on first access)
+        for student in range(10):
+            bank.memories[f"student{student}"]["score"] *= 100
+
+        tutor = _quietly(lambda: TutorAgent(bank, cache_size=cache_size))
+        students = [f"student{rng.randrange(num_students)}" for _ in range(num_updates)]
+        scores = [rng.randint(40, 100) for _ in range(num_updates)]
+
+        updates = []
+        for student, score in zip(students, scores):
+            start = time.perf_counter()
+            tutor.record_score(student, score)
+            updates.append(time.perf_counter() - start)
+
+        hot = [f"student{i}" for i in range(10)]
+        decisions = []
+        for student in hot * 1000:
+            start = time.perf_counter()
+            tutor.record_score(student, 80)
+            decisions.append(time.perf_counter() - start)
+
+    return [
+        dict({"benchmark": f"tutor profile update ({num_students} students, cache {cache_size})"},
+             **_latency_summary(updates)),
+        dict({"benchmark": f"tutor difficulty decision (cached, {history} past scores)"},
+             **_latency_summary(decisions))
+    ]
+
+def bench_templates(num_topics: int = 20000) -> List[Dict]:
+    """Content rendering: per call (fresh and repeated topics) and a whole syllabus"""
+    import tools
+    from agents import EduMentorAgent
+
+    agent = _quietly(EduMentorAgent)
+    topics = [f"Topic {i}" for i in range(num_topics)]
+    fields = {field: field.upper() for field in tools.LESSON_TEMPLATES.get("science").fields}
+
+    fresh = []
+    for topic in topics:
+        start = time.perf_counter()
+        agent.generate_content(topic)
+        fresh.append(time.perf_counter() - start)
+
+    repeated = []
+    for topic in topics:
+        start = time.perf_counter()
+        agent.generate_content(topics[len(repeated) % 50])
+        repeated.append(time.perf_counter() - start)
+
+    rendered = []
+    for _ in range(num_topics):
+        start = time.perf_counter()
+        tools.get_template("science", **fields)
+        rendered.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    agent.generate_content_many(topics)
+    syllabus_seconds = time.perf_counter() - start
+
+    return [
+        dict({"benchmark": "generate_content (new topics)"}, **_latency_summary(fresh)),
+        dict({"benchmark": "generate_content (repeated topics)"}, **_latency_summary(repeated)),
+        dict({"benchmark": "get_template science"}, **_latency_summary(rendered)),
+        {"benchmark": f"generate_content_many ({num_topics} topics)",
+         "total_ms": round(syllabus_seconds * 1000, 1)}
+    ]
+
+def bench_quiz_bank(num_questions: int = 100000, quiz_size: int = 10, class_size: int = 500,
+                    seed: int = 0) -> List[Dict]:
+    """Quiz sampling latency and whole-class generation over a large bank"""
+    from quiz_bank import QuizBank
+
+    rng = random.Random(seed)
+    bank = QuizBank()
+    for i in range(num_questions):
+        bank.add(
+            {"question": f"Question {i} about {{topic}}", "options": ["A", "B", "C", "D"],
+             "answer": i % 4, "explanation": f"Explanation {i}"},
+            rng.choice(["math", "science", "history", "general"]),
+            rng.choice(["multiple_choice", "true_false"]),
+            rng.choice(["beginner", "intermediate", "advanced"])
+        )
+
+    sampled = []
+    for _ in range(2000):
+        start = time.perf_counter()
+        bank.sample(quiz_size, "math", "multiple_choice", "advanced", rng, topic="Algebra")
+        sampled.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bank.generate_class_quizzes([f"student{i}" for i in range(class_size)], "Algebra", quiz_size, subject="math")
+    class_seconds = time.perf_counter() - start
+
+    return [
+        dict({"benchmark": f"quiz bank sample {quiz_size} ({num_questions} questions)"}, **_latency_summary(sampled)),
+        {"benchmark": f"class quizzes ({class_size} students)", "total_ms": round(class_seconds * 1000, 1)}
+    ]
+
+def bench_text_analysis(megabytes: int = 20, seed: int = 0) -> List[Dict]:
+    """Streaming analysis of a large synthetic textbook: throughput and peak memory"""
+    import os
+    import tempfile
+    import tracemalloc
+    from text_analysis import analyze_file
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "textbook.txt")
+        with open(path, "w") as f:
+            part = 0
+            while f.tell() < megabytes * 1e6:
+                f.write(". ".join(_synthetic_answers(200, seed + part, vocabulary=50000)) + ".\n")
+                part += 1
+        size_mb = os.path.getsize(path) / 1e6
+
+        for label, limit in (("exact", None), ("hyperloglog", 10000)):
+            start = time.perf_counter()
+            analyze_file(path, exact_unique_limit=limit)
+            seconds = time.perf_counter() - start
+
+            tracemalloc.start()
+            analyze_file(path, exact_unique_limit=limit)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            results.append({
+                "benchmark": f"analyze_file {label} unique words ({size_mb:.0f} MB)",
+                "mb_per_s": round(size_mb / seconds, 2),
+                "peak_mb": round(peak / 1e6, 1)
+            })
+    return results
+
+def bench_corpus_analysis(num_documents: int = 5000, workers: int = None, seed: int = 0) -> List[Dict]:
+    """analyze_text_complexity per document versus analyze_corpus on a pool"""
+    import tools
+
+    documents = [". ".join(_synthetic_answers(10, seed + i)) for i in range(num_documents)]
+
+    start = time.perf_counter()
+    for document in documents:
+        tools.analyze_text_complexity(document)
+    loop_seconds = time.perf_counter() - start
+
+    frame = tools.analyze_corpus(documents, workers=workers, progress=False)
+    return [{
+        "benchmark": f"corpus analysis ({num_documents} documents, {frame.attrs['workers']} workers)",
+        "loop_docs_per_s": round(num_documents / loop_seconds),
+        "corpus_docs_per_s": round(frame.attrs["docs_per_s"]),
+        "speedup": round(loop_seconds / frame.attrs["seconds"], 2)
+    }]
+
+def bench_keyword_validation(num_responses: int = 5000, keyword_counts: List[int] = None,
+                             seed: int = 0) -> List[Dict]:
+    """Per-keyword substring scans versus the compiled keyword matcher"""
+    import tools
+
+    responses = _synthetic_answers(num_responses, seed)
+    results = []
+    for count in keyword_counts or [10, 100, 1000]:
+        keywords = [f"term{i}" for i in range(0, 20 * count, 20)]
+
+        def scan():
+            # Baseline: the original per-keyword scan, building the same result
+            for response in responses:
+                lowered = response.lower()
+                found, missing = [], []
+                for keyword in keywords:
+                    (found if keyword.lower() in lowered else missing).append(keyword)
+                {"response_length": len(response), "found_keywords": found, "missing_keywords": missing,
+                 "completeness_score": round(len(found) / len(keywords) * 100, 1),
+                 "has_adequate_detail": len(response.split()) >= 20,
+                 "suggestions": f"Include concepts like: {', '.join(missing)}" if missing else "Good coverage of key concepts"}
+
+        def best_of(run, repeats: int = 3) -> float:
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        scan_seconds = best_of(scan)
+        batch_seconds = best_of(lambda: tools.validate_responses(responses, keywords))
+
+        results.append({
+            "benchmark": f"keyword validation ({num_responses} responses, {count} keywords)",
+            "scan_ms": round(scan_seconds * 1000, 1),
+            "matcher_ms": round(batch_seconds * 1000, 1),
+            "speedup": round(scan_seconds / batch_seconds, 2)
+        })
+    return results
+
+def bench_study_schedules(num_students: int = 500, num_topics: int = 300, days: int = 120,
+                          hours_per_day: float = 3, seed: int = 0) -> List[Dict]:
+    """Cohort study-schedule generation over a semester"""
+    import tools
+
+    rng = random.Random(seed)
+    topics = [f"Topic {i}" for i in range(num_topics)]
+    students = {
+        f"student_{i}": {"weak_areas": rng.sample(topics, 5), "strong_areas": rng.sample(topics, 5)}
+        for i in range(num_students)
+    }
+
+    start = time.perf_counter()
+    schedules = tools.create_cohort_schedules(topics, students, days, hours_per_day)
+    elapsed = time.perf_counter() - start
+
+    scheduled_hours = sum(sum(schedule["topic_hours"].values()) for schedule in schedules.values())
+    return [{
+        "benchmark": f"study schedules ({num_students} students, {num_topics} topics, {days} days)",
+        "ms_per_student": round(elapsed / num_students * 1000, 2),
+        "hours_scheduled_pct": round(scheduled_hours / (num_students * days * hours_per_day) * 100, 1)
+    }]
+
+def bench_review_queue(num_cards: int = 1000000, num_students: int = 10000, num_reviews: int = 200000,
+                       seed: int = 0) -> List[Dict]:
+    """Spaced-repetition queue updates and next-due lookups"""
+    from review_queue import ReviewQueue
+
+    rng = random.Random(seed)
+    queue = ReviewQueue()
+    start = time.perf_counter()
+    for card in range(num_cards):
+        queue.add(f"student_{card % num_students}", f"item_{card}", due=rng.random() * 1e6)
+    add_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for card in range(num_reviews):
+        queue.review(f"student_{card % num_students}", f"item_{card}", rng.randint(0, 5), now=1e6)
+    review_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for student in range(num_students):
+        queue.next_due(f"student_{student}", 10, now=1e6)
+    next_seconds = time.perf_counter() - start
+
+    return [{
+        "benchmark": f"review queue ({num_cards} cards, {num_students} students)",
+        "add_us": round(add_seconds / num_cards * 1e6, 2),
+        "review_us": round(review_seconds / num_reviews * 1e6, 2),
+        "next_10_due_us": round(next_seconds / num_students * 1e6, 2)
+    }]
+
+def bench_analytics_store(num_rows: int = 1000000, num_students: int = 10000, seed: int = 0) -> List[Dict]:
+    """Interaction store appends and vectorized queries versus walking dicts"""
+    import tempfile
+
+    from analytics_store import InteractionStore
+
+    rng = random.Random(seed)
+    subjects = ["math", "science", "history", "programming", "literature"]
+    rows = [
+        {"student_id": f"student_{rng.randrange(num_students)}", "subject": rng.choice(subjects),
+         "latency": rng.random() * 2, "score": rng.random() * 100 if rng.random() < 0.5 else None}
+        for _ in range(num_rows)
+    ]
+
+    # Baseline: aggregate per-subject volume and mean score from the list of dicts
+    start = time.perf_counter()
+    volume, totals, counts = {}, {}, {}
+    for row in rows:
+        volume[row["subject"]] = volume.get(row["subject"], 0) + 1
+        if row["score"] is not None:
+            totals[row["subject"]] = totals.get(row["subject"], 0) + row["score"]
+            counts[row["subject"]] = counts.get(row["subject"], 0) + 1
+    sorted(row["latency"] for row in rows)
+    loop_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = InteractionStore(directory)
+        start = time.perf_counter()
+        store.append_many(rows)
+        store.flush()
+        append_seconds = time.perf_counter() - start
+
+        store = InteractionStore(directory)  # Reopen memory-mapped
+        start = time.perf_counter()
+        store.subject_volume()
+        store.subject_scores()
+        store.latency_percentiles()
+        query_seconds = time.perf_counter() - start
+
+        import pandas  # noqa: F401  (time the conversion, not the import)
+        start = time.perf_counter()
+        store.to_pandas()
+        pandas_seconds = time.perf_counter() - start
+
+    return [{
+        "benchmark": f"interaction analytics ({num_rows} rows)",
+        "append_us": round(append_seconds / num_rows * 1e6, 2),
+        "loop_query_ms": round(loop_seconds * 1000, 1),
+        "store_query_ms": round(query_seconds * 1000, 1),
+        "to_pandas_ms": round(pandas_seconds * 1000, 1),
+        "speedup": round(loop_seconds / query_seconds, 1)
+    }]
+
+def bench_subject_classifier(num_queries: int = 20000, subject_counts: List[int] = None,
+                             seed: int = 0) -> List[Dict]:
+    """Per-subject substring checks versus the compiled subject classifier"""
+    from subject_classifier import SubjectClassifier
+
+    rng = random.Random(seed)
+    results = []
+    for count in subject_counts or [5, 100, 1000]:
+        taxonomy = {f"subject{i}": (f"keyword{i}", f"topic{i}") for i in range(count)}
+        queries = [
+            f"Can you help me with keyword{rng.randrange(count)} and topic{rng.randrange(count)} for homework?"
+            for _ in range(num_queries)
+        ]
+
+        # Baseline: check every subject's keywords one by one
+        start = time.perf_counter()
+        for query in queries:
+            lowered = query.lower()
+            [subject for subject, keywords in taxonomy.items() if any(k in lowered for k in keywords)]
+        loop_seconds = time.perf_counter() - start
+
+        classifier = SubjectClassifier(taxonomy)
+        start = time.perf_counter()
+        for query in queries:
+            classifier.classify(query)
+        classifier_seconds = time.perf_counter() - start
+
+        results.append({
+            "benchmark": f"subject classification ({num_queries} queries, {count} subjects)",
+            "loop_us": round(loop_seconds / num_queries * 1e6, 2),
+            "classifier_us": round(classifier_seconds / num_queries * 1e6, 2),
+            "speedup": round(loop_seconds / classifier_seconds, 2)
+        })
+    return results
+
+def bench_root_agent(calls_per_worker: int = 2000, thread_counts: List[int] = None) -> List[Dict]:
+    """Concurrent ROOT_AGENT requests: throughput, and a check that no update is lost"""
+    import asyncio
+
+    import agents
+
+    root = agents.get_root_agent()
+    queries = ["Explain photosynthesis in science class", "Give me a math example", "history of France"]
+    results = []
+
+    def worker():
+        for i in range(calls_per_worker):
+            root.track_and_assist(queries[i % len(queries)])
+
+    def measure(label: str, count: int, run) -> Dict:
+        stats = root.usage_stats
+        before = (stats.total_requests, stats.conversations)
+        start = time.perf_counter()
+        run(count)
+        elapsed = time.perf_counter() - start
+        expected = count * calls_per_worker
+        counted = stats.total_requests - before[0]
+        return {
+            "benchmark": f"root agent ({count} {label} x {calls_per_worker} calls)",
+            "requests_per_s": round(expected / elapsed),
+            "counted": counted,
+            "lost_updates": expected - counted,
+            "lost_conversations": expected - (stats.conversations - before[1]),
+            "live_shards": stats.live_shards
+        }
+
+    def run_threads(count: int):
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    async def gather_tasks(count: int):
+        await asyncio.gather(*(asyncio.to_thread(worker) for _ in range(count)))
+
+    for count in thread_counts or [1, 2, 4, 8]:
+        results.append(measure("threads", count, run_threads))
+    count = max(thread_counts or [8])
+    results.append(measure("asyncio tasks", count, lambda n: asyncio.run(gather_tasks(n))))
+    return results
+
+def _slow_tail_model_factory(fast_s: float, slow_s: float, slow_fraction: float, seed: int = 0,
+                             error_rate: float = 0.0):
+    """model_client factory for a fake Gemini whose latency has a heavy tail (and that may fail)
+
+    The factory's `counts` dict tallies the model's "calls" and "failures";
+    agents hide failures behind their local answer, so this is where they show.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    counts = {"calls": 0, "failures": 0}
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+    class _SlowTailModel:
+        def generate_content(self, prompt, stream=False):
+            with lock:
+                delay = slow_s if rng.random() < slow_fraction else fast_s
+                failed = rng.random() < error_rate
+                counts["calls"] += 1
+                counts["failures"] += failed
+            time.sleep(delay)
+            if failed:
+                raise RuntimeError("Simulated upstream error")
+            return _Response(f"Model answer to: {prompt[-40:]}")
+
+    def factory(api_key, model_name, config):
+        return _SlowTailModel()
+
+    factory.counts = counts
+    return factory
+
+def bench_agent_router(num_queries: int = 200, fast_ms: float = 5, slow_ms: float = 400,
+                       slow_fraction: float = 0.05, hedge_ms: float = 30) -> List[Dict]:
+    """Tail latency of direct GeminiAgent calls versus the hedged AgentRouter"""
+    import model_client
+    from agent_router import AgentRouter
+    from agents import GeminiAgent, TutorAgent
+
+    queries = ["Explain photosynthesis", "Give me a math example", "What is the French Revolution?"]
+    model_client.registry.set_factory(_slow_tail_model_factory(fast_ms / 1000, slow_ms / 1000, slow_fraction))
+    router = None
+    try:
+        gemini = GeminiAgent(api_key="benchmark-key")
+        gemini.gemini_available = True  # The fake model stands in for the SDK
+        router = AgentRouter({"gemini": gemini, "tutor": TutorAgent()}, hedge_after=hedge_ms / 1000)
+
+        def percentiles(samples):
+            ordered = sorted(samples)
+            return (round(ordered[len(ordered) // 2] * 1000, 1),
+                    round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1))
+
+        direct = []
+        for i in range(num_queries):
+            start = time.perf_counter()
+            gemini.assist(queries[i % len(queries)])
+            direct.append(time.perf_counter() - start)
+
+        routed = []
+        for i in range(num_queries):
+            start = time.perf_counter()
+            router.route(queries[i % len(queries)])
+            routed.append(time.perf_counter() - start)
+    finally:
+        if router is not None:
+            router.close()
+        model_client.registry.set_factory(model_client._gemini_factory)
+
+    direct_p50, direct_p99 = percentiles(direct)
+    routed_p50, routed_p99 = percentiles(routed)
+    return [{
+        "benchmark": f"agent router ({num_queries} queries, {slow_fraction:.0%} upstream at {slow_ms:g} ms)",
+        "direct_p50_ms": direct_p50,
+        "direct_p99_ms": direct_p99,
+        "routed_p50_ms": routed_p50,
+        "routed_p99_ms": routed_p99,
+        "hedged": router.stats["hedged"],
+        "rejected": router.stats["rejected"],
+        "answered_by": router.stats["answered_by"]
+    }]
+
+def bench_speculative_assist(num_queries: int = 200, fast_ms: float = 5, slow_ms: float = 400,
+                             slow_fraction: float = 0.05, deadline_ms: float = 30) -> List[Dict]:
+    """Perceived latency of GeminiAgent.assist with and without the speculative fast path"""
+    import os
+    import tempfile
+    import model_client
+    from agents import GeminiAgent
+    from session_manager import SessionManager
+
+    queries = ["Explain photosynthesis", "Give me a math example", "What is the French Revolution?"]
+    model_client.registry.set_factory(_slow_tail_model_factory(fast_ms / 1000, slow_ms / 1000, slow_fraction))
+    try:
+        gemini = GeminiAgent(api_key="benchmark-key")
+        gemini.gemini_available = True  # The fake model stands in for the SDK
+
+        def percentiles(samples):
+            ordered = sorted(samples)
+            return (round(ordered[len(ordered) // 2] * 1000, 1),
+                    round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 1))
+
+        direct = []
+        for i in range(num_queries):
+            start = time.perf_counter()
+            gemini.assist(queries[i % len(queries)])
+            direct.append(time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as directory:
+            session = SessionManager(os.path.join(directory, "sessions.json")).create_session("benchmark-student")
+            perceived, answers = [], []
+            for i in range(num_queries):
+                start = time.perf_counter()
+                answers.append(gemini.assist_speculative(queries[i % len(queries)], session,
+                                                         deadline=deadline_ms / 1000))
+                perceived.append(time.perf_counter() - start)
+            finals = sum(answer.result(timeout=slow_ms / 100) is not None for answer in answers)
+            recorded = session.interaction_count
+    finally:
+        model_client.registry.set_factory(model_client._gemini_factory)
+
+    direct_p50, direct_p99 = percentiles(direct)
+    fast_p50, fast_p99 = percentiles(perceived)
+    sources: Dict[str, int] = {}
+    for answer in answers:
+        sources[answer.source] = sources.get(answer.source, 0) + 1
+    return [{
+        "benchmark": f"speculative assist ({num_queries} queries, {slow_fraction:.0%} upstream at {slow_ms:g} ms)",
+        "direct_p50_ms": direct_p50,
+        "direct_p99_ms": direct_p99,
+        "speculative_p50_ms": fast_p50,
+        "speculative_p99_ms": fast_p99,
+        "sources": sources,
+        "final_answers": finals,
+        "recorded_interactions": recorded
+    }]
+
+REPLAY_TEMPLATES = (
+    "Explain {topic}", "What is {topic}?", "Give me an example of {topic}",
+    "Quiz me on {topic}", "Help me study {topic}", "I'm struggling with {topic} in {subject}"
+)
+REPLAY_TOPICS = {
+    "math": ("fractions", "quadratic equations", "derivatives", "probability"),
+    "science": ("photosynthesis", "gravity", "chemical bonds", "cell division"),
+    "history": ("the French Revolution", "the Roman Empire", "the Cold War"),
+    "programming": ("recursion", "hash tables", "sorting algorithms"),
+    "literature": ("metaphors", "Shakespeare's sonnets", "narrative voice")
+}
+
+def synthetic_query_log(num_queries: int = 1000, num_students: int = 50, seed: int = 0) -> List[Dict]:
+    """Query log of [{"student_id", "query"}], with a few students asking most of the questions"""
+    rng = random.Random(seed)
+    subjects = list(REPLAY_TOPICS)
+    weights = [1 / (rank + 1) for rank in range(num_students)]
+    students = rng.choices([f"student-{i:04d}" for i in range(num_students)], weights=weights, k=num_queries)
+    log = []
+    for student_id in students:
+        subject = rng.choice(subjects)
+        query = rng.choice(REPLAY_TEMPLATES).format(topic=rng.choice(REPLAY_TOPICS[subject]), subject=subject)
+        log.append({"student_id": student_id, "query": query})
+    return log
+
+def load_query_log(path: str) -> List[Dict]:
+    """Recorded query log: JSON lines with "query" (and optionally "student_id"), or plain text lines"""
+    log = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line) if line.startswith("{") else {"query": line}
+            log.append({"student_id": entry.get("student_id", "replay-student"), "query": entry["query"]})
+    return log
+
+@contextlib.contextmanager
+def _scratch_directory():
+    """Temporary working directory (the tracer and logger write relative to the cwd)"""
+    import os
+    import tempfile
+
+    workdir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(workdir)
+
+def _replay_pass(agent, log: List[Dict], directory: str, session_length: int) -> Dict:
+    """Run a query log through the assist pipeline as main() would, persisting everything under `directory`"""
+    import logging
+    import os
+    from observability import AgentLogger, AgentTracer, MetricsCollector, trace_agent_operation
+    from session_manager import MemoryBank, SessionManager
+    from subject_classifier import get_subject_classifier
+
+    # Keep the console quiet; the JSON activity log is still written
+    logging.getLogger("EduMentorAI").setLevel(logging.WARNING)
+
+    class _Pipeline:
+        def __init__(self):
+            self.logger = AgentLogger(os.path.join(directory, "agent_logs.json"))
+            self.tracer = AgentTracer()
+            self.metrics = MetricsCollector()
+            self.sessions = SessionManager(os.path.join(directory, "sessions.json"))
+            self.memory_bank = MemoryBank(os.path.join(directory, "memory_bank.json"))
+            self.classifier = get_subject_classifier()
+            self.open_sessions: Dict[str, Any] = {}
+
+        @trace_agent_operation("assist")
+        def handle(self, student_id: str, query: str) -> str:
+            session = self.open_sessions.get(student_id)
+            if session is None:
+                session = self.open_sessions[student_id] = self.sessions.create_session(student_id)
+            start = time.perf_counter()
+            answer = agent.assist(query, session)
+            subject = self.classifier.primary(query)
+            session.add_interaction(query, answer, {"latency": time.perf_counter() - start, "subject": subject})
+            self.logger.log_agent_activity(agent.name, "assist", {"student_id": student_id, "subject": subject})
+
+            if session.interaction_count >= session_length:
+                self.memory_bank.add_memory(student_id, "session_summary", session.get_session_summary())
+                self.sessions.end_session(session.session_id, evict=True)
+                del self.open_sessions[student_id]
+            return answer
+
+    samples = []
+    errors = 0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        pipeline = _Pipeline()
+        start = time.perf_counter()
+        for entry in log:
+            began = time.perf_counter()
+            try:
+                pipeline.handle(entry["student_id"], entry["query"])
+            except Exception as e:
+                errors += 1
+                pipeline.logger.log_error(agent.name, e, {"query": entry["query"]})
+            samples.append(time.perf_counter() - began)
+        pipeline.sessions.save_sessions()
+        pipeline.memory_bank.save_memories()
+        pipeline.metrics.save_metrics(os.path.join(directory, "metrics_report.json"))
+        elapsed = time.perf_counter() - start
+    report = pipeline.metrics.get_metrics_report()["overall"]
+    return {"samples": samples, "elapsed": elapsed, "errors": errors,
+            "successful_queries": report["successful_queries"]}
+
+def bench_replay(log: List[Dict], agents: Sequence[str] = ("edumentor", "gemini"), latency_ms: float = 5,
+                 error_rate: float = 0.0, session_length: int = 20, trace_memory: bool = True,
+                 seed: int = 0) -> List[Dict]:
+    """Replay a query log through the full assist pipeline for each agent
+
+    Each agent gets a timed pass for throughput and latency and then, as
+    tracemalloc slows everything down, a separate pass under tracemalloc
+    for memory growth and allocation sites. Every pass runs in a fresh
+    temporary directory holding its logs, traces, sessions and memory bank.
+    GeminiAgent talks to a fake model with the given latency and error rate;
+    "errors" counts queries the pipeline failed, "fallbacks" model errors
+    the agent covered with its local answer.
+    """
+    import gc
+    import os
+    import tracemalloc
+    import model_client
+    from agents import EduMentorAgent, GeminiAgent
+
+    def make(kind: str):
+        if kind == "edumentor":
+            return EduMentorAgent()
+        if kind == "gemini":
+            gemini = GeminiAgent(api_key="benchmark-key")
+            gemini.gemini_available = True  # The fake model stands in for the SDK
+            return gemini
+        raise ValueError(f"Unknown agent: {kind}")
+
+    results = []
+    latency_s = latency_ms / 1000
+    factory = _slow_tail_model_factory(latency_s, latency_s, 0.0, seed, error_rate)
+    model_client.registry.set_factory(factory)
+    try:
+        for kind in agents:
+            failures = factory.counts["failures"]
+            with _scratch_directory() as directory:
+                timed = _replay_pass(_quietly(lambda: make(kind)), log, directory, session_length)
+            fallbacks = factory.counts["failures"] - failures  # Answered locally after a model error
+            label = f", model at {latency_ms:g} ms, {error_rate:.0%} errors" if kind == "gemini" else ""
+            result = {
+                "benchmark": f"replay {kind} ({len(log)} queries{label})",
+                "agent": kind,
+                "queries": len(log),
+                "throughput_qps": round(len(log) / timed["elapsed"], 1),
+                **_latency_summary(timed["samples"]),
+                "max_us": round(max(timed["samples"], default=0.0) * 1e6, 2),
+                "errors": timed["errors"],
+                "fallbacks": fallbacks,
+                "successful_queries": timed["successful_queries"]
+            }
+
+            if trace_memory:
+                with _scratch_directory() as directory:
+                    agent = _quietly(lambda: make(kind))
+                    gc.collect()
+                    tracemalloc.start()
+                    before = tracemalloc.take_snapshot()
+                    _replay_pass(agent, log, directory, session_length)
+                    gc.collect()
+                    after = tracemalloc.take_snapshot()
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+                # Modules imported on first use are not growth
+                ignore = [tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                          tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+                          tracemalloc.Filter(False, tracemalloc.__file__)]
+                changes = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+                result.update({
+                    "memory_growth_kb": round(sum(stat.size_diff for stat in changes) / 1024, 1),
+                    "peak_traced_kb": round(peak / 1024, 1),
+                    "retained_blocks": sum(stat.count_diff for stat in changes),
+                    "top_allocations": [
+                        f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno} "
+                        f"{stat.size_diff / 1024:+.1f} KiB"
+                        for stat in changes[:3]
+                    ]
+                })
+            results.append(result)
+    finally:
+        model_client.registry.set_factory(model_client._gemini_factory)
+    return results
+
+def _report(results: List[Dict], as_json: bool = False):
+    """Print benchmark results"""
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for result in results:
+        details = ", ".join(f"{k}={v}" for k, v in result.items() if k != "benchmark")
+        print(f"⏱️ {result['benchmark']}: {details}")
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="EduMentor benchmarks")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    imports = subparsers.add_parser("imports", help="Import time of the core modules")
+    imports.add_argument("--repeats", type=int, default=5)
+    imports.add_argument("--check", action="store_true", help="Fail if a budget is exceeded")
+
+    router = subparsers.add_parser("router", help="Intent routing with many concepts")
+    router.add_argument("--concepts", type=int, default=10000)
+    router.add_argument("--queries", type=int, default=2000)
+
+    retrieval = subparsers.add_parser("retrieval", help="Vector retrieval latency")
+    retrieval.add_argument("--chunks", type=int, default=1000000)
+    retrieval.add_argument("--partitions", type=int, default=1024)
+    retrieval.add_argument("--nprobe", type=int, default=8)
+
+    grading = subparsers.add_parser("grading", help="Batch versus looped grading")
+    grading.add_argument("--responses", type=int, default=10000)
+
+    plagiarism = subparsers.add_parser("plagiarism", help="MinHash/LSH near-duplicate search")
+    plagiarism.add_argument("--submissions", type=int, default=100000)
+    plagiarism.add_argument("--planted", type=int, default=1000)
+
+    assessment = subparsers.add_parser("assessment", help="Multi-process batch grading")
+    assessment.add_argument("--submissions", type=int, default=200000)
+    assessment.add_argument("--workers", type=int, nargs="+")
+
+    tutor = subparsers.add_parser("tutor", help="Adaptive-difficulty profile updates")
+    tutor.add_argument("--students", type=int, default=5000)
+    tutor.add_argument("--updates", type=int, default=100000)
+
+    templates = subparsers.add_parser("templates", help="Template rendering")
+    templates.add_argument("--topics", type=int, default=20000)
+
+    quizzes = subparsers.add_parser("quizbank", help="Quiz bank sampling")
+    quizzes.add_argument("--questions", type=int, default=100000)
+
+    text = subparsers.add_parser("text", help="Streaming text-complexity analysis")
+    text.add_argument("--megabytes", type=int, default=20)
+
+    corpus = subparsers.add_parser("corpus", help="Batch corpus analysis")
+    corpus.add_argument("--documents", type=int, default=5000)
+    corpus.add_argument("--workers", type=int)
+
+    keywords = subparsers.add_parser("keywords", help="Rubric keyword validation")
+    keywords.add_argument("--responses", type=int, default=5000)
+
+    schedules = subparsers.add_parser("schedule", help="Cohort study-schedule generation")
+    schedules.add_argument("--students", type=int, default=500)
+    schedules.add_argument("--topics", type=int, default=300)
+    schedules.add_argument("--days", type=int, default=120)
+
+    reviews = subparsers.add_parser("reviews", help="Spaced-repetition review queue")
+    reviews.add_argument("--cards", type=int, default=1000000)
+    reviews.add_argument("--students", type=int, default=10000)
+
+    analytics = subparsers.add_parser("analytics", help="Columnar interaction analytics")
+    analytics.add_argument("--rows", type=int, default=1000000)
+
+    subjects = subparsers.add_parser("subjects", help="Subject classification")
+    subjects.add_argument("--queries", type=int, default=20000)
+
+    root = subparsers.add_parser("root", help="Concurrent ROOT_AGENT stress test")
+    root.add_argument("--calls", type=int, default=2000)
+    root.add_argument("--threads", type=int, nargs="+")
+    root.add_argument("--check", action="store_true", help="Exit non-zero if any update is lost")
+
+    routing = subparsers.add_parser("agents", help="Hedged multi-agent routing")
+    routing.add_argument("--queries", type=int, default=200)
+    routing.add_argument("--hedge-ms", type=float, default=30)
+
+    speculative = subparsers.add_parser("speculative", help="Speculative fast-path answers")
+    speculative.add_argument("--queries", type=int, default=200)
+    speculative.add_argument("--deadline-ms", type=float, default=30)
+
+    replay = subparsers.add_parser("replay", help="Replay a query log through the full assist pipeline")
+    replay.add_argument("--log", help="Recorded query log (JSON lines or plain text); synthetic if omitted")
+    replay.add_argument("--queries", type=int, default=1000, help="Synthetic log size")
+    replay.add_argument("--students", type=int, default=50, help="Students in the synthetic log")
+    replay.add_argument("--save-log", help="Write the replayed log as JSON lines")
+    replay.add_argument("--agents", nargs="+", default=["edumentor", "gemini"], choices=["edumentor", "gemini"])
+    replay.add_argument("--latency-ms", type=float, default=5, help="Fake model latency")
+    replay.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake model calls that fail")
+    replay.add_argument("--session-length", type=int, default=20, help="Interactions before a session is ended")
+    replay.add_argument("--no-tracemalloc", action="store_true", help="Skip the memory pass")
+    replay.add_argument("--output", help="Also write the results as JSON to this file")
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "imports":
+        results = run_import_benchmarks(args.repeats)
+        _report(results, args.json)
+        if args.check and not all(r["within_budget"] for r in results):
+            print("❌ Import-time budget exceeded", file=sys.stderr)
+            return 1
+    elif args.benchmark == "router":
+        _report(bench_intent_router(args.concepts, args.queries), args.json)
+    elif args.benchmark == "retrieval":
+        _report(bench_retrieval(args.chunks, partitions=args.partitions, nprobe=args.nprobe), args.json)
+    elif args.benchmark == "grading":
+        _report(bench_batch_grading(args.responses), args.json)
+    elif args.benchmark == "plagiarism":
+        _report(bench_plagiarism(args.submissions, args.planted), args.json)
+    elif args.benchmark == "assessment":
+        _report(bench_assessment_pool(args.submissions, args.workers), args.json)
+    elif args.benchmark == "tutor":
+        _report(bench_tutor_profiles(args.students, num_updates=args.updates), args.json)
+    elif args.benchmark == "templates":
+        _report(bench_templates(args.topics), args.json)
+    elif args.benchmark == "quizbank":
+        _report(bench_quiz_bank(args.questions), args.json)
+    elif args.benchmark == "text":
+        _report(bench_text_analysis(args.megabytes), args.json)
+    elif args.benchmark == "corpus":
+        _report(bench_corpus_analysis(args.documents, args.workers), args.json)
+    elif args.benchmark == "keywords":
+        _report(bench_keyword_validation(args.responses), args.json)
+    elif args.benchmark == "schedule":
+        _report(bench_study_schedules(args.students, args.topics, args.days), args.json)
+    elif args.benchmark == "reviews":
+        _report(bench_review_queue(args.cards, args.students), args.json)
+    elif args.benchmark == "analytics":
+        _report(bench_analytics_store(args.rows), args.json)
+    elif args.benchmark == "subjects":
+        _report(bench_subject_classifier(args.queries), args.json)
+    elif args.benchmark == "agents":
+        _report(bench_agent_router(args.queries, hedge_ms=args.hedge_ms), args.json)
+    elif args.benchmark == "speculative":
+        _report(bench_speculative_assist(args.queries, deadline_ms=args.deadline_ms), args.json)
+    elif args.benchmark == "replay":
+        log = load_query_log(args.log) if args.log else synthetic_query_log(args.queries, args.students)
+        if args.save_log:
+            with open(args.save_log, "w") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in log)
+        results = bench_replay(log, args.agents, latency_ms=args.latency_ms, error_rate=args.error_rate,
+                               session_length=args.session_length, trace_memory=not args.no_tracemalloc)
+        _report(results, args.json)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+    elif args.benchmark == "root":
+        results = bench_root_agent(args.calls, args.threads)
+        _report(results, args.json)
+        if args.check and not all(r["lost_updates"] == 0 and r["lost_conversations"] == 0 for r in results):
+            print("❌ Concurrent root-agent updates were lost", file=sys.stderr)
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
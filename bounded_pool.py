@@ -0,0 +1,53 @@
+"""
+Bounded thread pools for EduMentor AI
+Pools that refuse work when full, for calls that must never queue behind a slow upstream
+"""
+
+import threading
+
+
+class BoundedPool:
+    """A thread pool that refuses work instead of queueing it when every thread is busy
+
+    A call stuck on a slow upstream holds its thread until it returns, so
+    a queue behind it would only delay new work; submit() returns None
+    instead and the caller falls back to something that needs no thread.
+    """
+
+    def __init__(self, workers: int, name: str):
+        self.workers = workers
+        self.name = name
+        self.busy = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, task, *args):
+        """Future of task(*args), or None when no thread is free"""
+        with self._lock:
+            if self.busy >= self.workers:
+                return None
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            self.busy += 1
+            executor = self._executor
+        try:
+            future = executor.submit(task, *args)
+        except RuntimeError:  # Closed meanwhile
+            self._release()
+            return None
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future=None):
+        with self._lock:
+            self.busy -= 1
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+__all__ = ['BoundedPool']
@@ -0,0 +1,46 @@
+"""
+Dictionary Encoding for EduMentor AI
+Small integer codes for repeated values (students, rubrics, subjects) in columnar data
+"""
+
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+
+class DictionaryEncoder:
+    """Dictionary encoding: each distinct value gets a small integer code
+
+    Codes are assigned in order of first appearance, so `values[code]`
+    decodes and the values list can be persisted and re-encoded to
+    rebuild the same codes.
+    """
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self.encode(values)
+
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        codes = self._codes
+        encoded = []
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values)
+                self.values.append(value)
+            encoded.append(code)
+        return np.array(encoded, dtype=np.int32)
+
+    def decode(self, codes: np.ndarray) -> List[Any]:
+        values = self.values
+        return [values[code] for code in codes.tolist()]
+
+    def code(self, value: Any) -> int:
+        return self._codes.get(value, -1)
+
+    def __len__(self):
+        return len(self.values)
+
+
+__all__ = ['DictionaryEncoder']
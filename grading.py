@@ -0,0 +1,241 @@
+"""
+Batch Grading for EduMentor AI
+Process-pool grading against rubrics shipped to each worker once
+"""
+
+import os
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from dictionary_encoder import DictionaryEncoder
+from text_utils import tokenize_response
+
+# Rubrics (rubric -> question -> reference word set) tokenized once per worker
+_worker_rubrics: Dict[str, Dict[Any, frozenset]] = {}
+
+
+def _tokenize_rubrics(rubrics: Dict[str, Dict[Any, str]]) -> Dict[str, Dict[Any, frozenset]]:
+    return {
+        name: {question: frozenset(tokenize_response(answer)) for question, answer in questions.items()}
+        for name, questions in rubrics.items()
+    }
+
+
+def _init_worker(rubrics: Dict[str, Dict[Any, str]]):
+    """Process-pool initializer: receive and tokenize the rubrics once"""
+    global _worker_rubrics
+    _worker_rubrics = _tokenize_rubrics(rubrics)
+
+
+def score_shard(rubric_names: List[str], questions: List[Any], responses: List[str],
+                rubrics: Optional[Dict[str, Dict[Any, frozenset]]] = None) -> np.ndarray:
+    """Scores (same scale as EduMentorAgent.evaluate) for one shard
+
+    Responses whose rubric or question is unknown score NaN.
+    """
+    rubrics = _worker_rubrics if rubrics is None else rubrics
+    scores = np.empty(len(responses), dtype=np.float32)
+
+    for row, (rubric, question, response) in enumerate(zip(rubric_names, questions, responses)):
+        reference = rubrics.get(rubric, {}).get(question)
+        if reference is None:
+            scores[row] = np.nan
+            continue
+        words = tokenize_response(response)
+        shared = len(words & reference)
+        union = len(words) + len(reference) - shared
+        similarity = shared / union if words and reference else 0.0
+        scores[row] = round(max(60, min(100, similarity * 100)), 1)
+    return scores
+
+
+def _score_job(shard_index: int, rubric_names, questions, responses) -> Tuple[int, np.ndarray]:
+    return shard_index, score_shard(rubric_names, questions, responses)
+
+
+def batch_similarity(responses: List[str], answers: List[str], metric: str = "jaccard") -> np.ndarray:
+    """Row-wise Jaccard or cosine similarity of the word sets of parallel lists
+
+    Each response is tokenized once and each distinct reference answer only
+    once (a class usually shares a handful of answers). Overlap counts come
+    from C-level set intersection; the metric itself is computed for the
+    whole batch with NumPy.
+    """
+    rows = len(responses)
+    answer_sets: Dict[str, set] = {}
+    intersections = np.empty(rows, dtype=np.float64)
+    left_sizes = np.empty(rows, dtype=np.float64)
+    right_sizes = np.empty(rows, dtype=np.float64)
+
+    for row, (response, answer) in enumerate(zip(responses, answers)):
+        words = tokenize_response(response)
+        answer_words = answer_sets.get(answer)
+        if answer_words is None:
+            answer_words = answer_sets[answer] = tokenize_response(answer)
+        intersections[row] = len(words & answer_words)
+        left_sizes[row] = len(words)
+        right_sizes[row] = len(answer_words)
+
+    if metric == "jaccard":
+        denominators = left_sizes + right_sizes - intersections
+    elif metric == "cosine":
+        denominators = np.sqrt(left_sizes * right_sizes)
+    else:
+        raise ValueError(f"Unknown similarity metric: {metric}")
+
+    valid = (left_sizes > 0) & (right_sizes > 0)
+    return np.divide(intersections, denominators, out=np.zeros(rows), where=valid)
+
+
+class GradeTable:
+    """Append-only columnar table of grading results
+
+    Student, rubric and question columns are dictionary-encoded int32
+    codes; scores are float32 and timestamps float64. Appends are kept as
+    chunks and concatenated on first read.
+    """
+
+    CATEGORICAL = ("student_id", "rubric", "question")
+
+    def __init__(self):
+        self._dictionaries = {name: DictionaryEncoder() for name in self.CATEGORICAL}
+        self._chunks: Dict[str, List[np.ndarray]] = {
+            name: [] for name in self.CATEGORICAL + ("score", "graded_at")
+        }
+        self._length = 0
+
+    def append(self, student_ids: List[Any], rubrics: List[str], questions: List[Any],
+               scores: np.ndarray, graded_at: Optional[float] = None):
+        """Append one batch of results (parallel columns)"""
+        columns = {"student_id": student_ids, "rubric": rubrics, "question": questions}
+        for name, values in columns.items():
+            self._chunks[name].append(self._dictionaries[name].encode(values))
+        self._chunks["score"].append(np.asarray(scores, dtype=np.float32))
+        self._chunks["graded_at"].append(np.full(len(scores), graded_at or time.time()))
+        self._length += len(scores)
+
+    def codes(self, name: str) -> np.ndarray:
+        """Raw column (dictionary codes for categorical columns)"""
+        chunks = self._chunks[name]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        if chunks:
+            return chunks[0]
+        return np.empty(0, dtype=np.float32 if name == "score" else np.int32)
+
+    def column(self, name: str) -> List[Any]:
+        """Decoded column values"""
+        if name in self._dictionaries:
+            return self._dictionaries[name].decode(self.codes(name))
+        return self.codes(name).tolist()
+
+    def mean_score(self, by: str = "student_id") -> Dict[Any, float]:
+        """Mean score per student/rubric/question, ignoring ungraded rows"""
+        scores = self.codes("score")
+        keys = self.codes(by)
+        graded = ~np.isnan(scores)
+        values = self._dictionaries[by].values
+        totals = np.bincount(keys[graded], weights=scores[graded], minlength=len(values))
+        counts = np.bincount(keys[graded], minlength=len(values))
+        return {
+            values[code]: round(float(totals[code] / counts[code]), 2)
+            for code in np.flatnonzero(counts)
+        }
+
+    def scores_for(self, student_id: Any) -> np.ndarray:
+        """All scores recorded for one student"""
+        return self.codes("score")[self.codes("student_id") == self._dictionaries["student_id"].code(student_id)]
+
+    def to_pandas(self):
+        """Columns as a DataFrame (categorical columns as pandas Categoricals)"""
+        import pandas as pd
+
+        data = {
+            name: pd.Categorical.from_codes(self.codes(name), categories=self._dictionaries[name].values)
+            for name in self.CATEGORICAL
+        }
+        data["score"] = self.codes("score")
+        data["graded_at"] = pd.to_datetime(self.codes("graded_at"), unit="s")
+        return pd.DataFrame(data)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.codes(name).nbytes for name in self._chunks)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        columns = [self.column(name) for name in self._chunks]
+        for row in zip(*columns):
+            yield dict(zip(self._chunks, row))
+
+
+class GradingPool:
+    """Process pool that grades submissions against a fixed set of rubrics
+
+    Rubrics are sent to each worker once, through the pool initializer;
+    jobs then only carry their shard of responses and return a float32
+    score array. With `workers` <= 1 everything is graded in-process.
+    Workers stop on close(), on leaving a `with` block, or when the pool
+    is garbage-collected.
+    """
+
+    def __init__(self, rubrics: Dict[str, Dict[Any, str]], workers: Optional[int] = None):
+        self.rubrics = rubrics
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        self._finalizer = None
+        self._local_rubrics = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.rubrics,)
+            )
+            self._finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    def imap_shards(self, rubric_names: List[str], questions: List[Any], responses: List[str],
+                    shard_size: int = 2000) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (start_row, scores) per shard, in completion order"""
+        starts = range(0, len(responses), shard_size)
+
+        if self.workers <= 1:
+            if self._local_rubrics is None:
+                self._local_rubrics = _tokenize_rubrics(self.rubrics)
+            for start in starts:
+                end = start + shard_size
+                yield start, score_shard(rubric_names[start:end], questions[start:end],
+                                         responses[start:end], self._local_rubrics)
+            return
+
+        pool = self._pool()
+        futures = [
+            pool.submit(_score_job, start, rubric_names[start:start + shard_size],
+                        questions[start:start + shard_size], responses[start:start + shard_size])
+            for start in starts
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._executor is not None:
+            self._finalizer.detach()
+            self._executor.shutdown()
+            self._executor = None
+            self._finalizer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+__all__ = ['GradingPool', 'GradeTable', 'score_shard', 'batch_similarity']
@@ -0,0 +1,228 @@
+"""
+Intent Routing for EduMentor AI
+Single-pass intent and entity matching over student queries
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: finds every pattern occurrence in one scan"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [-1]       # Pattern ending exactly at a state
+        self._output_link: List[int] = [0]   # Nearest suffix state with an output
+
+        for pattern in patterns:
+            self._insert(pattern)
+        self._build_links()
+        # Full-DFA transitions, filled in lazily for characters of the patterns
+        # only (at most states x alphabet entries); any other character leads
+        # back to the root and is never cached
+        self._alphabet = frozenset(char for pattern in self.patterns for char in pattern)
+        self._delta: List[Dict[str, int]] = [{} for _ in self._goto]
+
+    def _insert(self, pattern: str):
+        """Add a pattern to the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._output_link.append(0)
+            state = next_state
+
+        if self._output[state] == -1:
+            self._output[state] = len(self.patterns)
+            self.patterns.append(pattern)
+
+    def _build_links(self):
+        """Compute failure and output links breadth-first"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+
+                self._fail[next_state] = fail
+                self._output_link[next_state] = fail if self._output[fail] != -1 else self._output_link[fail]
+
+    def _transition(self, state: int, char: str) -> int:
+        """Follow failure links for a transition the DFA cache has not seen yet"""
+        if char not in self._alphabet:
+            return 0
+        goto, fail = self._goto, self._fail
+        current = state
+        while current and char not in goto[current]:
+            current = fail[current]
+        next_state = goto[current].get(char, 0)
+        self._delta[state][char] = next_state
+        return next_state
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_id) for every occurrence, overlaps included"""
+        delta, output, output_link = self._delta, self._output, self._output_link
+        state = 0
+
+        for index, char in enumerate(text):
+            next_state = delta[state].get(char)
+            state = self._transition(state, char) if next_state is None else next_state
+
+            match_state = state if output[state] != -1 else output_link[state]
+            while match_state:
+                yield index, output[match_state]
+                match_state = output_link[match_state]
+
+    def find_all(self, text: str) -> set:
+        """Ids of every pattern occurring in the text"""
+        delta, output, output_link = self._delta, self._output, self._output_link
+        found = set()
+        state = 0
+
+        for char in text:
+            next_state = delta[state].get(char)
+            state = self._transition(state, char) if next_state is None else next_state
+
+            match_state = state if output[state] != -1 else output_link[state]
+            while match_state:
+                found.add(output[match_state])
+                match_state = output_link[match_state]
+        return found
+
+    def __len__(self):
+        return len(self.patterns)
+
+
+class RouteMatch:
+    """Result of routing one query: the winning intent plus matched entities"""
+
+    __slots__ = ("query", "intent", "intents", "entities")
+
+    def __init__(self, query: str, intent: str, intents: List[str], entities: Dict[str, List[Tuple[str, Any]]]):
+        self.query = query
+        self.intent = intent
+        self.intents = intents
+        self.entities = entities
+
+    def entity(self, kind: str) -> Optional[Tuple[str, Any]]:
+        """First registered (name, payload) of this kind found in the query"""
+        found = self.entities.get(kind)
+        return found[0] if found else None
+
+    def __repr__(self):
+        return f"RouteMatch(intent={self.intent!r}, entities={ {k: [n for n, _ in v] for k, v in self.entities.items()} })"
+
+
+class IntentRouter:
+    """Compiled matcher over intent trigger phrases and entity names
+
+    Everything is matched case-insensitively as a substring, in a single
+    pass over the query. Intents are ranked by priority (lower wins) and
+    entities of each kind are reported in registration order. Registering
+    new phrases marks the automaton stale; it is rebuilt on the next route.
+    """
+
+    def __init__(self, default_intent: str = "general"):
+        self.default_intent = default_intent
+        self._lock = threading.Lock()
+        self._intent_priority: Dict[str, int] = {}
+        self._intent_phrases: Dict[str, List[str]] = {}
+        self._entities: Dict[str, Dict[str, Tuple[int, Any]]] = {}
+        self._registrations = 0
+        self._compiled: Optional[Tuple[AhoCorasick, List[List[Tuple]]]] = None
+
+    def add_intent(self, intent: str, phrases: Iterable[str], priority: Optional[int] = None):
+        """Register trigger phrases for an intent (priority defaults to last)"""
+        with self._lock:
+            if intent not in self._intent_priority:
+                self._intent_priority[intent] = len(self._intent_priority) if priority is None else priority
+            elif priority is not None:
+                self._intent_priority[intent] = priority
+            self._intent_phrases.setdefault(intent, []).extend(p.lower() for p in phrases)
+            self._compiled = None
+
+    def add_entity(self, kind: str, name: str, payload: Any = None):
+        """Register (or update) a named entity such as a concept"""
+        with self._lock:
+            entities = self._entities.setdefault(kind, {})
+            key = name.lower()
+            order = entities[key][0] if key in entities else self._registrations
+            entities[key] = (order, payload)
+            self._registrations += 1
+            self._compiled = None
+
+    def add_entities(self, kind: str, entries: Dict[str, Any]):
+        """Register many entities of one kind at once"""
+        with self._lock:
+            entities = self._entities.setdefault(kind, {})
+            for name, payload in entries.items():
+                key = name.lower()
+                order = entities[key][0] if key in entities else self._registrations
+                entities[key] = (order, payload)
+                self._registrations += 1
+            self._compiled = None
+
+    def _compile(self) -> Tuple[AhoCorasick, List[List[Tuple]]]:
+        """Build the automaton and the pattern -> target table"""
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+
+            targets: Dict[str, List[Tuple]] = {}
+            for intent, phrases in self._intent_phrases.items():
+                for phrase in phrases:
+                    targets.setdefault(phrase, []).append(("intent", self._intent_priority[intent], intent))
+            for kind, entities in self._entities.items():
+                for name, (order, payload) in entities.items():
+                    targets.setdefault(name, []).append(("entity", order, kind, name, payload))
+
+            automaton = AhoCorasick(targets)
+            table = [targets[pattern] for pattern in automaton.patterns]
+            self._compiled = (automaton, table)
+            return self._compiled
+
+    def route(self, query: str) -> RouteMatch:
+        """Match intents and entities in a single scan over the query"""
+        automaton, table = self._compiled or self._compile()
+
+        intents: Dict[str, int] = {}
+        entities: Dict[str, Dict[str, Tuple[int, Any]]] = {}
+        for _, pattern_id in automaton.iter_matches(query.lower()):
+            for target in table[pattern_id]:
+                if target[0] == "intent":
+                    intents[target[2]] = target[1]
+                else:
+                    entities.setdefault(target[2], {})[target[3]] = (target[1], target[4])
+
+        ranked_intents = sorted(intents, key=intents.get)
+        ranked_entities = {
+            kind: [(name, payload) for name, (_, payload) in sorted(found.items(), key=lambda item: item[1][0])]
+            for kind, found in entities.items()
+        }
+
+        return RouteMatch(
+            query,
+            ranked_intents[0] if ranked_intents else self.default_intent,
+            ranked_intents,
+            ranked_entities
+        )
+
+    def __len__(self):
+        return sum(len(p) for p in self._intent_phrases.values()) + sum(len(e) for e in self._entities.values())
+
+
+__all__ = ['AhoCorasick', 'RouteMatch', 'IntentRouter']
@@ -0,0 +1,280 @@
+"""
+Knowledge Store for EduMentor AI
+Disk-backed, memory-mapped concept store with an inverted term index
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"EKB1"
+DEFAULT_STORE_PATH = "knowledge_base.ekb"
+STORE_PATH_ENV = "EDUMENTOR_KNOWLEDGE_BASE"
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def _hash(text: str) -> int:
+    """Stable 64-bit hash (Python's hash() differs between processes)"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercased word terms of a text"""
+    return _TERM_PATTERN.findall(text.lower())
+
+
+def _normalize_name(name: str) -> str:
+    """Concept name as find_concept sees it in a query ("Newton's laws" -> "newton s laws")"""
+    return " ".join(_terms(name))
+
+
+class KnowledgeStore:
+    """Read-only concept store backed by a single memory-mapped file
+
+    The file holds the entry records, a sorted table of name hashes for
+    exact lookups and an inverted index (sorted term hashes + postings).
+    Every array is a zero-copy view over the mapping, so worker processes
+    opening the same file share one copy through the OS page cache. The
+    file is only opened on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._sections: Optional[Dict[str, np.ndarray]] = None
+        self._mmap = None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str]], path: str) -> "KnowledgeStore":
+        """Write (name, text) entries to `path` and return a store over it"""
+        offsets = [0]
+        records = []
+        name_hashes = []
+        posting_terms = []
+        posting_ids = []
+
+        for entry_id, (name, text) in enumerate(entries):
+            record = f"{name}\0{text}".encode("utf-8")
+            records.append(record)
+            offsets.append(offsets[-1] + len(record))
+            name_hashes.append(_hash(_normalize_name(name)))
+
+            for term in set(_terms(name) + _terms(text)):
+                posting_terms.append(_hash(term))
+                posting_ids.append(entry_id)
+
+        name_hashes = np.array(name_hashes, dtype=np.uint64)
+        name_order = np.argsort(name_hashes, kind="stable").astype(np.uint32)
+
+        posting_terms = np.array(posting_terms, dtype=np.uint64)
+        posting_ids = np.array(posting_ids, dtype=np.uint32)
+        order = np.lexsort((posting_ids, posting_terms))
+        posting_terms, posting_ids = posting_terms[order], posting_ids[order]
+        term_hashes, term_starts = np.unique(posting_terms, return_index=True)
+        term_offsets = np.append(term_starts, len(posting_ids)).astype(np.uint64)
+
+        sections = {
+            "entry_offsets": np.array(offsets, dtype=np.uint64),
+            "name_hashes": name_hashes[name_order],
+            "name_order": name_order,
+            "term_hashes": term_hashes.astype(np.uint64),
+            "term_offsets": term_offsets,
+            "postings": posting_ids,
+            "records": np.frombuffer(b"".join(records), dtype=np.uint8)
+        }
+        cls._write(path, sections)
+        return cls(path)
+
+    @classmethod
+    def build_from_jsonl(cls, source: str, path: str) -> "KnowledgeStore":
+        """Build a store from a JSON-lines file of {"name": ..., "text": ...}"""
+        def entries():
+            with open(source, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        yield item["name"], item["text"]
+
+        return cls.build(entries(), path)
+
+    @staticmethod
+    def _write(path: str, sections: Dict[str, np.ndarray]):
+        """Serialize sections with a JSON header, each section 8-byte aligned"""
+        layout = {}
+        position = 0
+        for name, array in sections.items():
+            layout[name] = {"offset": position, "dtype": array.dtype.str, "count": int(array.size)}
+            position += (array.nbytes + 7) // 8 * 8
+
+        header = json.dumps(layout).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 4 + len(header)) % 8)
+        data_start = len(MAGIC) + 4 + len(header)
+
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for name, array in sections.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(data_start + position)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _load(self) -> Dict[str, np.ndarray]:
+        """Map the file and build zero-copy views over each section"""
+        with self._lock:
+            if self._sections is not None:
+                return self._sections
+
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if mapped[:len(MAGIC)] != MAGIC:
+                mapped.close()
+                raise ValueError(f"{self.path} is not an EduMentor knowledge store")
+
+            header_length = struct.unpack("<I", mapped[len(MAGIC):len(MAGIC) + 4])[0]
+            data_start = len(MAGIC) + 4 + header_length
+            layout = json.loads(mapped[len(MAGIC) + 4:data_start])
+
+            sections = {}
+            for name, spec in layout.items():
+                sections[name] = np.frombuffer(
+                    mapped, dtype=np.dtype(spec["dtype"]),
+                    count=spec["count"], offset=data_start + spec["offset"]
+                )
+
+            self._mmap = mapped
+            self._sections = sections
+            return sections
+
+    @property
+    def sections(self) -> Dict[str, np.ndarray]:
+        return self._sections or self._load()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def __len__(self):
+        return len(self.sections["entry_offsets"]) - 1
+
+    def entry(self, entry_id: int) -> Tuple[str, str]:
+        """Return (name, text) for an entry id"""
+        sections = self.sections
+        start, end = sections["entry_offsets"][entry_id:entry_id + 2]
+        name, _, text = sections["records"][start:end].tobytes().decode("utf-8").partition("\0")
+        return name, text
+
+    def get(self, name: str) -> Optional[str]:
+        """Exact lookup of a concept by name, ignoring case and punctuation"""
+        sections = self.sections
+        target = _normalize_name(name)
+        hashes = sections["name_hashes"]
+        key = np.uint64(_hash(target))
+
+        index = int(np.searchsorted(hashes, key))
+        while index < len(hashes) and hashes[index] == key:
+            entry_name, text = self.entry(int(sections["name_order"][index]))
+            if _normalize_name(entry_name) == target:
+                return text
+            index += 1
+        return None
+
+    def postings(self, term: str) -> np.ndarray:
+        """Entry ids containing a term (zero-copy view)"""
+        sections = self.sections
+        hashes = sections["term_hashes"]
+        key = np.uint64(_hash(term.lower()))
+
+        index = int(np.searchsorted(hashes, key))
+        if index == len(hashes) or hashes[index] != key:
+            return sections["postings"][:0]
+        start, end = sections["term_offsets"][index:index + 2]
+        return sections["postings"][start:end]
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Rank entries by how many (IDF-weighted) query terms they contain"""
+        terms = set(_terms(query))
+        if not terms:
+            return []
+
+        total = len(self)
+        ids = []
+        weights = []
+        for term in terms:
+            matches = self.postings(term)
+            if len(matches):
+                ids.append(matches)
+                weights.append(np.full(len(matches), np.log(1 + total / len(matches))))
+        if not ids:
+            return []
+
+        # Score only the candidate entries, not an array sized to the store
+        candidates, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(weights))
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.entry(int(candidates[i]))[0], round(float(scores[i]), 4)) for i in top]
+
+    def find_concept(self, query: str, max_words: int = 4) -> Optional[Tuple[str, str]]:
+        """Find the longest concept name that appears as a phrase in the query"""
+        words = _terms(query)
+        for size in range(min(max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                name = " ".join(words[start:start + size])
+                text = self.get(name)
+                if text is not None:
+                    return name, text
+        return None
+
+    def close(self):
+        """Release the memory mapping"""
+        with self._lock:
+            self._sections = None
+            if self._mmap is not None:
+                try:
+                    self._mmap.close()
+                except BufferError:
+                    pass  # Views still held by callers; freed with them
+                self._mmap = None
+
+
+_stores: Dict[str, KnowledgeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_knowledge_store(path: Optional[str] = None) -> Optional[KnowledgeStore]:
+    """Shared store for `path` (default: $EDUMENTOR_KNOWLEDGE_BASE), None if absent or unreadable
+
+    Only stores that load are cached, so one installed or repaired later is picked up.
+    """
+    path = path or os.environ.get(STORE_PATH_ENV, DEFAULT_STORE_PATH)
+    store = _stores.get(path)
+    if store is not None:
+        return store
+    if not os.path.exists(path):
+        return None
+
+    with _stores_lock:
+        if path not in _stores:
+            store = KnowledgeStore(path)
+            try:
+                store.sections
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not load knowledge store {path}: {e}")
+                return None
+            _stores[path] = store
+        return _stores[path]
+
+
+__all__ = ['KnowledgeStore', 'get_knowledge_store', 'DEFAULT_STORE_PATH']
@@ -4,7 +4,6 @@ EduMentor: AI-Powered Educational Assistant
 Main Application File - Updated for Kaggle
 """
 
-import sys
 import os
 import argparse
 
@@ -31,37 +30,58 @@ def setup_api_key():
     
     return api_key
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="EduMentor AI Educational System")
+    parser.add_argument(
+        "--startup",
+        choices=["deferred", "eager", "skip"],
+        default="deferred",
+        help="Gemini connection check: run it in the background (deferred), "
+             "block on it (eager) or skip it entirely"
+    )
+    # Ignore unknown arguments such as the kernel flags passed in notebooks
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+def main(argv=None):
     """Main entry point - Updated for API key"""
+    args = parse_args(argv)
+    
     print("🎓 EduMentor AI Educational System")
     print("="*50)
     
     # Setup API key
     api_key = setup_api_key()
+    health = None
     
     if api_key:
         print(f"✅ API Key: Found ({api_key[:8]}...{api_key[-4:]})")
         
-        # Configure Gemini
-        try:
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            
-            # Test the API
-            model = genai.GenerativeModel('gemini-pro')
-            response = model.generate_content("Say 'Hello from EduMentor'")
-            print(f"🤖 Gemini API: Connected - '{response.text}'")
-            
-        except Exception as e:
-            print(f"⚠️ Gemini API Error: {e}")
-            print("   Continuing in demo mode...")
-            api_key = None
+        # Check the connection with a cached, lightweight probe instead of a
+        # full generation round trip; the model client itself is shared with
+        # GeminiAgent and only built when first needed
+        import model_client
+        
+        if args.startup == "eager":
+            status = model_client.check_health(api_key)
+            if status["ok"]:
+                cached = " (cached)" if status["cached"] else ""
+                print(f"🤖 Gemini API: Connected - '{status['detail']}'{cached}")
+            else:
+                print(f"⚠️ Gemini API Error: {status['detail']}")
+                print("   Continuing in demo mode...")
+                api_key = None
+        elif args.startup == "deferred":
+            health = model_client.check_health_async(api_key)
+            print("🤖 Gemini API: Connection check running in background")
     else:
         print("⚠️ No API key found. Running in demo mode.")
     
     # Now import and run the rest of your system
     try:
         from agents import EduMentorAgent, GeminiAgent
+        from agent_router import AgentRouter
         from tools import educational_tools, format_response
         
         print(f"\n📚 Available tools: {len(educational_tools)}")
@@ -72,6 +92,12 @@ def main():
         
         print(f"🤖 Agents created: {basic_agent.name}, {gemini_agent.name}")
         
+        # Gemini answers when it can; the basic agent covers errors and slow responses
+        agents = {"general": basic_agent}
+        if gemini_agent.gemini_available:
+            agents["gemini"] = gemini_agent
+        router = AgentRouter(agents)
+        
         # Run demo
         print("\n" + "="*50)
         print("DEMO MODE")
@@ -83,17 +109,21 @@ def main():
             "Tell me about the solar system"
         ]
         
-        for query in demo_queries:
-            print(f"\n❓ Query: {query}")
-            print("-" * 30)
-            
-            # Get response from Gemini agent if available
-            if gemini_agent.gemini_available:
-                response = gemini_agent.assist(query)
-                print(f"🌟 Gemini: {format_response(response, 100)}")
-            else:
-                response = basic_agent.assist(query)
-                print(f"🤖 Basic: {format_response(response, 100)}")
+        try:
+            for query in demo_queries:
+                print(f"\n❓ Query: {query}")
+                print("-" * 30)
+                
+                result = router.route(query)
+                label = "🌟 Gemini" if result["agent"] == "gemini" else "🤖 Basic"
+                print(f"{label}: {format_response(result['answer'], 100)}")
+        finally:
+            router.close()
+        
+        if health is not None and health["done"].is_set():
+            status = health["status"]
+            state = "Connected" if status["ok"] else f"Error - {status['detail']}"
+            print(f"\n🤖 Gemini API check: {state}")
         
         print("\n" + "="*50)
         print("✅ EduMentor System Ready!")
@@ -104,9 +134,13 @@ def main():
         print("\nTrying to download files...")
         
         # Try to download files
+        import urllib.request
         github_url = "https://raw.githubusercontent.com/Tethi04/EduMentor-Capstone-Project/main/"
-        !curl -s -L -o agents.py {github_url}agents.py
-        !curl -s -L -o tools.py {github_url}tools.py
+        for filename in ["agents.py", "tools.py"]:
+            try:
+                urllib.request.urlretrieve(github_url + filename, filename)
+            except OSError as download_error:
+                print(f"⚠️ Could not download {filename}: {download_error}")
         
         # Try import again
         try:
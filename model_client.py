@@ -0,0 +1,197 @@
+"""
+Shared Gemini Model Client for EduMentor
+Pools configured model handles per process and caches connection health checks
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_MODEL = "gemini-pro"
+# Per-user cache, so health results never land in whatever directory the process runs from
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")), "edumentor")
+HEALTH_CACHE_FILE = os.path.join(CACHE_DIR, "gemini_health.json")
+HEALTH_TTL_SECONDS = 600
+
+_health: Dict[str, Dict] = {}
+
+
+def _key_fingerprint(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _freeze_config(config: Dict) -> str:
+    """Hashable, order-independent form of a model config"""
+    return json.dumps(config, sort_keys=True, default=repr)
+
+
+@lru_cache(maxsize=1)
+def sdk_available() -> bool:
+    """Check whether google-generativeai is installed without importing it"""
+    try:
+        return importlib.util.find_spec("google.generativeai") is not None
+    except ImportError:
+        return False
+
+
+def _gemini_factory(api_key: str, model_name: str, config: Dict):
+    """Build a GenerativeModel (the SDK must already be configured)"""
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name, **config)
+
+
+class ModelClientRegistry:
+    """Process-wide pool of model handles keyed by (API key, model name, config)
+
+    Each distinct (key, model, config) is built once, so agents can be
+    created per request for free. Lookups of existing handles do not take
+    the lock. The SDK holds a single global key, so once Gemini handles
+    exist for one key, asking for another raises instead of silently
+    moving the existing handles onto it.
+    """
+    
+    def __init__(self, model_factory: Callable = _gemini_factory):
+        self.model_factory = model_factory
+        self._lock = threading.Lock()
+        self._configured_key: Optional[str] = None
+        self._models: Dict[Tuple[str, str, str], Any] = {}
+    
+    def get(self, api_key: str, model_name: str = DEFAULT_MODEL, **config):
+        """Return the pooled handle for this model and config, building it once"""
+        key = (_key_fingerprint(api_key), model_name, _freeze_config(config))
+        
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self._configure(api_key)
+                model = self.model_factory(api_key, model_name, config)
+                self._models[key] = model
+            return model
+    
+    def _configure(self, api_key: str):
+        """Configure the SDK for this key (the SDK keeps one global key)"""
+        if self._configured_key == api_key or self.model_factory is not _gemini_factory:
+            return
+        if self._configured_key is not None and self._models:
+            raise RuntimeError("The Gemini SDK is already configured with another API key; "
+                               "models built for it would switch keys")
+        
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self._configured_key = api_key
+    
+    def set_factory(self, model_factory: Callable):
+        """Swap the model factory (e.g. for a local fake) and drop pooled handles"""
+        with self._lock:
+            self.model_factory = model_factory
+            self._configured_key = None
+            self._models.clear()
+    
+    def clear(self):
+        """Drop all pooled handles"""
+        with self._lock:
+            self._configured_key = None
+            self._models.clear()
+    
+    def __len__(self):
+        return len(self._models)
+
+
+# Shared registry used by main() and every agent in the process
+registry = ModelClientRegistry()
+
+
+def get_model(api_key: str, model_name: str = DEFAULT_MODEL, **config):
+    """Return the process-wide model handle, configuring the SDK on first use"""
+    return registry.get(api_key, model_name, **config)
+
+
+def _load_health_cache(cache_file: str) -> Dict:
+    """Read persisted health results"""
+    try:
+        with open(cache_file, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_health_cache(cache_file: str, results: Dict):
+    """Persist health results so the next process start can reuse them"""
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(results, f, indent=2)
+    except OSError as e:
+        print(f"Failed to save health cache: {e}")
+
+
+def check_health(api_key: str, model_name: str = DEFAULT_MODEL,
+                 ttl: float = HEALTH_TTL_SECONDS,
+                 cache_file: Optional[str] = HEALTH_CACHE_FILE) -> Dict:
+    """Lightweight connection probe, cached in memory and on disk for `ttl` seconds
+
+    Fetches the model's metadata instead of generating content, so a
+    healthy result costs one small request at most once per TTL.
+    """
+    cache_key = f"{_key_fingerprint(api_key)}:{model_name}"
+    now = time.time()
+
+    cached = _health.get(cache_key)
+    if cached is None and cache_file:
+        cached = _load_health_cache(cache_file).get(cache_key)
+    if cached and now - cached["checked_at"] < ttl:
+        _health[cache_key] = cached
+        return dict(cached, cached=True)
+
+    result = {"ok": False, "model": model_name, "checked_at": now, "detail": ""}
+    try:
+        get_model(api_key, model_name)
+        import google.generativeai as genai
+        info = genai.get_model(f"models/{model_name}")
+        result["ok"] = True
+        result["detail"] = getattr(info, "display_name", model_name)
+    except Exception as e:
+        result["detail"] = str(e)
+
+    # Only successful probes are cached; failures are retried next time
+    if result["ok"]:
+        _health[cache_key] = result
+        if cache_file:
+            results = _load_health_cache(cache_file)
+            results[cache_key] = result
+            _save_health_cache(cache_file, results)
+
+    return dict(result, cached=False)
+
+
+def check_health_async(api_key: str, model_name: str = DEFAULT_MODEL,
+                       ttl: float = HEALTH_TTL_SECONDS,
+                       cache_file: Optional[str] = HEALTH_CACHE_FILE) -> Dict:
+    """Run check_health in a background thread
+
+    Returns a dict that receives the result under "status" once the probe
+    finishes; "done" is a threading.Event that is set at that point.
+    """
+    handle = {"status": None, "done": threading.Event()}
+
+    def _probe():
+        try:
+            handle["status"] = check_health(api_key, model_name, ttl, cache_file)
+        finally:
+            handle["done"].set()
+
+    threading.Thread(target=_probe, name="gemini-health-probe", daemon=True).start()
+    return handle
+
+
+__all__ = ['DEFAULT_MODEL', 'ModelClientRegistry', 'registry', 'sdk_available', 'get_model', 'check_health', 'check_health_async']
@@ -6,7 +6,8 @@ Implements course concepts: Logging, Tracing, Metrics
 import logging
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any
+import threading
 import time
 from functools import wraps
 
@@ -304,9 +305,22 @@ def trace_agent_operation(operation_name: str):
     return decorator
 
 
-# Global observability instance
-logger = AgentLogger()
-tracer = AgentTracer()
-metrics = MetricsCollector()
+# Global observability instances, created on first access so that importing
+# this module does not configure logging or touch the filesystem
+_GLOBAL_FACTORIES = {
+    "logger": AgentLogger,
+    "tracer": AgentTracer,
+    "metrics": MetricsCollector
+}
+_globals_lock = threading.Lock()
+
+def __getattr__(name):
+    factory = _GLOBAL_FACTORIES.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _globals_lock:
+        if name not in globals():
+            globals()[name] = factory()
+    return globals()[name]
 
 __all__ = ['AgentLogger', 'AgentTracer', 'MetricsCollector', 'trace_agent_operation', 'logger', 'tracer', 'metrics']
@@ -0,0 +1,138 @@
+"""
+Plagiarism Detection for EduMentor AI
+MinHash signatures with LSH banding for near-duplicate student submissions
+"""
+
+import zlib
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from text_utils import tokenize_response
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 61) - 2)
+
+
+def token_hashes(text: str) -> np.ndarray:
+    """Sorted, unique 32-bit hashes of the words tokenize_response finds"""
+    hashes = np.fromiter(
+        (zlib.crc32(word.encode("utf-8")) for word in tokenize_response(text)),
+        dtype=np.uint64
+    )
+    return np.unique(hashes)
+
+
+def exact_jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    """Jaccard similarity of two sorted, unique hash arrays"""
+    if len(left) == 0 or len(right) == 0:
+        return 0.0
+    shared = len(np.intersect1d(left, right, assume_unique=True))
+    return shared / (len(left) + len(right) - shared)
+
+
+class MinHashLSH:
+    """Incremental near-duplicate index over student submissions
+
+    Each submission gets a `bands * rows` MinHash signature; submissions
+    sharing any band bucket become candidates, which are then verified with
+    exact Jaccard on their token hashes. Pairs above roughly
+    (1 / bands) ** (1 / rows) similarity are found with high probability
+    (about 0.42 for the defaults) without comparing every pair.
+    """
+
+    def __init__(self, bands: int = 32, rows: int = 4, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        # Universal hashing (a * h + b) mod p; the uint64 product wraps, which
+        # keeps the permutations well mixed (small a would preserve h's order)
+        self._a = rng.integers(1, int(_MERSENNE_PRIME), size=bands * rows, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=bands * rows, dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._ids: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._tokens: List[np.ndarray] = []
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """MinHash signature of a token-hash array"""
+        if len(hashes) == 0:
+            return np.full(self.bands * self.rows, _MAX_HASH, dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        bands = signature.reshape(self.bands, self.rows)
+        return [band.tobytes() for band in bands]
+
+    def add(self, submission_id: Hashable, text: str):
+        """Index a submission (ids must be unique)"""
+        if submission_id in self._positions:
+            raise ValueError(f"Submission {submission_id!r} is already indexed")
+
+        hashes = token_hashes(text)
+        position = len(self._ids)
+        self._ids.append(submission_id)
+        self._positions[submission_id] = position
+        self._tokens.append(hashes)
+
+        if len(hashes):
+            for buckets, key in zip(self._buckets, self._band_keys(self.signature(hashes))):
+                buckets.setdefault(key, []).append(position)
+
+    def _candidates(self, hashes: np.ndarray) -> set:
+        """Positions sharing at least one band bucket with these hashes"""
+        found = set()
+        if len(hashes):
+            for buckets, key in zip(self._buckets, self._band_keys(self.signature(hashes))):
+                found.update(buckets.get(key, ()))
+        return found
+
+    def query(self, text: str, threshold: float = 0.5,
+              exclude: Optional[Hashable] = None) -> List[Tuple[Hashable, float]]:
+        """Indexed submissions at least `threshold` similar to `text`, best first"""
+        hashes = token_hashes(text)
+        return self._verify(hashes, self._candidates(hashes), threshold, exclude)
+
+    def query_id(self, submission_id: Hashable, threshold: float = 0.5) -> List[Tuple[Hashable, float]]:
+        """Near-duplicates of an indexed submission (excluding itself)"""
+        hashes = self._tokens[self._positions[submission_id]]
+        return self._verify(hashes, self._candidates(hashes), threshold, submission_id)
+
+    def _verify(self, hashes, candidates, threshold, exclude) -> List[Tuple[Hashable, float]]:
+        matches = []
+        for position in candidates:
+            submission_id = self._ids[position]
+            if submission_id == exclude:
+                continue
+            similarity = exact_jaccard(hashes, self._tokens[position])
+            if similarity >= threshold:
+                matches.append((submission_id, round(similarity, 4)))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def near_duplicates(self, threshold: float = 0.5) -> List[Tuple[Hashable, Hashable, float]]:
+        """Every verified pair of indexed submissions at or above `threshold`"""
+        seen = set()
+        pairs = []
+        for buckets in self._buckets:
+            for positions in buckets.values():
+                if len(positions) < 2:
+                    continue
+                for i, left in enumerate(positions):
+                    for right in positions[i + 1:]:
+                        if (left, right) in seen:
+                            continue
+                        seen.add((left, right))
+                        similarity = exact_jaccard(self._tokens[left], self._tokens[right])
+                        if similarity >= threshold:
+                            pairs.append((self._ids[left], self._ids[right], round(similarity, 4)))
+        return sorted(pairs, key=lambda pair: -pair[2])
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, submission_id):
+        return submission_id in self._positions
+
+
+__all__ = ['MinHashLSH', 'token_hashes', 'exact_jaccard']
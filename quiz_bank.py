@@ -0,0 +1,182 @@
+"""
+Quiz Bank for EduMentor AI
+Indexed question storage with O(N) sampling for quiz generation
+"""
+
+import bisect
+import json
+import random
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DIFFICULTY = "intermediate"
+
+
+class QuizBank:
+    """Questions indexed by (subject, type, difficulty)
+
+    Each index bucket is a list of question ids. Sampling N distinct
+    questions draws N positions from the matching buckets (random.sample
+    over a range, mapped through cumulative bucket sizes), so it costs
+    O(N) regardless of how large the bank is; only the chosen questions
+    are copied.
+    """
+
+    def __init__(self):
+        self.questions: List[Dict] = []
+        self._buckets: Dict[Tuple[str, str, str], List[int]] = {}
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    def add(self, question: Dict, subject: str = "general", q_type: str = "multiple_choice",
+            difficulty: str = DEFAULT_DIFFICULTY) -> int:
+        """Add one question (question/options/answer/explanation); returns its id"""
+        question_id = len(self.questions)
+        self.questions.append(question)
+        self._buckets.setdefault((subject, q_type, difficulty), []).append(question_id)
+        return question_id
+
+    def extend(self, records: Iterable[Dict]) -> int:
+        """Add records carrying "subject", "type" and "difficulty" next to the question"""
+        added = 0
+        for record in records:
+            record = dict(record)
+            subject = record.pop("subject", "general")
+            q_type = record.pop("type", "multiple_choice")
+            difficulty = record.pop("difficulty", DEFAULT_DIFFICULTY)
+            self.add(record, subject, q_type, difficulty)
+            added += 1
+        return added
+
+    @classmethod
+    def from_templates(cls, templates: Dict[str, Dict[str, List[Dict]]]) -> "QuizBank":
+        """Build a bank from {q_type: {subject: [question, ...]}}"""
+        bank = cls()
+        for q_type, subjects in templates.items():
+            for subject, questions in subjects.items():
+                for question in questions:
+                    bank.add(question, subject, q_type)
+        return bank
+
+    def records(self) -> Iterable[Dict]:
+        """Questions with their index fields, in id order"""
+        keys = {}
+        for key, ids in self._buckets.items():
+            for question_id in ids:
+                keys[question_id] = key
+        for question_id, question in enumerate(self.questions):
+            subject, q_type, difficulty = keys[question_id]
+            yield dict(question, subject=subject, type=q_type, difficulty=difficulty)
+
+    def save(self, path: str):
+        """Write the bank as JSON lines"""
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def load_file(self, path: str) -> int:
+        """Add every record of a JSON-lines file; returns how many were added"""
+        with open(path, "r", encoding="utf-8") as f:
+            return self.extend(json.loads(line) for line in f if line.strip())
+
+    @classmethod
+    def load(cls, path: str) -> "QuizBank":
+        """Load a bank saved with save() (or any JSON-lines file of records)"""
+        bank = cls()
+        bank.load_file(path)
+        return bank
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _matching(self, subject: Optional[str], q_type: Optional[str],
+                  difficulty: Optional[str]) -> List[List[int]]:
+        if subject is not None and q_type is not None and difficulty is not None:
+            bucket = self._buckets.get((subject, q_type, difficulty))
+            return [bucket] if bucket else []
+        return [
+            ids for (s, t, d), ids in self._buckets.items()
+            if (subject is None or s == subject) and (q_type is None or t == q_type)
+            and (difficulty is None or d == difficulty)
+        ]
+
+    def count(self, subject: Optional[str] = None, q_type: Optional[str] = None,
+              difficulty: Optional[str] = None) -> int:
+        """Number of questions matching the filters (None matches anything)"""
+        return sum(len(ids) for ids in self._matching(subject, q_type, difficulty))
+
+    def sample_ids(self, count: int, subject: Optional[str] = None, q_type: Optional[str] = None,
+                   difficulty: Optional[str] = None, rng: Optional[random.Random] = None) -> List[int]:
+        """Up to `count` distinct question ids matching the filters"""
+        buckets = self._matching(subject, q_type, difficulty)
+        if not buckets:
+            return []
+
+        offsets = []
+        total = 0
+        for ids in buckets:
+            offsets.append(total)
+            total += len(ids)
+
+        rng = rng or random
+        positions = rng.sample(range(total), min(count, total))
+        if len(buckets) == 1:
+            ids = buckets[0]
+            return [ids[position] for position in positions]
+
+        sampled = []
+        for position in positions:
+            index = bisect.bisect_right(offsets, position) - 1
+            sampled.append(buckets[index][position - offsets[index]])
+        return sampled
+
+    def sample(self, count: int, subject: Optional[str] = None, q_type: Optional[str] = None,
+               difficulty: Optional[str] = None, rng: Optional[random.Random] = None,
+               topic: Optional[str] = None) -> List[Dict]:
+        """Up to `count` distinct questions (copies, with {topic} filled in)"""
+        questions = []
+        for question_id in self.sample_ids(count, subject, q_type, difficulty, rng):
+            question = dict(self.questions[question_id])
+            if topic is not None:
+                question["question"] = question["question"].replace("{topic}", topic)
+            questions.append(question)
+        return questions
+
+    def generate_quiz(self, topic: str, num_questions: int = 5, q_type: str = "multiple_choice",
+                      subject: str = "general", difficulty: Optional[str] = None,
+                      seed: Any = None) -> Dict:
+        """Quiz in the tools.generate_quiz format, drawn from this bank
+
+        Distinct questions are used while they last; if fewer match than
+        `num_questions`, they are repeated in turn. `seed` makes the draw
+        reproducible.
+        """
+        rng = random.Random(seed) if seed is not None else None
+        questions = self.sample(num_questions, subject, q_type, difficulty, rng, topic)
+        if questions and len(questions) < num_questions:
+            questions = [dict(questions[i % len(questions)]) for i in range(num_questions)]
+
+        return {
+            "topic": topic,
+            "type": q_type,
+            "total_questions": num_questions,
+            "questions": questions,
+            "generated_at": datetime.now().isoformat()
+        }
+
+    def generate_class_quizzes(self, student_ids: Iterable[str], topic: str, num_questions: int = 5,
+                               q_type: str = "multiple_choice", subject: str = "general",
+                               difficulty: Optional[str] = None, seed: Any = 0) -> Dict[str, Dict]:
+        """One quiz per student; each student's draw is reproducible from (seed, student_id)"""
+        return {
+            student_id: self.generate_quiz(topic, num_questions, q_type, subject, difficulty,
+                                           seed=f"{seed}:{student_id}")
+            for student_id in student_ids
+        }
+
+    def __len__(self):
+        return len(self.questions)
+
+
+__all__ = ['QuizBank', 'DEFAULT_DIFFICULTY']
@@ -0,0 +1,257 @@
+"""
+Retrieval for EduMentor AI
+Local course-material retrieval with a compact, quantized vector index
+"""
+
+import json
+import os
+import pickle
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+CORPUS_EXTENSIONS = (".txt", ".md")
+
+
+def chunk_text(text: str, chunk_words: int = 120, overlap: int = 20) -> List[str]:
+    """Split text into overlapping windows of words"""
+    words = text.split()
+    if not words:
+        return []
+
+    step = max(1, chunk_words - overlap)
+    return [" ".join(words[start:start + chunk_words])
+            for start in range(0, max(1, len(words) - overlap), step)]
+
+
+def load_corpus(path: str, chunk_words: int = 120, overlap: int = 20) -> List[Dict]:
+    """Chunk every text/markdown file under `path` (a file or directory)"""
+    if os.path.isfile(path):
+        files = [path]
+    else:
+        files = sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(path)
+            for name in names if name.lower().endswith(CORPUS_EXTENSIONS)
+        )
+
+    chunks = []
+    for filename in files:
+        with open(filename, "r", encoding="utf-8", errors="ignore") as f:
+            for chunk in chunk_text(f.read(), chunk_words, overlap):
+                chunks.append({"text": chunk, "source": filename})
+    return chunks
+
+
+class TfidfEmbedder:
+    """CPU-only embeddings: TF-IDF followed by truncated SVD (LSA)"""
+
+    def __init__(self, dimensions: int = 128):
+        self.dimensions = dimensions
+        self.vectorizer = None
+        self.svd = None
+
+    def fit(self, texts: List[str]) -> "TfidfEmbedder":
+        """Learn the vocabulary and projection from the corpus"""
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, stop_words="english")
+        matrix = self.vectorizer.fit_transform(texts)
+
+        # SVD needs fewer components than features/documents
+        components = min(self.dimensions, matrix.shape[0] - 1, matrix.shape[1] - 1)
+        if components >= 1:
+            self.svd = TruncatedSVD(n_components=components, random_state=0).fit(matrix)
+        return self
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Unit-length float32 embeddings for a batch of texts"""
+        matrix = self.vectorizer.transform(texts)
+        vectors = self.svd.transform(matrix) if self.svd is not None else matrix.toarray()
+        return _normalize(vectors.astype(np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization; returns (codes, scales)"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class VectorIndex:
+    """Inner-product index over int8-quantized unit vectors
+
+    With `partitions` > 1 the rows are clustered (IVF) and stored grouped
+    by partition, so a query only scores the `nprobe` nearest partitions.
+    Otherwise every row is scored, block by block.
+    """
+
+    BLOCK_ROWS = 65536
+
+    def __init__(self, codes: np.ndarray, scales: np.ndarray, ids: np.ndarray,
+                 centroids: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None):
+        self.codes = codes
+        self.scales = scales
+        self.ids = ids
+        self.centroids = centroids
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, vectors: Iterable[np.ndarray], partitions: int = 0,
+              train_size: int = 65536, iterations: int = 10, seed: int = 0) -> "VectorIndex":
+        """Quantize vectors (an array or an iterable of row blocks) and index them"""
+        blocks = [vectors] if isinstance(vectors, np.ndarray) else vectors
+        codes, scales = zip(*(quantize_int8(_normalize(np.asarray(b, dtype=np.float32))) for b in blocks))
+        codes, scales = np.concatenate(codes), np.concatenate(scales)
+        ids = np.arange(len(codes), dtype=np.int64)
+
+        if partitions <= 1 or len(codes) < partitions * 4:
+            return cls(codes, scales, ids)
+
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(len(codes), size=min(train_size, len(codes)), replace=False)
+        centroids = _kmeans(cls._decode(codes[sample], scales[sample]), partitions, iterations, rng)
+
+        assignments = np.concatenate([
+            cls._nearest(cls._decode(codes[start:start + cls.BLOCK_ROWS], scales[start:start + cls.BLOCK_ROWS]), centroids)
+            for start in range(0, len(codes), cls.BLOCK_ROWS)
+        ])
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.searchsorted(assignments[order], np.arange(partitions + 1))
+        return cls(codes[order], scales[order], ids[order], centroids, offsets)
+
+    @staticmethod
+    def _decode(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        return codes.astype(np.float32) * scales[:, None]
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ centroids.T, axis=1)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def search(self, query: np.ndarray, k: int = 5, nprobe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (ids, scores) by inner product for one unit query vector"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+
+        if self.centroids is None:
+            ranges = [(start, min(start + self.BLOCK_ROWS, len(self.codes)))
+                      for start in range(0, len(self.codes), self.BLOCK_ROWS)]
+        else:
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            ranges = [(self.offsets[p], self.offsets[p + 1]) for p in probes]
+
+        all_ids, all_scores = [], []
+        for start, end in ranges:
+            if end <= start:
+                continue
+            scores = (self.codes[start:end] @ query) * self.scales[start:end]
+            top = _top_k(scores, k)
+            all_ids.append(self.ids[start:end][top])
+            all_scores.append(scores[top])
+
+        if not all_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        ids, scores = np.concatenate(all_ids), np.concatenate(all_scores)
+        top = _top_k(scores, k)
+        return ids[top], scores[top]
+
+    def save(self, path: str):
+        """Save the index arrays to an .npz file"""
+        arrays = {"codes": self.codes, "scales": self.scales, "ids": self.ids}
+        if self.centroids is not None:
+            arrays.update(centroids=self.centroids, offsets=self.offsets)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """Load an index saved with save()"""
+        with np.load(path) as data:
+            return cls(
+                data["codes"], data["scales"], data["ids"],
+                data["centroids"] if "centroids" in data else None,
+                data["offsets"] if "offsets" in data else None
+            )
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first"""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _kmeans(vectors: np.ndarray, clusters: int, iterations: int, rng) -> np.ndarray:
+    """Spherical k-means (Lloyd iterations on unit vectors)"""
+    centroids = vectors[rng.choice(len(vectors), size=clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = VectorIndex._nearest(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        empty = ~sums.any(axis=1)
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class Retriever:
+    """Chunked course material + embedder + vector index"""
+
+    def __init__(self, chunks: List[Dict], embedder: TfidfEmbedder, index: VectorIndex):
+        self.chunks = chunks
+        self.embedder = embedder
+        self.index = index
+
+    @classmethod
+    def from_corpus(cls, path: str, dimensions: int = 128, partitions: int = 0,
+                    chunk_words: int = 120, overlap: int = 20) -> "Retriever":
+        """Chunk, embed and index a local corpus"""
+        chunks = load_corpus(path, chunk_words, overlap)
+        texts = [chunk["text"] for chunk in chunks]
+        embedder = TfidfEmbedder(dimensions).fit(texts)
+        return cls(chunks, embedder, VectorIndex.build(embedder.embed(texts), partitions))
+
+    def retrieve(self, query: str, k: int = 3, min_score: float = 0.0) -> List[Dict]:
+        """Top-k passages for a query, best first"""
+        if not self.chunks or not query.strip():
+            return []
+
+        ids, scores = self.index.search(self.embedder.embed([query])[0], k)
+        return [
+            dict(self.chunks[i], score=round(float(score), 4))
+            for i, score in zip(ids, scores) if score >= min_score
+        ]
+
+    def save(self, directory: str):
+        """Persist chunks, embedder and index to a directory"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "chunks.json"), "w") as f:
+            json.dump(self.chunks, f)
+        with open(os.path.join(directory, "embedder.pkl"), "wb") as f:
+            pickle.dump(self.embedder, f)
+        self.index.save(os.path.join(directory, "index.npz"))
+
+    @classmethod
+    def load(cls, directory: str) -> "Retriever":
+        """Load a retriever saved with save()"""
+        with open(os.path.join(directory, "chunks.json"), "r") as f:
+            chunks = json.load(f)
+        with open(os.path.join(directory, "embedder.pkl"), "rb") as f:
+            embedder = pickle.load(f)
+        return cls(chunks, embedder, VectorIndex.load(os.path.join(directory, "index.npz")))
+
+
+__all__ = ['chunk_text', 'load_corpus', 'TfidfEmbedder', 'quantize_int8',
+           'VectorIndex', 'Retriever']
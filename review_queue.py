@@ -0,0 +1,219 @@
+"""
+Review Queue for EduMentor AI
+SM-2 spaced-repetition scheduling with a per-student due-time index
+"""
+
+import heapq
+import math
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+DAY_SECONDS = 86400.0
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+
+def sm2(ease: float, interval: float, repetitions: int, quality: int) -> Tuple[float, float, int]:
+    """One SM-2 step: (ease, interval in days, repetitions) after a review graded 0-5"""
+    if quality < 3:
+        repetitions = 0
+        interval = 1.0
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1.0
+        elif repetitions == 2:
+            interval = 6.0
+        else:
+            interval = round(interval * ease)
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ease, interval, repetitions
+
+
+class ReviewQueue:
+    """Review cards for many students, ordered by due time
+
+    Card state lives in flat typed arrays (8 bytes for the due time, 4 each
+    for ease and interval, 2 for the repetition count), indexed by a card
+    number. Each student has a min-heap of (due, card) entries; a review
+    pushes a fresh entry and leaves the old one in place, to be skipped
+    when it surfaces (lazy deletion), so an update is O(log n) and
+    "next K due" is O(K log n). Students' cards are loaded from the
+    MemoryBank on first access and written back by flush().
+    """
+
+    MEMORY_TYPE = "review_cards"
+
+    def __init__(self, memory_bank=None):
+        self.memory_bank = memory_bank
+        self._due = array("d")
+        self._ease = array("f")
+        self._interval = array("f")
+        self._repetitions = array("H")
+        self._items: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._cards: Dict[str, Dict[str, int]] = {}  # student -> item -> card
+        self._heaps: Dict[str, List[Tuple[float, int]]] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _student(self, student_id: str) -> Dict[str, int]:
+        cards = self._cards.get(student_id)
+        if cards is None:
+            cards = self._cards[student_id] = {}
+            self._heaps[student_id] = []
+            if self.memory_bank is not None:
+                saved = self.memory_bank.get_student_memories(student_id, self.MEMORY_TYPE)
+                for item_id, ease, interval, repetitions, due in (saved[-1]["content"] if saved else []):
+                    self._new_card(student_id, item_id, due, ease, interval, repetitions)
+        return cards
+
+    def _new_card(self, student_id: str, item_id: str, due: float, ease: float = DEFAULT_EASE,
+                  interval: float = 0.0, repetitions: int = 0) -> int:
+        if self._free:
+            card = self._free.pop()
+            self._due[card], self._ease[card], self._interval[card] = due, ease, interval
+            self._repetitions[card] = repetitions
+            self._items[card] = item_id
+        else:
+            card = len(self._items)
+            self._due.append(due)
+            self._ease.append(ease)
+            self._interval.append(interval)
+            self._repetitions.append(repetitions)
+            self._items.append(item_id)
+        self._cards[student_id][item_id] = card
+        heapq.heappush(self._heaps[student_id], (due, card))
+        return card
+
+    def _compact(self, student_id: str):
+        """Rebuild a heap that has collected more stale entries than live ones"""
+        heap = self._heaps[student_id]
+        cards = self._cards[student_id]
+        if len(heap) > 2 * len(cards) + 16:
+            due = self._due
+            heap[:] = [(due[card], card) for card in cards.values()]
+            heapq.heapify(heap)
+
+    # ------------------------------------------------------------------
+    # Cards
+    # ------------------------------------------------------------------
+    def add(self, student_id: str, item_id: str, due: Optional[float] = None) -> bool:
+        """Start reviewing an item (due now by default); False if already present"""
+        with self._lock:
+            cards = self._student(student_id)
+            if item_id in cards:
+                return False
+            self._new_card(student_id, item_id, time.time() if due is None else due)
+            self._dirty.add(student_id)
+            return True
+
+    def review(self, student_id: str, item_id: str, quality: int, now: Optional[float] = None) -> float:
+        """Record a review graded 0 (blackout) to 5 (perfect); returns the next due time"""
+        if not 0 <= quality <= 5:
+            raise ValueError(f"Review quality must be between 0 and 5, got {quality}")
+        now = time.time() if now is None else now
+
+        with self._lock:
+            cards = self._student(student_id)
+            card = cards.get(item_id)
+            if card is None:
+                card = self._new_card(student_id, item_id, now)
+
+            ease, interval, repetitions = sm2(self._ease[card], self._interval[card],
+                                              self._repetitions[card], quality)
+            due = now + interval * DAY_SECONDS
+            self._ease[card], self._interval[card] = ease, interval
+            self._repetitions[card] = min(repetitions, 65535)
+            self._due[card] = due
+            heapq.heappush(self._heaps[student_id], (due, card))
+            self._dirty.add(student_id)
+            self._compact(student_id)
+            return due
+
+    def remove(self, student_id: str, item_id: str) -> bool:
+        """Stop reviewing an item; False if it was not present"""
+        with self._lock:
+            card = self._student(student_id).pop(item_id, None)
+            if card is None:
+                return False
+            self._due[card] = math.inf  # Any heap entries for it are now stale
+            self._items[card] = None
+            self._free.append(card)
+            self._dirty.add(student_id)
+            self._compact(student_id)
+            return True
+
+    def card(self, student_id: str, item_id: str) -> Optional[Dict]:
+        """Scheduling state of one item, or None"""
+        with self._lock:
+            card = self._student(student_id).get(item_id)
+            if card is None:
+                return None
+            return {
+                "item_id": item_id,
+                "ease": round(self._ease[card], 3),
+                "interval_days": self._interval[card],
+                "repetitions": self._repetitions[card],
+                "due": self._due[card]
+            }
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def next_due(self, student_id: str, k: int = 10, now: Optional[float] = None) -> List[str]:
+        """Up to k items due by `now`, most overdue first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            cards = self._student(student_id)
+            heap = self._heaps[student_id]
+            due = self._due
+            items = self._items
+            selected: List[Tuple[float, int]] = []
+            while heap and len(selected) < k and heap[0][0] <= now:
+                entry = heapq.heappop(heap)
+                card = entry[1]
+                # Stale if the card was rescheduled, removed or reused since
+                if due[card] == entry[0] and cards.get(items[card]) == card and entry not in selected:
+                    selected.append(entry)
+            for entry in selected:  # Still due until reviewed
+                heapq.heappush(heap, entry)
+            return [items[card] for _, card in selected]
+
+    def due_count(self, student_id: str, now: Optional[float] = None) -> int:
+        """Number of items due by `now` (a linear count)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = self._due
+            return sum(1 for card in self._student(student_id).values() if due[card] <= now)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def flush(self):
+        """Write changed students' cards back to the memory bank (one save)"""
+        with self._lock:
+            if self.memory_bank is None or not self._dirty:
+                self._dirty.clear()
+                return
+            for student_id in self._dirty:
+                self.memory_bank.set_memory(student_id, self.MEMORY_TYPE, [
+                    [item_id, round(self._ease[card], 4), self._interval[card], self._repetitions[card], self._due[card]]
+                    for item_id, card in self._cards[student_id].items()
+                ], save=False)
+            self.memory_bank.save_memories()
+            self._dirty.clear()
+
+    def __len__(self):
+        return len(self._items) - len(self._free)
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._cards
+
+
+__all__ = ['ReviewQueue', 'sm2', 'DAY_SECONDS']
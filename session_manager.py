@@ -3,20 +3,152 @@ Session and Memory Management for EduMentor AI
 Implements course concepts: Sessions & Memory, State Management
 """
 
+from collections import deque
 from datetime import datetime, timedelta
 import json
 import pickle
+import threading
 from typing import Dict, List, Any, Optional
 
+from subject_classifier import get_subject_classifier
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+class ConversationMemory:
+    """Bounded conversation history with a rolling summary of older turns
+    
+    Recent turns live in a fixed-size ring buffer. Turns that fall out of
+    it are compressed into short summary fragments, and the summary itself
+    is capped at `summary_tokens`, so memory stays flat however long the
+    conversation runs. A lock guards the turns, as a late model answer may
+    be written back from another thread.
+    """
+    
+    def __init__(self, max_turns: int = 20, summary_tokens: int = 200, words_per_fragment: int = 12):
+        self.turns: deque = deque(maxlen=max_turns)
+        self.summary_tokens = summary_tokens
+        self.words_per_fragment = words_per_fragment
+        self.summary_fragments: deque = deque()
+        self.summary_size = 0
+        self.total_turns = 0
+        self._lock = threading.RLock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def append(self, message: Dict):
+        """Record a {"role": ..., "content": ...} turn"""
+        with self._lock:
+            if len(self.turns) == self.turns.maxlen:
+                self._summarize(self.turns[0])
+            self.turns.append(message)
+            self.total_turns += 1
+    
+    def _summarize(self, message: Dict):
+        """Fold an evicted turn into the rolling summary"""
+        words = message["content"].split()
+        fragment = " ".join(words[:self.words_per_fragment])
+        if len(words) > self.words_per_fragment:
+            fragment += "..."
+        fragment = f"{message['role']}: {fragment}"
+        
+        self.summary_fragments.append(fragment)
+        self.summary_size += estimate_tokens(fragment)
+        while self.summary_size > self.summary_tokens and len(self.summary_fragments) > 1:
+            self.summary_size -= estimate_tokens(self.summary_fragments.popleft())
+    
+    @property
+    def summary(self) -> str:
+        """Compressed summary of turns no longer held verbatim"""
+        return " | ".join(self.summary_fragments)
+    
+    def build_context(self, token_budget: int = 1000) -> str:
+        """Summary plus the most recent turns that fit in `token_budget` tokens"""
+        lines = []
+        remaining = token_budget
+        
+        with self._lock:
+            summary = self.summary
+            turns = list(self.turns)
+        if summary and estimate_tokens(summary) < remaining:
+            remaining -= estimate_tokens(summary)
+        else:
+            summary = ""
+        
+        for message in reversed(turns):
+            line = f"{message['role'].upper()}: {message['content']}"
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                break
+            lines.append(line)
+            remaining -= cost
+        
+        lines.reverse()
+        if summary:
+            lines.insert(0, f"EARLIER IN THIS CONVERSATION: {summary}")
+        return "\n".join(lines)
+    
+    def replace(self, message: Dict, replacement: Dict) -> bool:
+        """Swap a turn still held verbatim for another; False if it has been summarized"""
+        with self._lock:
+            for i, turn in enumerate(self.turns):
+                if turn is message:
+                    self.turns[i] = replacement
+                    return True
+        return False
+    
+    def fork(self) -> "ConversationMemory":
+        """Independent copy, e.g. for a speculative request whose turns may be discarded"""
+        clone = ConversationMemory(self.turns.maxlen, self.summary_tokens, self.words_per_fragment)
+        with self._lock:
+            clone.turns.extend(self.turns)
+            clone.summary_fragments.extend(self.summary_fragments)
+            clone.summary_size = self.summary_size
+            clone.total_turns = self.total_turns
+        return clone
+    
+    def clear(self):
+        """Forget everything"""
+        with self._lock:
+            self.turns.clear()
+            self.summary_fragments.clear()
+            self.summary_size = 0
+            self.total_turns = 0
+    
+    def __len__(self):
+        return len(self.turns)
+    
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self.turns))
+
+
 class Session:
-    """Individual student session with memory"""
+    """Individual student session with memory
+    
+    Only the last `max_interactions` interactions are kept verbatim;
+    `interaction_count` counts them all (the analytics store, when set,
+    keeps the full record).
+    """
+    
+    max_interactions = 200
     
     def __init__(self, student_id: str, session_id: str = None):
         self.student_id = student_id
         self.session_id = session_id or f"session_{student_id}_{datetime.now().timestamp()}"
         self.created_at = datetime.now()
         self.last_activity = datetime.now()
-        self.interactions: List[Dict] = []
+        self.interactions: deque = deque(maxlen=self.max_interactions)
+        self.interaction_count = 0
         self.learning_preferences = {}
         self.progress_tracking = {
             "subjects_studied": set(),
@@ -26,37 +158,76 @@ class Session:
             "strong_areas": []
         }
         self.context_memory = {
-            "recent_topics": [],
+            "recent_topics": deque(maxlen=10),
             "learning_style": None,
             "difficulty_level": "intermediate"
         }
+        self.conversation = ConversationMemory()
+        self.analytics = None  # Optional analytics_store.InteractionStore, set by SessionManager
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["analytics"] = None  # The store is shared and on disk; never pickle it
+        return state
+    
+    def __setstate__(self, state):
+        # Sessions pickled by older versions lack these or hold unbounded lists
+        state.setdefault("analytics", None)
+        state.setdefault("conversation", ConversationMemory())
+        interactions = state.get("interactions", [])
+        state.setdefault("interaction_count", len(interactions))
+        state["interactions"] = deque(interactions, maxlen=self.max_interactions)
+        context = state.get("context_memory", {})
+        context["recent_topics"] = deque(context.get("recent_topics", []), maxlen=10)
+        self.__dict__.update(state)
     
-    def add_interaction(self, query: str, response: str, metadata: Dict = None):
-        """Record a student-agent interaction"""
+    def add_interaction(self, query: str, response: str, metadata: Dict = None) -> Dict:
+        """Record a student-agent interaction, and return its record
+        
+        `metadata` may carry "subject", "latency" (seconds) and "score",
+        which are also appended to the analytics store when there is one.
+        """
+        metadata = metadata or {}
         interaction = {
             "timestamp": datetime.now().isoformat(),
             "query": query,
             "response": response[:500],  # Limit response length
             "response_time": (datetime.now() - self.last_activity).total_seconds(),
-            "metadata": metadata or {}
+            "metadata": metadata
         }
         
         self.interactions.append(interaction)
+        self.interaction_count += 1
         self.last_activity = datetime.now()
         
         # Update progress tracking
         self.progress_tracking["questions_asked"] += 1
         
-        # Extract subject from query if possible
-        subjects = ["math", "science", "history", "programming", "literature"]
-        for subject in subjects:
-            if subject in query.lower():
-                self.progress_tracking["subjects_studied"].add(subject)
-                self.context_memory["recent_topics"].append(subject)
-                break
+        # Tag the query with its subjects (the deque keeps only the last 10)
+        subjects = get_subject_classifier().classify(query)
+        self.progress_tracking["subjects_studied"].update(subjects)
+        self.context_memory["recent_topics"].extend(subjects)
         
-        # Keep only last 10 topics
-        self.context_memory["recent_topics"] = self.context_memory["recent_topics"][-10:]
+        if self.analytics is not None:
+            self.analytics.append(
+                self.student_id,
+                metadata.get("subject", subjects[0] if subjects else None),
+                latency=metadata.get("latency"),  # Not response_time: that is the student's think time
+                score=metadata.get("score")
+            )
+        return interaction
+    
+    def record_final(self, interaction: Dict, response: str, metadata: Dict = None):
+        """Attach a later, better answer to an interaction already recorded
+        
+        Stored under the interaction's "final" key; counters and analytics
+        are left alone, as it is still one exchange.
+        """
+        interaction["final"] = {
+            "timestamp": datetime.now().isoformat(),
+            "response": response[:500],
+            "metadata": metadata or {}
+        }
     
     def update_learning_style(self, style: str):
         """Update student's preferred learning style"""
@@ -72,11 +243,11 @@ class Session:
             "session_id": self.session_id,
             "student_id": self.student_id,
             "duration_minutes": (datetime.now() - self.created_at).total_seconds() / 60,
-            "total_interactions": len(self.interactions),
+            "total_interactions": self.interaction_count,
             "active_subjects": list(self.progress_tracking["subjects_studied"]),
             "learning_style": self.context_memory["learning_style"],
             "difficulty_level": self.context_memory["difficulty_level"],
-            "recent_topics": self.context_memory["recent_topics"][-5:],
+            "recent_topics": list(self.context_memory["recent_topics"])[-5:],
             "session_age_minutes": (datetime.now() - self.last_activity).total_seconds() / 60
         }
     
@@ -99,16 +270,21 @@ class Session:
 class SessionManager:
     """Manages multiple student sessions with memory persistence"""
     
-    def __init__(self, persistence_file: str = "sessions.json"):
+    def __init__(self, persistence_file: str = "sessions.json", analytics_dir: Optional[str] = None):
         self.sessions: Dict[str, Session] = {}
         self.persistence_file = persistence_file
+        self.analytics = None
+        if analytics_dir is not None:
+            from analytics_store import InteractionStore
+            self.analytics = InteractionStore(analytics_dir)
         self.load_sessions()
     
     def create_session(self, student_id: str) -> Session:
         """Create new session for student"""
         session = Session(student_id)
+        session.analytics = self.analytics
         self.sessions[session.session_id] = session
-        self.save_sessions()
+        self.save_sessions(flush_analytics=False)  # A partition per new session would be tiny
         return session
     
     def get_session(self, session_id: str) -> Optional[Session]:
@@ -119,14 +295,16 @@ class SessionManager:
         """Get all sessions for a student"""
         return [s for s in self.sessions.values() if s.student_id == student_id]
     
-    def end_session(self, session_id: str):
-        """End a session and save data"""
+    def end_session(self, session_id: str, evict: bool = False):
+        """End a session and save data; with `evict`, also drop it from memory"""
         if session_id in self.sessions:
             session = self.sessions[session_id]
             print(f"Session {session_id} ended for student {session.student_id}")
             print(f"Summary: {session.get_session_summary()}")
             # In production, would save to database
             self.save_sessions()
+            if evict:
+                del self.sessions[session_id]
     
     def cleanup_inactive(self, timeout_minutes: int = 30):
         """Clean up inactive sessions"""
@@ -136,24 +314,29 @@ class SessionManager:
                 inactive.append(session_id)
         
         for session_id in inactive:
-            self.end_session(session_id)
-            del self.sessions[session_id]
+            self.end_session(session_id, evict=True)
     
-    def save_sessions(self):
-        """Save all sessions to disk (simplified)"""
+    def save_sessions(self, flush_analytics: bool = True):
+        """Save all sessions to disk (simplified), flushing buffered analytics rows"""
+        if flush_analytics and self.analytics is not None:
+            self.analytics.flush()
         # In production, use database
         sessions_data = {}
         for session_id, session in self.sessions.items():
             sessions_data[session_id] = {
                 "student_id": session.student_id,
                 "created_at": session.created_at.isoformat(),
-                "interactions_count": len(session.interactions),
+                "interactions_count": session.interaction_count,
                 "summary": session.get_session_summary()
             }
         
         with open(self.persistence_file, 'w') as f:
             json.dump(sessions_data, f, indent=2)
     
+    def close(self):
+        """Save sessions and flush analytics (e.g. at shutdown)"""
+        self.save_sessions()
+    
     def load_sessions(self):
         """Load sessions from disk (simplified)"""
         try:
@@ -169,7 +352,7 @@ class SessionManager:
     def get_system_metrics(self) -> Dict:
         """Get metrics for observability"""
         active_sessions = sum(1 for s in self.sessions.values() if s.is_active())
-        total_interactions = sum(len(s.interactions) for s in self.sessions.values())
+        total_interactions = sum(s.interaction_count for s in self.sessions.values())
         
         return {
             "total_sessions": len(self.sessions),
@@ -203,6 +386,16 @@ class MemoryBank:
         
         self.save_memories()
     
+    def set_memory(self, student_id: str, memory_type: str, content: Any, save: bool = True):
+        """Replace a memory type with a single entry (for snapshots such as profiles)"""
+        self.memories.setdefault(student_id, {})[memory_type] = [{
+            "timestamp": datetime.now().isoformat(),
+            "content": content
+        }]
+        
+        if save:
+            self.save_memories()
+    
     def get_student_memories(self, student_id: str, memory_type: str = None) -> List:
         """Get memories for student"""
         if student_id not in self.memories:
@@ -244,4 +437,4 @@ class MemoryBank:
 
 
 # Export for use in main system
-__all__ = ['Session', 'SessionManager', 'MemoryBank']
+__all__ = ['ConversationMemory', 'Session', 'SessionManager', 'MemoryBank']
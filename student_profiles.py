@@ -0,0 +1,167 @@
+"""
+Student Profiles for EduMentor AI
+Bounded profile cache with incremental performance statistics
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+# Session.context_memory["difficulty_level"] values, easiest first
+DIFFICULTY_LEVELS = ("beginner", "intermediate", "advanced")
+
+
+class StudentProfile:
+    """Exponentially weighted performance statistics for one student
+
+    Every update is O(1) no matter how long the history is: the mean and
+    variance are exponentially weighted, so recent work counts most.
+    Difficulty moves one level at a time, with a gap between the step-up
+    and step-down thresholds so it does not flap around a boundary.
+    """
+
+    __slots__ = ("student_id", "mean", "variance", "count", "last_score", "level", "dirty")
+
+    def __init__(self, student_id: str, mean: float = 0.0, variance: float = 0.0, count: int = 0,
+                 last_score: Optional[float] = None, level: int = 1):
+        self.student_id = student_id
+        self.mean = mean
+        self.variance = variance
+        self.count = count
+        self.last_score = last_score
+        self.level = level
+        self.dirty = False
+
+    def update(self, score: float, alpha: float = 0.2):
+        """Fold one score (0-100) into the running statistics"""
+        if self.count == 0:
+            self.mean, self.variance = float(score), 0.0
+        else:
+            delta = score - self.mean
+            self.mean += alpha * delta
+            self.variance = (1 - alpha) * (self.variance + alpha * delta * delta)
+        self.count += 1
+        self.last_score = float(score)
+        self.dirty = True
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def adjust_level(self, step_up: float = 85.0, step_down: float = 70.0, min_count: int = 3) -> str:
+        """Move the difficulty level by at most one step and return it"""
+        if self.count >= min_count:
+            if self.mean >= step_up and self.level < len(DIFFICULTY_LEVELS) - 1:
+                self.level += 1
+                self.dirty = True
+            elif self.mean < step_down and self.level > 0:
+                self.level -= 1
+                self.dirty = True
+        return DIFFICULTY_LEVELS[self.level]
+
+    @property
+    def difficulty(self) -> str:
+        return DIFFICULTY_LEVELS[self.level]
+
+    def to_dict(self) -> Dict:
+        return {
+            "mean": round(self.mean, 4),
+            "variance": round(self.variance, 4),
+            "count": self.count,
+            "last_score": self.last_score,
+            "difficulty": self.difficulty
+        }
+
+    @classmethod
+    def from_dict(cls, student_id: str, data: Dict) -> "StudentProfile":
+        level = data.get("difficulty", "intermediate")
+        return cls(
+            student_id,
+            mean=data.get("mean", 0.0),
+            variance=data.get("variance", 0.0),
+            count=data.get("count", 0),
+            last_score=data.get("last_score"),
+            level=DIFFICULTY_LEVELS.index(level) if level in DIFFICULTY_LEVELS else 1
+        )
+
+
+class ProfileCache:
+    """LRU cache of StudentProfile objects backed by a MemoryBank
+
+    Profiles are loaded on first access (from the newest "profile" memory,
+    or by folding the student's stored "score" memories once) and written
+    back as a single "profile" memory when evicted or on flush(). Evictions
+    only update the bank in memory; flush() saves it to disk once.
+    """
+
+    MEMORY_TYPE = "profile"
+    SCORE_MEMORY_TYPE = "score"
+
+    def __init__(self, memory_bank=None, capacity: int = 1024, alpha: float = 0.2):
+        self.memory_bank = memory_bank
+        self.capacity = capacity
+        self.alpha = alpha
+        self._profiles: "OrderedDict[str, StudentProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = False
+
+    def get(self, student_id: str) -> StudentProfile:
+        """Profile for a student, loading it on a cache miss"""
+        with self._lock:
+            profile = self._profiles.get(student_id)
+            if profile is not None:
+                self._profiles.move_to_end(student_id)
+                return profile
+
+            profile = self._load(student_id)
+            self._profiles[student_id] = profile
+            if len(self._profiles) > self.capacity:
+                _, evicted = self._profiles.popitem(last=False)
+                self._unsaved |= self._store(evicted)
+            return profile
+
+    def _load(self, student_id: str) -> StudentProfile:
+        if self.memory_bank is None:
+            return StudentProfile(student_id)
+
+        saved = self.memory_bank.get_student_memories(student_id, self.MEMORY_TYPE)
+        if saved:
+            return StudentProfile.from_dict(student_id, saved[-1]["content"])
+
+        # No snapshot yet: replay the score history once
+        profile = StudentProfile(student_id)
+        for memory in self.memory_bank.get_student_memories(student_id, self.SCORE_MEMORY_TYPE):
+            content = memory["content"]
+            score = content.get("score") if isinstance(content, dict) else content
+            if isinstance(score, (int, float)):
+                profile.update(score, self.alpha)
+                profile.adjust_level()
+        return profile
+
+    def _store(self, profile: StudentProfile) -> bool:
+        if self.memory_bank is None or not profile.dirty:
+            return False
+        self.memory_bank.set_memory(profile.student_id, self.MEMORY_TYPE, profile.to_dict(), save=False)
+        profile.dirty = False
+        return True
+
+    def flush(self):
+        """Write every changed profile back to the memory bank (one save)"""
+        with self._lock:
+            stored = [self._store(profile) for profile in self._profiles.values()]
+            if self._unsaved or any(stored):
+                self.memory_bank.save_memories()
+                self._unsaved = False
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._profiles
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._profiles))
+
+
+__all__ = ['StudentProfile', 'ProfileCache', 'DIFFICULTY_LEVELS']
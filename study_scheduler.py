@@ -0,0 +1,242 @@
+"""
+Study Scheduler for EduMentor AI
+Spaced-repetition study plans that fill the available hours exactly
+"""
+
+import heapq
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+LEARN_ACTIVITIES = ("Study new material", "Practice problems", "Self-assessment")
+REVIEW_ACTIVITIES = ("Review previous concepts", "Practice recall through self-testing")
+
+
+def progress_areas(source: Any) -> Tuple[List[str], List[str]]:
+    """(weak_areas, strong_areas) from a Session, its progress_tracking dict, or None"""
+    progress = getattr(source, "progress_tracking", source) or {}
+    return list(progress.get("weak_areas", [])), list(progress.get("strong_areas", []))
+
+
+class StudyScheduler:
+    """Lays out study sessions over a fixed number of days
+
+    The available time is cut into blocks of `block_hours` (each day's
+    last block is shorter when `hours_per_day` is not a multiple). Blocks are
+    shared out in proportion to each topic's weight (weak areas weigh
+    more, strong areas less), so every hour is used and none is lost to
+    rounding. Each topic is then introduced once and revisited at
+    expanding spaced-repetition intervals; a priority queue ordered by
+    due day places each session on the first day at or after it that
+    still has room, so a schedule costs O(blocks log topics).
+    """
+
+    REVIEW_INTERVALS = (1, 3, 7, 14, 30, 60)
+
+    def __init__(self, days: int = 7, hours_per_day: float = 2, block_hours: float = 0.5,
+                 weak_weight: float = 2.0, strong_weight: float = 0.5,
+                 review_intervals: Optional[Sequence[int]] = None,
+                 start_date: Optional[date] = None):
+        if days < 0 or hours_per_day < 0 or block_hours <= 0:
+            raise ValueError("days and hours_per_day must be non-negative and block_hours positive")
+        blocks_per_day = math.ceil(hours_per_day / block_hours - 1e-9)
+
+        self.days = days
+        self.hours_per_day = hours_per_day
+        self.block_hours = block_hours
+        self.blocks_per_day = blocks_per_day
+        self.last_block_hours = hours_per_day - (blocks_per_day - 1) * block_hours if blocks_per_day else 0.0
+        self.weak_weight = weak_weight
+        self.strong_weight = strong_weight
+        self.review_intervals = tuple(review_intervals or self.REVIEW_INTERVALS)
+        start_date = start_date or datetime.now().date()
+        self.dates = [(start_date + timedelta(days=offset)).isoformat() for offset in range(days)]
+
+    @property
+    def total_blocks(self) -> int:
+        return self.days * self.blocks_per_day
+
+    def block_length(self, position: int) -> float:
+        """Hours of the block at `position` within a day"""
+        return self.last_block_hours if position == self.blocks_per_day - 1 else self.block_hours
+
+    # ------------------------------------------------------------------
+    # Allocation
+    # ------------------------------------------------------------------
+    def topic_weights(self, topics: Sequence[str], weak_areas: Iterable[str] = (),
+                      strong_areas: Iterable[str] = (),
+                      weights: Optional[Mapping[str, float]] = None) -> List[float]:
+        """Weight per topic; an area matches any topic whose name contains it"""
+        weak = [str(area).lower() for area in weak_areas]
+        strong = [str(area).lower() for area in strong_areas]
+        result = []
+        for topic in topics:
+            name = topic.lower()
+            weight = float(weights.get(topic, 1.0)) if weights else 1.0
+            if any(area in name for area in weak):
+                weight *= self.weak_weight
+            elif any(area in name for area in strong):
+                weight *= self.strong_weight
+            result.append(max(weight, 1e-6))
+        return result
+
+    @staticmethod
+    def allocate(weights: Sequence[float], total_blocks: int) -> List[int]:
+        """Blocks per topic, proportional to weight and summing to total_blocks
+
+        Every topic gets one block if there are enough (otherwise the
+        heaviest topics do); the rest is split by largest remainder.
+        """
+        count = len(weights)
+        blocks = [0] * count
+        if not count or total_blocks <= 0:
+            return blocks
+
+        by_weight = sorted(range(count), key=lambda i: -weights[i])
+        if total_blocks <= count:
+            for i in by_weight[:total_blocks]:
+                blocks[i] = 1
+            return blocks
+
+        spare = total_blocks - count
+        total_weight = sum(weights)
+        shares = [spare * weight / total_weight for weight in weights]
+        for i, share in enumerate(shares):
+            blocks[i] = 1 + int(share)
+        leftover = total_blocks - sum(blocks)
+        for i in heapq.nlargest(leftover, range(count), key=lambda i: (shares[i] - int(shares[i]), weights[i])):
+            blocks[i] += 1
+        return blocks
+
+    # ------------------------------------------------------------------
+    # Placement
+    # ------------------------------------------------------------------
+    def place(self, blocks: Sequence[int], weights: Sequence[float]) -> List[List[int]]:
+        """Topic index of every block, for each day
+
+        Topics are introduced heaviest first, spread over the first half of
+        the period; each placed session queues the next one an expanding
+        interval later, compressed when the topic's remaining sessions
+        would not otherwise fit before the end.
+        """
+        days = self.days
+        day_sessions: List[List[int]] = [[] for _ in range(days)]
+        scheduled = [i for i in sorted(range(len(blocks)), key=lambda i: -weights[i]) if blocks[i]]
+        if not days or not scheduled:
+            return day_sessions
+
+        free = [self.blocks_per_day] * days
+        next_free = list(range(days + 1))  # Union-find over full days (days = none left)
+        prev_free = list(range(days + 1))  # Same, searching backwards (shifted by one; 0 = none)
+
+        def find(parent, day):
+            root = day
+            while parent[root] != root:
+                root = parent[root]
+            while parent[day] != root:
+                parent[day], day = root, parent[day]
+            return root
+
+        remaining = list(blocks)
+        intro_days = (days + 1) // 2
+        queue = [(rank * intro_days // len(scheduled), rank, topic, 0) for rank, topic in enumerate(scheduled)]
+        heapq.heapify(queue)
+        intervals = self.review_intervals
+
+        while queue:
+            due, rank, topic, repetition = heapq.heappop(queue)
+            day = find(next_free, due)
+            if day == days:
+                day = find(prev_free, due + 1) - 1  # Nothing left at or after due: latest earlier day
+                if day < 0:
+                    break
+            day_sessions[day].append(topic)
+            free[day] -= 1
+            if not free[day]:
+                next_free[day] = day + 1
+                prev_free[day + 1] = day
+
+            remaining[topic] -= 1
+            if remaining[topic]:
+                days_left = days - 1 - day
+                gap = min(intervals[min(repetition, len(intervals) - 1)], days_left // remaining[topic])
+                heapq.heappush(queue, (min(day + gap, days - 1), rank, topic, repetition + 1))
+        return day_sessions
+
+    # ------------------------------------------------------------------
+    # Schedules
+    # ------------------------------------------------------------------
+    def schedule(self, topics: Sequence[str], weak_areas: Iterable[str] = (),
+                 strong_areas: Iterable[str] = (),
+                 weights: Optional[Mapping[str, float]] = None) -> Dict:
+        """Study schedule in the tools.create_study_schedule format"""
+        topics = list(dict.fromkeys(topics))
+        topic_weights = self.topic_weights(topics, weak_areas, strong_areas, weights)
+        blocks = self.allocate(topic_weights, self.total_blocks)
+        day_sessions = self.place(blocks, topic_weights)
+        topic_hours = [0.0] * len(topics)
+
+        # A topic's first day is its "learn" session, whichever queue entry landed there
+        seen = [0] * len(topics)
+        schedule = {}
+        for day, entries in enumerate(day_sessions):
+            if not entries:
+                continue
+            sessions: Dict[int, Dict] = {}
+            for position, topic_index in enumerate(entries):
+                hours = self.block_length(position)
+                topic_hours[topic_index] += hours
+                session = sessions.get(topic_index)
+                if session is not None:
+                    session["duration_hours"] = round(session["duration_hours"] + hours, 6)
+                    continue
+                topic = topics[topic_index]
+                repetition = seen[topic_index]
+                seen[topic_index] += 1
+                learn = repetition == 0
+                sessions[topic_index] = {
+                    "topic": topic,
+                    "type": "learn" if learn else "review",
+                    "repetition": repetition,
+                    "duration_hours": round(hours, 6),
+                    "activities": list(LEARN_ACTIVITIES if learn else REVIEW_ACTIVITIES),
+                    "goals": [
+                        f"Understand key concepts of {topic}" if learn else f"Recall key concepts of {topic} from memory",
+                        "Complete practice exercises" if learn else "Identify areas needing review"
+                    ]
+                }
+            schedule[f"Day {day + 1}"] = {
+                "date": self.dates[day],
+                "duration_hours": round(sum(self.block_length(position) for position in range(len(entries))), 6),
+                "topics": [session["topic"] for session in sessions.values()],
+                "sessions": list(sessions.values())
+            }
+
+        covered = [topic for topic, count in zip(topics, blocks) if count]
+        return {
+            "total_days": self.days,
+            "total_hours": self.days * self.hours_per_day,
+            "hours_per_day": self.hours_per_day,
+            "topics_covered": covered,
+            "unscheduled_topics": [topic for topic, count in zip(topics, blocks) if not count],
+            "topic_hours": {topic: round(hours, 6) for topic, hours, count in zip(topics, topic_hours, blocks) if count},
+            "schedule": schedule,
+            "recommendations": [
+                "Take regular breaks (5-10 minutes per hour)",
+                "Do review sessions from memory before rereading notes",
+                "Practice recall through self-testing"
+            ]
+        }
+
+    def schedule_for(self, topics: Sequence[str], progress: Any = None,
+                     weights: Optional[Mapping[str, float]] = None) -> Dict:
+        """Schedule weighted by a Session's (or progress_tracking dict's) weak and strong areas"""
+        weak_areas, strong_areas = progress_areas(progress)
+        return self.schedule(topics, weak_areas, strong_areas, weights)
+
+    def schedule_cohort(self, topics: Sequence[str], students: Mapping[str, Any]) -> Dict[str, Dict]:
+        """One schedule per student from {student_id: Session or progress_tracking dict}"""
+        return {student_id: self.schedule_for(topics, progress) for student_id, progress in students.items()}
+
+
+__all__ = ['StudyScheduler', 'progress_areas', 'LEARN_ACTIVITIES', 'REVIEW_ACTIVITIES']
@@ -0,0 +1,139 @@
+"""
+Subject Classification for EduMentor AI
+Multi-label subject tagging from a compiled keyword taxonomy, with a TF-IDF fallback
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from keyword_matcher import KeywordMatcher
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# The subjects Session and the root agent have always tracked; each matches its own name
+DEFAULT_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    "math": ("math",),
+    "science": ("science",),
+    "history": ("history",),
+    "programming": ("programming",),
+    "literature": ("literature",)
+}
+
+
+class SubjectClassifier:
+    """Tags text with every subject whose keywords it contains
+
+    All keywords of the taxonomy are compiled into one KeywordMatcher, so
+    a small taxonomy costs a handful of C-level scans and a large one a
+    single Aho-Corasick pass, whatever the number of subjects. Labels come
+    back in taxonomy order (the first is the primary subject). If no
+    keyword matches and a TF-IDF model was fitted, the subjects whose
+    example centroids are most similar to the text are returned instead.
+    """
+
+    def __init__(self, taxonomy: Optional[Mapping[str, Iterable[str]]] = None,
+                 word_boundary: bool = False, stem: bool = False):
+        taxonomy = DEFAULT_TAXONOMY if taxonomy is None else taxonomy
+        self.subjects: List[str] = list(taxonomy)
+        keywords = []
+        self._keyword_subject: List[int] = []
+        for index, subject in enumerate(self.subjects):
+            for keyword in taxonomy[subject]:
+                keywords.append(keyword)
+                self._keyword_subject.append(index)
+        self.matcher = KeywordMatcher(keywords, word_boundary=word_boundary, stem=stem)
+
+        self._idf: Dict[str, float] = {}
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}  # token -> [(subject, weight)]
+        self.min_similarity = 0.1
+
+    # ------------------------------------------------------------------
+    # TF-IDF fallback
+    # ------------------------------------------------------------------
+    def fit_tfidf(self, examples: Mapping[str, Iterable[str]], min_similarity: float = 0.1):
+        """Fit the fallback model from {subject: [example text, ...]}
+
+        Each subject becomes one L2-normalized TF-IDF centroid, stored as an
+        inverted index so scoring touches only the text's own tokens.
+        """
+        documents = {}
+        for subject, texts in examples.items():
+            if subject not in self.subjects:
+                raise KeyError(f"Unknown subject: {subject}")
+            documents[self.subjects.index(subject)] = Counter(
+                token for text in texts for token in _TOKEN_PATTERN.findall(text.lower()))
+
+        document_frequency = Counter(token for counts in documents.values() for token in counts)
+        total = len(documents)
+        self._idf = {token: math.log((1 + total) / (1 + df)) + 1 for token, df in document_frequency.items()}
+
+        self._postings = {}
+        for subject, counts in documents.items():
+            weights = {token: count * self._idf[token] for token, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for token, weight in weights.items():
+                self._postings.setdefault(token, []).append((subject, weight / norm))
+        self.min_similarity = min_similarity
+        return self
+
+    def similarities(self, text: str) -> Dict[str, float]:
+        """Cosine similarity of the text to each fitted subject centroid (non-zero only)"""
+        counts = Counter(token for token in _TOKEN_PATTERN.findall(text.lower()) if token in self._idf)
+        if not counts:
+            return {}
+        weights = {token: count * self._idf[token] for token, count in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+
+        scores: Dict[int, float] = {}
+        for token, weight in weights.items():
+            for subject, centroid_weight in self._postings[token]:
+                scores[subject] = scores.get(subject, 0.0) + weight * centroid_weight
+        return {self.subjects[subject]: score / norm for subject, score in scores.items()}
+
+    # ------------------------------------------------------------------
+    # Classification
+    # ------------------------------------------------------------------
+    def classify(self, text: str, top_k: Optional[int] = None) -> List[str]:
+        """Subjects of the text, primary first (empty if none apply)"""
+        keyword_subject = self._keyword_subject
+        labels = sorted({keyword_subject[index] for index in self.matcher.find(text)})
+        if labels:
+            names = [self.subjects[index] for index in labels]
+            return names[:top_k] if top_k else names
+
+        if not self._postings:
+            return []
+        ranked = sorted(((score, subject) for subject, score in self.similarities(text).items()
+                         if score >= self.min_similarity), reverse=True)
+        names = [subject for _, subject in ranked]
+        return names[:top_k] if top_k else names
+
+    def primary(self, text: str) -> Optional[str]:
+        """Most relevant subject, or None"""
+        labels = self.classify(text, top_k=1)
+        return labels[0] if labels else None
+
+    def __len__(self):
+        return len(self.subjects)
+
+
+_default_classifier: Optional[SubjectClassifier] = None
+
+
+def get_subject_classifier() -> SubjectClassifier:
+    """Shared classifier used by Session and the root agent (built on first use)"""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = SubjectClassifier()
+    return _default_classifier
+
+
+def set_subject_classifier(classifier: SubjectClassifier):
+    """Replace the shared classifier (e.g. with a larger taxonomy)"""
+    global _default_classifier
+    _default_classifier = classifier
+
+
+__all__ = ['SubjectClassifier', 'DEFAULT_TAXONOMY', 'get_subject_classifier', 'set_subject_classifier']
@@ -0,0 +1,132 @@
+"""
+Template Engine for EduMentor AI
+Templates parsed once into compiled renderers, with memoized rendering
+"""
+
+import functools
+import re
+import string
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+_FORMATTER = string.Formatter()
+_SIMPLE_SPEC = re.compile(r"[\w<>=^+\- #.,%]*")
+_FIELD_ROOT = re.compile(r"[^.\[]*")
+
+
+class CompiledTemplate:
+    """A str.format template parsed once and compiled into an f-string function
+
+    Literal text and plain `{name}` / `{name!r:>8}` fields become a single
+    f-string expression; fields with attribute or index access or nested
+    specs go through string.Formatter. Output always equals
+    `source.format(**values)`, and a missing field raises KeyError.
+    """
+
+    __slots__ = ("source", "fields", "render")
+
+    def __init__(self, source: str):
+        self.source = source
+        namespace: Dict[str, Any] = {}
+        pieces = []
+        fields = []
+
+        for literal, field, format_spec, conversion in _FORMATTER.parse(source):
+            if literal:
+                name = f"_L{len(namespace)}"
+                namespace[name] = literal
+                pieces.append("{%s}" % name)
+            if field is None:
+                continue
+            if not field or field.isdigit():
+                raise ValueError(f"Positional fields are not supported: {source[:40]!r}...")
+            if conversion not in (None, "r", "s", "a"):
+                raise ValueError(f"Unknown conversion !{conversion} for field {field!r} in {source[:40]!r}...")
+
+            if field.isidentifier() and _SIMPLE_SPEC.fullmatch(format_spec):
+                pieces.append("{v[%r]%s%s}" % (
+                    field, f"!{conversion}" if conversion else "", f":{format_spec}" if format_spec else ""))
+            else:
+                name = f"_F{len(namespace)}"
+                namespace[name] = self._formatter_field(field, format_spec, conversion)
+                pieces.append("{%s(v)}" % name)
+            fields.append(_FIELD_ROOT.match(field).group())
+            fields.extend(_FIELD_ROOT.match(nested).group()
+                          for _, nested, _, _ in _FORMATTER.parse(format_spec) if nested)
+
+        code = 'def render(v):\n    return f"%s"' % "".join(pieces)
+        try:
+            compiled = compile(code, "<template>", "exec")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid template {source[:40]!r}...: {e.msg}") from None
+        exec(compiled, namespace)
+        self.render = namespace["render"]
+        self.fields = tuple(dict.fromkeys(fields))
+
+    @staticmethod
+    def _formatter_field(field: str, format_spec: str, conversion: Optional[str]):
+        def render_field(values):
+            value, _ = _FORMATTER.get_field(field, (), values)
+            value = _FORMATTER.convert_field(value, conversion)
+            return _FORMATTER.format_field(value, _FORMATTER.vformat(format_spec, (), values))
+        return render_field
+
+
+class TemplateRegistry:
+    """Named templates compiled on first use, with a bounded render cache
+
+    `sources` may be an existing dict of template strings; it is kept by
+    reference, so templates added or replaced there are picked up (and
+    recompiled) on their next render. The cache is typed: 1, 1.0 and True
+    are different values (they render differently with !r).
+    """
+
+    def __init__(self, sources: Optional[Dict[str, str]] = None, cache_size: int = 1024):
+        self.sources = sources if sources is not None else {}
+        self.cache_size = cache_size
+        self._compiled: Dict[str, CompiledTemplate] = {}
+        self._render_cached = functools.lru_cache(maxsize=cache_size, typed=True)(self._render)
+
+    def register(self, name: str, source: str):
+        """Add or replace a template"""
+        self.sources[name] = source
+
+    def get(self, name: str) -> CompiledTemplate:
+        """Compiled template for a name (KeyError if unknown)"""
+        source = self.sources[name]
+        compiled = self._compiled.get(name)
+        if compiled is None or compiled.source is not source:
+            compiled = self._compiled[name] = CompiledTemplate(source)
+        return compiled
+
+    def render(self, name: str, **values) -> str:
+        """Render one template; identical inputs are served from the cache"""
+        compiled = self.get(name)
+        try:
+            arguments = tuple([values[field] for field in compiled.fields])
+            hash(arguments)
+        except (KeyError, TypeError):
+            arguments = None
+        if arguments is None:
+            return compiled.render(values)  # Raises for missing fields; unhashable values are not cached
+        return self._render_cached(compiled, *arguments)  # Spread so each value's type is part of the key
+
+    @staticmethod
+    def _render(compiled: CompiledTemplate, *arguments) -> str:
+        return compiled.render(dict(zip(compiled.fields, arguments)))
+
+    def render_many(self, name: str, rows: Iterable[Mapping[str, Any]], **shared) -> List[str]:
+        """Render one template for many value sets (e.g. every topic of a syllabus)"""
+        compiled = self.get(name)
+        return [compiled.render(dict(shared, **row)) for row in rows]
+
+    def clear_cache(self):
+        self._render_cached.cache_clear()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sources
+
+    def __len__(self):
+        return len(self.sources)
+
+
+__all__ = ['CompiledTemplate', 'TemplateRegistry']
@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration for the EduMentor test suite
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: spawns interpreters or threads; deselect with -m 'not slow'")
@@ -0,0 +1,57 @@
+"""
+AgentRouter behaviour when an upstream hangs
+"""
+
+import asyncio
+import threading
+
+from agent_router import AgentRouter
+from agents import EduMentorAgent
+
+
+class _StuckAgent(EduMentorAgent):
+    """Answers only once released"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def assist(self, query, session=None):
+        self.release.wait(5)
+        return "late answer"
+
+
+def _router(stuck, **options):
+    return AgentRouter({"gemini": stuck, "general": EduMentorAgent()},
+                       hedge_after=0.01, timeouts={"gemini": 0.05}, **options)
+
+
+def test_full_pool_falls_back_instead_of_queueing():
+    stuck = _StuckAgent()
+    router = _router(stuck, workers=2, hedge_workers=1)
+    try:
+        results = [router.route("Explain photosynthesis") for _ in range(4)]
+        assert all(result["agent"] == "general" for result in results)
+        assert [result["rejected"] for result in results[2:]] == [["gemini"], ["gemini"]]
+        assert all(result["latency_ms"] < 1000 for result in results)
+        assert router._primary.busy == 2
+    finally:
+        stuck.release.set()
+        router.close()
+
+
+def test_route_async_holds_no_extra_thread():
+    stuck = _StuckAgent()
+    router = _router(stuck)
+    before = threading.active_count()
+    try:
+        async def main():
+            return await asyncio.gather(*(router.route_async("Give me a math example") for _ in range(3)))
+
+        results = asyncio.run(main())
+        assert all(result["agent"] == "general" for result in results)
+        # Only the router's own pools grew: 3 stuck calls and 3 hedges
+        assert threading.active_count() - before <= 6
+    finally:
+        stuck.release.set()
+        router.close()
@@ -0,0 +1,132 @@
+"""
+Partitioned interaction analytics
+"""
+
+import gc
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import analytics_store
+from analytics_store import InteractionStore
+
+ROWS_A = [("s1", "math", 1.0, 80.0), ("s2", "physics", 2.0, 60.0), ("s1", "physics", 3.0, None)]
+ROWS_B = [("s3", "biology", 4.0, 50.0), ("s2", "math", None, 90.0), ("s3", "physics", 5.0, 40.0)]
+
+
+def _append(store, rows, start=0.0):
+    for offset, (student_id, subject, latency, score) in enumerate(rows):
+        store.append(student_id, subject, latency, score, timestamp=start + offset)
+
+
+def _decoded(store):
+    """Rows back as (student_id, subject, latency, score), NaN as None"""
+    def value(x):
+        return None if math.isnan(x) else float(x)
+
+    students = [store.values("student_id")[code] for code in store.column("student_id").tolist()]
+    subjects = [store.values("subject")[code] for code in store.column("subject").tolist()]
+    return sorted(zip(students, subjects, map(value, store.column("latency").tolist()),
+                      map(value, store.column("score").tolist())), key=str)
+
+
+def test_buffered_and_written_rows_are_queried_alike(tmp_path):
+    store = InteractionStore(str(tmp_path), partition_rows=2)
+    _append(store, ROWS_A)
+    assert len(store) == 3
+    assert len([e for e in os.listdir(tmp_path) if e.startswith("part-")]) == 1  # One full partition, one row buffered
+    assert _decoded(store) == sorted(ROWS_A, key=str)
+    assert store.subject_volume() == {"math": 1, "physics": 2}
+    assert store.subject_volume(student_id="s1") == {"math": 1, "physics": 1}
+    assert store.subject_volume(student_id="nobody") == {}
+    assert store.subject_scores() == {"math": {"mean_score": 80.0, "count": 1},
+                                      "physics": {"mean_score": 60.0, "count": 1}}
+    assert store.latency_percentiles((50,)) == {"p50": 2.0}
+    assert store.latency_percentiles((50,), by_subject=True) == {"math": {"p50": 1.0}, "physics": {"p50": 2.5}}
+    assert store.subject_volume(since=1.0) == {"physics": 2}
+
+
+def test_reload_after_flush(tmp_path):
+    store = InteractionStore(str(tmp_path))
+    _append(store, ROWS_A)
+    store.flush()
+    store.flush()  # Nothing buffered: no empty partition
+
+    reloaded = InteractionStore(str(tmp_path))
+    assert len([e for e in os.listdir(tmp_path) if e.startswith("part-")]) == 1
+    assert _decoded(reloaded) == _decoded(store)
+    assert reloaded.values("student_id") == ["s1", "s2"]
+    assert isinstance(reloaded.column("latency"), np.memmap)  # One partition, nothing buffered: no copy
+
+
+def test_reload_remaps_codes_of_partitions_with_other_dictionaries(tmp_path):
+    # Two stores opened on the same empty directory assign codes independently
+    first = InteractionStore(str(tmp_path))
+    second = InteractionStore(str(tmp_path))
+    _append(first, ROWS_A)
+    _append(second, ROWS_B, start=10.0)
+    first.flush()
+    second.flush()
+    assert second.values("student_id") == ["s3", "s2"]  # Code 0 is s1 in `first`'s partition
+
+    reloaded = InteractionStore(str(tmp_path))
+    assert reloaded.values("student_id") == ["s1", "s2", "s3"]
+    assert _decoded(reloaded) == sorted(ROWS_A + ROWS_B, key=str)
+    assert reloaded.subject_volume(student_id="s2") == {"physics": 1, "math": 1}
+    assert reloaded.subject_volume() == {"math": 2, "physics": 3, "biology": 1}
+    assert reloaded.weak_areas(threshold=70.0, min_count=2) == ["physics"]
+
+    # New rows after the reload use the merged dictionaries
+    reloaded.append("s2", "biology", 1.0, 100.0, timestamp=20.0)
+    assert reloaded.subject_volume(student_id="s2") == {"physics": 1, "math": 1, "biology": 1}
+
+
+def test_to_pandas(tmp_path):
+    pd = pytest.importorskip("pandas")
+    store = InteractionStore(str(tmp_path), partition_rows=2)
+    _append(store, ROWS_A)
+    frame = store.to_pandas()
+
+    assert list(frame.columns) == ["timestamp", "student_id", "subject", "latency", "score"]
+    assert isinstance(frame["subject"].dtype, pd.CategoricalDtype)
+    assert frame["student_id"].tolist() == ["s1", "s2", "s1"]
+    assert frame["subject"].tolist() == ["math", "physics", "physics"]
+    assert frame["score"].isna().tolist() == [False, False, True]
+    assert frame["timestamp"].iloc[1] == pd.Timestamp(1.0, unit="s")
+
+
+def test_unreadable_and_staging_partitions_are_skipped(tmp_path, capsys):
+    store = InteractionStore(str(tmp_path))
+    _append(store, ROWS_A)
+    store.flush()
+    os.makedirs(tmp_path / "part-99999999999999999999-broken")
+    os.makedirs(tmp_path / ".part-00000000000000000000-crashed.tmp")
+
+    reloaded = InteractionStore(str(tmp_path))
+    assert len(reloaded) == len(ROWS_A)
+    assert "Skipping unreadable analytics partition part-99999999999999999999-broken" in capsys.readouterr().out
+
+
+def test_stores_registered_for_exit_can_be_collected(tmp_path):
+    store = InteractionStore(str(tmp_path))
+    assert store in analytics_store._open_stores
+    count = len(analytics_store._open_stores)
+    del store
+    gc.collect()
+    assert len(analytics_store._open_stores) == count - 1
+
+
+@pytest.mark.slow
+def test_buffered_rows_are_flushed_at_exit(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "from analytics_store import InteractionStore\n"
+        f"store = InteractionStore({str(tmp_path)!r})\n"
+        "store.append('s1', 'math', 1.0, 90.0, timestamp=0.0)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True, timeout=60)
+    assert _decoded(InteractionStore(str(tmp_path))) == [("s1", "math", 1.0, 90.0)]
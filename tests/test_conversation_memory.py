@@ -0,0 +1,71 @@
+"""
+Bounded conversation memory and session upgrades
+"""
+
+import pickle
+
+from agents import EduMentorAgent
+from session_manager import ConversationMemory, Session
+
+
+def _exchange(memory, count):
+    for i in range(count):
+        memory.append({"role": "user", "content": f"question {i} " + "word " * 30})
+        memory.append({"role": "assistant", "content": f"answer {i} " + "word " * 30})
+
+
+def test_memory_stays_bounded():
+    memory = ConversationMemory(max_turns=10, summary_tokens=50)
+    _exchange(memory, 500)
+    assert len(memory) == 10
+    assert memory.total_turns == 1000
+    assert memory.summary_size <= 50 or len(memory.summary_fragments) == 1
+    context = memory.build_context(200)
+    assert "answer 499" in context and "question 0 " not in context
+
+
+def test_fork_is_independent():
+    memory = ConversationMemory()
+    _exchange(memory, 2)
+    clone = memory.fork()
+    clone.append({"role": "user", "content": "only in the fork"})
+    assert len(clone) == len(memory) + 1
+    assert "only in the fork" not in memory.build_context()
+
+
+def test_clear_resets_the_conversation_count():
+    agent = EduMentorAgent()
+    agent.assist("Explain photosynthesis")
+    agent.assist("What is gravity?")
+    assert agent.get_stats()["conversations"] == 2
+
+    agent.conversation_history.clear()
+    assert agent.get_stats()["conversations"] == 0
+    agent.assist("Explain photosynthesis")
+    assert agent.get_stats()["conversations"] == 1
+
+
+def test_sessions_pickle_and_old_pickles_upgrade():
+    session = Session("student-1")
+    for i in range(Session.max_interactions + 5):
+        session.add_interaction(f"question {i}", "answer")
+    session.conversation.append({"role": "user", "content": "hi"})
+    assert len(session.interactions) == Session.max_interactions
+    assert session.interaction_count == Session.max_interactions + 5
+
+    restored = pickle.loads(pickle.dumps(session))
+    assert restored.interaction_count == session.interaction_count
+    assert list(restored.conversation) == list(session.conversation)
+    restored.conversation.append({"role": "assistant", "content": "hello"})  # The lock came back
+
+    old = pickle.loads(pickle.dumps(session))
+    state = old.__dict__.copy()
+    for key in ("conversation", "interaction_count", "analytics"):
+        del state[key]
+    state["interactions"] = list(state["interactions"])
+    upgraded = Session.__new__(Session)
+    upgraded.__setstate__(state)
+    assert isinstance(upgraded.conversation, ConversationMemory)
+    assert upgraded.interaction_count == Session.max_interactions
+    upgraded.add_interaction("new", "answer")
+    assert len(upgraded.interactions) == Session.max_interactions
@@ -0,0 +1,45 @@
+"""
+Streamed response formatting against the batch formatter
+"""
+
+import random
+
+import pytest
+
+from tools import format_response, format_response_stream
+
+WORDS = "the cell uses light energy to make glucose from water and carbon dioxide".split()
+
+
+def _chunks(text, rng):
+    pieces, start = [], 0
+    while start < len(text):
+        end = start + rng.randint(1, 12)
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+def _texts():
+    rng = random.Random(7)
+    yield ""
+    yield "   \n\t "
+    yield "  Photosynthesis makes glucose.  "
+    for count in (10, 49, 50, 51, 60, 120, 400):
+        words = [rng.choice(WORDS) for _ in range(count)]
+        spaced = "".join(word + rng.choice([" ", "  ", "\n", " \n\n "]) for word in words)
+        yield "  " + spaced
+
+
+@pytest.mark.parametrize("text", list(_texts()))
+@pytest.mark.parametrize("max_length,include_summary", [(500, True), (500, False), (80, True), (2000, True)])
+def test_stream_matches_batch(text, max_length, include_summary):
+    expected = format_response(text, max_length, include_summary)
+    for seed in range(5):
+        chunks = _chunks(text, random.Random(seed))
+        streamed = "".join(format_response_stream(chunks, max_length, include_summary))
+        assert streamed == expected
+
+
+def test_empty_stream_reports_no_response():
+    assert "".join(format_response_stream([])) == format_response("") == "No response generated."
@@ -0,0 +1,93 @@
+"""
+Process-pool grading and the columnar grade table
+"""
+
+import gc
+import math
+import random
+
+import pytest
+
+from agents import AssessmentAgent
+from grading import GradeTable, GradingPool, score_shard, _tokenize_rubrics
+
+RUBRICS = {
+    "biology": {
+        "q1": "plants use light water and carbon dioxide to make glucose",
+        "q2": "mitosis splits one cell into two identical cells",
+    },
+    "physics": {"q1": "force equals mass times acceleration"},
+}
+
+
+def _submissions(count=500, seed=0):
+    rng = random.Random(seed)
+    words = " ".join(answer for questions in RUBRICS.values() for answer in questions.values()).split()
+    rubric_questions = [(r, q) for r, questions in RUBRICS.items() for q in questions] + [("physics", "q9")]
+    rows = []
+    for i in range(count):
+        rubric, question = rng.choice(rubric_questions)
+        rows.append({"student_id": f"student{i % 37}", "rubric": rubric, "question": question,
+                     "response": " ".join(rng.choices(words, k=rng.randint(0, 12)))})
+    return rows
+
+
+def _columns(rows):
+    return ([row["rubric"] for row in rows], [row["question"] for row in rows], [row["response"] for row in rows])
+
+
+@pytest.mark.slow
+def test_process_pool_matches_in_process_grading():
+    rubrics, questions, responses = _columns(_submissions())
+    expected = score_shard(rubrics, questions, responses, _tokenize_rubrics(RUBRICS))
+
+    with GradingPool(RUBRICS, workers=2) as pool:
+        scores = [math.nan] * len(responses)
+        for start, shard in pool.imap_shards(rubrics, questions, responses, shard_size=64):
+            scores[start:start + len(shard)] = shard.tolist()
+    assert pool._executor is None
+
+    for got, want in zip(scores, expected.tolist()):
+        assert (math.isnan(got) and math.isnan(want)) or got == want
+    assert all(math.isnan(s) for s, q in zip(scores, questions) if q == "q9")
+    assert all(60 <= s <= 100 for s in scores if not math.isnan(s))
+
+
+@pytest.mark.slow
+def test_collected_pool_stops_its_workers():
+    pool = GradingPool(RUBRICS, workers=2)
+    rubrics, questions, responses = _columns(_submissions(20))
+    list(pool.imap_shards(rubrics, questions, responses, shard_size=5))
+    executor = pool._executor
+    finalizer = pool._finalizer
+    del pool
+    gc.collect()
+    assert not finalizer.alive
+    assert executor._shutdown_thread
+
+
+def test_assessment_agent_grades_in_order_and_records_results():
+    submissions = _submissions(100)
+    with AssessmentAgent(RUBRICS, workers=1) as agent:
+        results = agent.grade_submissions(submissions, shard_size=16)
+        assert [r["submission_id"] for r in results] == list(range(100))
+        assert all((r["score"] is None) == (s["question"] == "q9") for r, s in zip(results, submissions))
+        assert len(agent.analytics_data) == 100
+        assert list(agent.grade_stream(submissions[:3])) == results[:3]
+
+
+def test_grade_table_round_trip():
+    table = GradeTable()
+    table.append(["a", "b"], ["biology", "biology"], ["q1", "q2"], [80.0, 90.0], graded_at=1.0)
+    table.append(["a", "c"], ["physics", "biology"], [1, "q1"], [float("nan"), 70.0], graded_at=2.0)
+    assert len(table) == 4
+    assert table.column("student_id") == ["a", "b", "a", "c"]
+    assert table.column("question") == ["q1", "q2", 1, "q1"]
+    assert table.mean_score() == {"a": 80.0, "b": 90.0, "c": 70.0}
+    assert table.mean_score("rubric") == {"biology": 80.0}
+    assert table.scores_for("a").tolist()[0] == 80.0
+    assert [row["student_id"] for row in table] == ["a", "b", "a", "c"]
+
+    frame = table.to_pandas()
+    assert list(frame["student_id"]) == ["a", "b", "a", "c"]
+    assert frame["score"].iloc[1] == 90.0
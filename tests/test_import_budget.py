@@ -0,0 +1,21 @@
+"""
+Import-time budgets of the core modules (see benchmarks.IMPORT_BUDGETS_MS)
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.slow
+def test_core_modules_import_within_budget(tmp_path):
+    # Run from elsewhere: the benchmark must find the modules by itself
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "benchmarks.py"), "imports", "--check", "--repeats", "3"],
+        cwd=tmp_path, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
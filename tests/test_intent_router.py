@@ -0,0 +1,68 @@
+"""
+Aho-Corasick matching and intent routing
+"""
+
+import random
+
+import pytest
+
+from intent_router import AhoCorasick, IntentRouter
+
+
+def _naive(patterns, text):
+    """(end_index, pattern) of every occurrence, by plain substring search"""
+    found = set()
+    for pattern in set(patterns):
+        start = text.find(pattern)
+        while start != -1:
+            found.add((start + len(pattern) - 1, pattern))
+            start = text.find(pattern, start + 1)
+    return found
+
+
+@pytest.mark.parametrize("patterns,text", [
+    (["he", "she", "his", "hers"], "ushers and she sells his hershey"),
+    (["a", "aa", "aaa"], "aaaaa"),
+    (["abcd", "bc", "c", "bcd"], "xabcdabc"),
+    (["overlap", "lap", "lapse", "overlapse"], "overlapse overlap lap"),
+])
+def test_overlapping_patterns_match_a_naive_scan(patterns, text):
+    automaton = AhoCorasick(patterns)
+    matches = {(end, automaton.patterns[pattern_id]) for end, pattern_id in automaton.iter_matches(text)}
+    assert matches == _naive(patterns, text)
+    assert {automaton.patterns[i] for i in automaton.find_all(text)} == {p for _, p in _naive(patterns, text)}
+
+
+def test_random_patterns_match_a_naive_scan():
+    rng = random.Random(3)
+    for _ in range(50):
+        patterns = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 12))]
+        automaton = AhoCorasick(patterns)
+        for _ in range(5):
+            # Characters outside the pattern alphabet must reset the scan
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 60)))
+            matches = {(end, automaton.patterns[i]) for end, i in automaton.iter_matches(text)}
+            assert matches == _naive(patterns, text)
+
+
+def test_transition_cache_stays_within_the_alphabet():
+    automaton = AhoCorasick(["ab", "bc"])
+    list(automaton.iter_matches("ab xyz bc " * 10 + "".join(map(chr, range(0x400, 0x500)))))
+    assert all(set(transitions) <= {"a", "b", "c"} for transitions in automaton._delta)
+
+
+def test_router_ranks_intents_and_orders_entities():
+    router = IntentRouter()
+    router.add_intent("explain", ["explain"])
+    router.add_intent("define", ["what is"], priority=-1)
+    router.add_entities("concept", {"gravity": "pull", "gravity well": "dip", "cell": "unit"})
+
+    match = router.route("What is gravity? Explain the cell and the gravity well")
+    assert match.intent == "define"
+    assert match.intents == ["define", "explain"]
+    assert [name for name, _ in match.entities["concept"]] == ["gravity", "gravity well", "cell"]
+    assert match.entity("concept") == ("gravity", "pull")
+    assert router.route("hello").intent == "general"
+
+    router.add_entity("concept", "hello", "greeting")  # Registering again recompiles
+    assert router.route("hello").entity("concept") == ("hello", "greeting")
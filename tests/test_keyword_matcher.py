@@ -0,0 +1,154 @@
+"""
+Keyword matching against a rubric
+"""
+
+import random
+import re
+
+import pytest
+
+from keyword_matcher import KeywordMatcher, get_keyword_matcher, stem
+from tools import validate_student_response
+
+RESPONSES = [
+    "Plants use photosynthesis to turn light into chemical energy.",
+    "The plant's chloroplasts absorb LIGHT; oxygen is released as a by-product.",
+    "Photosynthesizing cells store energy in glucose (C6H12O6).",
+    "Cellular respiration releases the energy stored by plants.",
+    "",
+    "   ",
+]
+KEYWORDS = ["photosynthesis", "light", "plant", "energy", "oxygen", "C6H12O6", "by-product",
+            "cell", "chemical energy", "glucose", "respiration", "", "Light", "sun"]
+
+
+def _naive_substring(keywords, response):
+    return [keyword.lower() in response.lower() for keyword in keywords]
+
+
+def _naive_boundary(keywords, response):
+    """Each keyword must have an occurrence that doesn't start or end inside a word"""
+    text = response.lower()
+    word = re.compile(r"\w")
+    found = []
+    for keyword in keywords:
+        pattern = keyword.lower()
+        if not pattern:
+            found.append(True)
+            continue
+        hit = False
+        start = text.find(pattern)
+        while start != -1 and not hit:
+            end = start + len(pattern)
+            left_ok = start == 0 or not (word.match(text[start - 1]) and word.match(pattern[0]))
+            right_ok = end == len(text) or not (word.match(text[end]) and word.match(pattern[-1]))
+            hit = left_ok and right_ok
+            start = text.find(pattern, start + 1)
+        found.append(hit)
+    return found
+
+
+def _naive_stem(keywords, response):
+    """Each keyword's stemmed tokens must appear as a run in the response's stemmed tokens"""
+    def tokens(text):
+        return [stem(token) for token in re.findall(r"\w+", text.lower())]
+
+    words = tokens(response)
+    found = []
+    for keyword in keywords:
+        run = tokens(keyword)
+        found.append(any(words[i:i + len(run)] == run for i in range(len(words) - len(run) + 1)) or not run)
+    return found
+
+
+def _large(keywords, seed=0):
+    """The keywords plus enough random filler to go past SCAN_THRESHOLD"""
+    rng = random.Random(seed)
+    filler = {"".join(rng.choice("bcdfghjklmnpqrstvwxz") for _ in range(rng.randint(5, 9)))
+              for _ in range(KeywordMatcher.SCAN_THRESHOLD * 2)}
+    large = list(keywords) + sorted(filler)
+    rng.shuffle(large)
+    return large
+
+
+MODES = [
+    (dict(), _naive_substring),
+    (dict(word_boundary=True), _naive_boundary),
+    (dict(stem=True), _naive_stem),
+]
+
+
+@pytest.mark.parametrize("options,naive", MODES)
+@pytest.mark.parametrize("size", ["small", "large"])
+def test_matches_a_naive_scan_on_both_sides_of_the_threshold(options, naive, size):
+    keywords = KEYWORDS if size == "small" else _large(KEYWORDS)
+    matcher = KeywordMatcher(keywords, **options)
+    assert (matcher._automaton is None) == (size == "small")
+
+    for response in RESPONSES:
+        expected = naive(keywords, response)
+        assert matcher.matches(response) == expected, response
+        assert matcher.find(response) == [i for i, hit in enumerate(expected) if hit], response
+
+
+@pytest.mark.parametrize("options,naive", MODES)
+def test_small_and_large_rubrics_agree(options, naive):
+    small = KeywordMatcher(KEYWORDS, **options)
+    large = KeywordMatcher(_large(KEYWORDS, seed=1), **options)
+    for response in RESPONSES:
+        assert set(small.validate(response)["found_keywords"]) == \
+            set(large.validate(response)["found_keywords"]) & set(KEYWORDS)
+
+
+def test_word_boundary_and_stem_modes():
+    response = "Plants need sunlight to grow"
+    assert KeywordMatcher(["plant", "sun"]).matches(response) == [True, True]
+    assert KeywordMatcher(["plant", "sun"], word_boundary=True).matches(response) == [False, False]
+    assert KeywordMatcher(["plant", "sun", "growing"], stem=True).matches(response) == [True, False, True]
+
+
+def test_random_rubrics_match_a_naive_scan():
+    rng = random.Random(7)
+    vocabulary = ["cell", "cells", "plant", "plants", "energy", "light", "sunlight", "a", "ab", "b"]
+    for _ in range(30):
+        keywords = [" ".join(rng.sample(vocabulary, rng.randint(1, 2))) for _ in range(rng.randint(1, 30))]
+        response = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 15)))
+        for options, naive in MODES:
+            for rubric in (keywords, _large(keywords, seed=rng.random())):
+                assert KeywordMatcher(rubric, **options).matches(response) == naive(rubric, response)
+
+
+def _validate_reference(response, keywords):
+    """The original per-keyword loop of tools.validate_student_response"""
+    found = [k for k in keywords if k.lower() in response.lower()]
+    missing = [k for k in keywords if k.lower() not in response.lower()]
+    completeness = (len(found) / len(keywords)) * 100 if keywords else 0
+    return {
+        "response_length": len(response),
+        "found_keywords": found,
+        "missing_keywords": missing,
+        "completeness_score": round(completeness, 1),
+        "has_adequate_detail": len(response.split()) >= 20,
+        "suggestions": f"Include concepts like: {', '.join(missing)}" if missing else "Good coverage of key concepts"
+    }
+
+
+@pytest.mark.parametrize("size", ["small", "large"])
+def test_validate_matches_the_original_loop(size):
+    keywords = KEYWORDS if size == "small" else _large(KEYWORDS, seed=2)
+    matcher = KeywordMatcher(keywords)
+    for response in RESPONSES:
+        assert matcher.validate(response) == _validate_reference(response, keywords)
+        assert validate_student_response(response, keywords) == _validate_reference(response, keywords)
+    assert matcher.validate_many(RESPONSES) == [_validate_reference(r, keywords) for r in RESPONSES]
+
+
+def test_empty_rubric():
+    result = KeywordMatcher([]).validate("anything")
+    assert result["completeness_score"] == 0
+    assert result["found_keywords"] == [] and result["missing_keywords"] == []
+
+
+def test_matchers_are_shared_per_rubric():
+    assert get_keyword_matcher(("a", "b")) is get_keyword_matcher(("a", "b"))
+    assert get_keyword_matcher(("a", "b")) is not get_keyword_matcher(("a", "b"), True)
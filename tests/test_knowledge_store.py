@@ -0,0 +1,65 @@
+"""
+Memory-mapped knowledge store
+"""
+
+import json
+
+from knowledge_store import KnowledgeStore, get_knowledge_store
+
+ENTRIES = [
+    ("Photosynthesis", "Plants turn light, water and carbon dioxide into glucose."),
+    ("Newton's laws", "Three laws relating force, mass and motion."),
+    ("Cell division", "Mitosis splits one cell into two identical cells."),
+    ("Café culture", "Social life in French cafés; unicode names round-trip too."),
+]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "kb.ekb")
+    store = KnowledgeStore.build(ENTRIES, path)
+    reopened = KnowledgeStore(path)
+    try:
+        assert len(reopened) == len(ENTRIES)
+        assert [reopened.entry(i) for i in range(len(ENTRIES))] == ENTRIES
+        for name, text in ENTRIES:
+            assert reopened.get(name) == text
+        assert reopened.get("newton s LAWS") == ENTRIES[1][1]
+        assert reopened.get("gravity") is None
+    finally:
+        store.close()
+        reopened.close()
+
+
+def test_build_from_jsonl_matches_build(tmp_path):
+    source = tmp_path / "kb.jsonl"
+    source.write_text("\n".join(json.dumps({"name": n, "text": t}) for n, t in ENTRIES) + "\n\n", encoding="utf-8")
+    store = KnowledgeStore.build_from_jsonl(str(source), str(tmp_path / "kb.ekb"))
+    try:
+        assert [store.entry(i) for i in range(len(store))] == ENTRIES
+    finally:
+        store.close()
+
+
+def test_search_and_find_concept(tmp_path):
+    store = KnowledgeStore.build(ENTRIES, str(tmp_path / "kb.ekb"))
+    try:
+        assert store.search("how does a cell split into two cells")[0][0] == "Cell division"
+        assert store.search("zebra") == []
+        assert store.find_concept("Can you explain Newton's laws to me?") == ("newton s laws", ENTRIES[1][1])
+        assert store.find_concept("nothing here") is None
+    finally:
+        store.close()
+
+
+def test_missing_or_broken_stores_are_not_cached(tmp_path):
+    path = str(tmp_path / "kb.ekb")
+    assert get_knowledge_store(path) is None
+
+    with open(path, "wb") as f:
+        f.write(b"not a store")
+    assert get_knowledge_store(path) is None
+
+    KnowledgeStore.build(ENTRIES, path).close()
+    store = get_knowledge_store(path)
+    assert store is not None and store.get("Photosynthesis") == ENTRIES[0][1]
+    assert get_knowledge_store(path) is store
@@ -0,0 +1,19 @@
+"""
+Gemini health-check cache location
+"""
+
+import os
+
+import model_client
+
+
+def test_health_cache_lives_in_the_user_cache():
+    assert os.path.isabs(model_client.HEALTH_CACHE_FILE)
+    assert os.path.dirname(model_client.HEALTH_CACHE_FILE) == model_client.CACHE_DIR
+    assert model_client.CACHE_DIR.endswith(os.path.join("", "edumentor"))
+
+
+def test_health_cache_creates_its_directory(tmp_path):
+    cache_file = str(tmp_path / "cache" / "edumentor" / "gemini_health.json")
+    model_client._save_health_cache(cache_file, {"key:model": {"ok": True}})
+    assert model_client._load_health_cache(cache_file) == {"key:model": {"ok": True}}
@@ -0,0 +1,75 @@
+"""
+MinHash/LSH near-duplicate detection
+"""
+
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from plagiarism import MinHashLSH, exact_jaccard, token_hashes
+
+
+def _submissions(count=120, seed=0):
+    """Independent essays plus lightly edited copies of some of them"""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(3000)]
+    texts = {f"s{i}": " ".join(rng.sample(vocabulary, 60)) for i in range(count)}
+    for i in range(0, count, 4):
+        words = texts[f"s{i}"].split()
+        for _ in range(rng.randint(1, 8)):
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        texts[f"copy{i}"] = " ".join(words)
+    return texts
+
+
+def _brute_force(texts, threshold):
+    hashes = {key: token_hashes(text) for key, text in texts.items()}
+    keys = list(texts)
+    return {
+        frozenset((left, right))
+        for i, left in enumerate(keys) for right in keys[i + 1:]
+        if exact_jaccard(hashes[left], hashes[right]) >= threshold
+    }
+
+
+def test_exact_jaccard():
+    left, right = token_hashes("a b c d"), token_hashes("c d e f A")
+    assert exact_jaccard(left, right) == pytest.approx(3 / 6)  # Case-insensitive: a, c, d shared
+    assert exact_jaccard(left, token_hashes("")) == 0.0
+
+
+def test_candidate_recall_against_brute_force():
+    texts = _submissions()
+    index = MinHashLSH()
+    for key, text in texts.items():
+        index.add(key, text)
+
+    expected = _brute_force(texts, 0.6)
+    found = {frozenset((left, right)) for left, right, _ in index.near_duplicates(0.6)}
+    assert len(expected) >= 25
+    assert found <= expected  # Every candidate is verified exactly
+    assert len(found) / len(expected) >= 0.95
+
+    for key in ("copy0", "copy40"):
+        assert index.query_id(key, 0.6)[0][0] == "s" + key[4:]
+    assert index.query(texts["s8"], 0.99)[0] == ("s8", 1.0)
+
+
+def test_duplicate_ids_and_empty_texts():
+    index = MinHashLSH()
+    index.add("a", "")
+    assert "a" in index and len(index) == 1
+    assert index.query("") == []
+    with pytest.raises(ValueError):
+        index.add("a", "again")
+
+
+@pytest.mark.parametrize("module", ["grading", "plagiarism"])
+def test_worker_modules_do_not_import_agents(module):
+    code = f"import sys, {module}; print('agents' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,90 @@
+"""
+Quantized vector index and course-material retrieval
+"""
+
+import numpy as np
+import pytest
+
+from retrieval import Retriever, VectorIndex, chunk_text
+
+
+def _vectors(count, dimensions=32, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _exact_top_k(vectors, query, k):
+    return list(np.argsort(-(vectors @ query), kind="stable")[:k])
+
+
+def test_flat_search_matches_exact_top_k():
+    vectors = _vectors(2000)
+    index = VectorIndex.build(vectors)
+    for query in _vectors(20, seed=1):
+        ids, scores = index.search(query, k=10)
+        exact = _exact_top_k(vectors, query, 10)
+        assert len(set(ids) & set(exact)) >= 9  # int8 codes may swap near-ties
+        assert list(scores) == sorted(scores, reverse=True)
+        assert np.allclose(scores, vectors[ids] @ query, atol=0.02)
+
+
+def test_probing_every_partition_matches_flat_search():
+    vectors = _vectors(2000)
+    flat = VectorIndex.build(vectors)
+    partitioned = VectorIndex.build([vectors[:1000], vectors[1000:]], partitions=8)
+    assert sorted(partitioned.ids) == list(range(2000))
+    for query in _vectors(10, seed=2):
+        assert list(partitioned.search(query, k=5, nprobe=8)[0]) == list(flat.search(query, k=5)[0])
+
+
+def test_k_larger_than_the_index():
+    index = VectorIndex.build(_vectors(3))
+    ids, scores = index.search(_vectors(1, seed=3)[0], k=10)
+    assert sorted(ids) == [0, 1, 2] and len(scores) == 3
+
+
+def test_save_and_load(tmp_path):
+    index = VectorIndex.build(_vectors(500), partitions=4)
+    index.save(str(tmp_path / "index.npz"))
+    loaded = VectorIndex.load(str(tmp_path / "index.npz"))
+    query = _vectors(1, seed=4)[0]
+    assert list(loaded.search(query, 5, nprobe=2)[0]) == list(index.search(query, 5, nprobe=2)[0])
+
+
+def test_chunk_text_overlaps():
+    words = [str(i) for i in range(250)]
+    chunks = chunk_text(" ".join(words), chunk_words=100, overlap=20)
+    assert [chunk.split()[0] for chunk in chunks] == ["0", "80", "160"]
+    assert chunks[-1].split()[-1] == "249"
+    assert chunk_text("   ") == []
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    topics = {
+        "biology.md": "Photosynthesis happens in chloroplasts. Plants use sunlight, water and carbon dioxide "
+                      "to make glucose and release oxygen.",
+        "physics.txt": "Gravity is the force that attracts masses. Newton described gravity with an "
+                       "inverse square law relating mass and distance.",
+        "history.md": "The French Revolution began in 1789 with the storming of the Bastille and ended "
+                      "the monarchy in France.",
+        "notes.pdf": "Ignored: not a text or markdown file about photosynthesis."
+    }
+    for name, text in topics.items():
+        (tmp_path / name).write_text(text)
+    return tmp_path
+
+
+def test_retriever_top_k(corpus, tmp_path):
+    retriever = Retriever.from_corpus(str(corpus), dimensions=16)
+    assert len(retriever.chunks) == 3
+
+    results = retriever.retrieve("how do plants make glucose from sunlight", k=2)
+    assert len(results) == 2
+    assert results[0]["source"].endswith("biology.md")
+    assert results[0]["score"] >= results[1]["score"]
+    assert retriever.retrieve("   ") == []
+
+    retriever.save(str(tmp_path / "saved"))
+    loaded = Retriever.load(str(tmp_path / "saved"))
+    assert loaded.retrieve("newton gravity", k=1)[0]["source"].endswith("physics.txt")
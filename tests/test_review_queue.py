@@ -0,0 +1,126 @@
+"""
+SM-2 scheduling and review queue ordering
+"""
+
+import random
+
+import pytest
+
+from review_queue import DAY_SECONDS, ReviewQueue, sm2
+from session_manager import MemoryBank
+
+NOW = 1_000_000.0
+
+
+def _naive_next_due(queue, student_id, items, k, now):
+    """Items due by `now` sorted by (due, insertion order), from card() state"""
+    cards = [queue.card(student_id, item) for item in items]
+    due = [(card["due"], index, card["item_id"]) for index, card in enumerate(cards)
+           if card is not None and card["due"] <= now]
+    return [item for _, _, item in sorted(due)][:k]
+
+
+def test_sm2_intervals_and_ease():
+    ease, interval, reps = sm2(2.5, 0.0, 0, 5)
+    assert (interval, reps) == (1.0, 1) and ease == pytest.approx(2.6)
+    ease, interval, reps = sm2(ease, interval, reps, 4)
+    assert (interval, reps) == (6.0, 2) and ease == pytest.approx(2.6)
+    ease, interval, reps = sm2(ease, interval, reps, 3)
+    assert (interval, reps) == (round(6.0 * 2.6), 3) and ease == pytest.approx(2.46)
+    # A failed review starts the item over but keeps lowering the ease
+    ease, interval, reps = sm2(ease, interval, reps, 1)
+    assert (interval, reps) == (1.0, 0) and ease == pytest.approx(1.92)
+    assert sm2(1.3, 1.0, 0, 0)[0] == 1.3
+
+
+def test_most_overdue_first():
+    queue = ReviewQueue()
+    for offset, item in [(-10, "b"), (-30, "a"), (-20, "c"), (50, "later")]:
+        queue.add("s1", item, due=NOW + offset)
+    assert queue.next_due("s1", now=NOW) == ["a", "c", "b"]
+    assert queue.next_due("s1", k=2, now=NOW) == ["a", "c"]
+    assert queue.next_due("s1", now=NOW + 50) == ["a", "c", "b", "later"]
+    assert queue.due_count("s1", now=NOW) == 3
+    # Asking does not consume anything
+    assert queue.next_due("s1", now=NOW) == ["a", "c", "b"]
+
+
+def test_review_reschedules_an_item():
+    queue = ReviewQueue()
+    queue.add("s1", "a", due=NOW - 30)
+    queue.add("s1", "b", due=NOW - 20)
+    due = queue.review("s1", "a", 5, now=NOW)
+    assert due == NOW + DAY_SECONDS
+    assert queue.next_due("s1", now=NOW) == ["b"]
+    assert queue.next_due("s1", now=NOW + DAY_SECONDS) == ["b", "a"]
+
+    queue.review("s1", "a", 4, now=NOW + DAY_SECONDS)
+    card = queue.card("s1", "a")
+    assert (card["interval_days"], card["repetitions"]) == (6.0, 2)
+    assert card["due"] == NOW + 7 * DAY_SECONDS
+
+    with pytest.raises(ValueError):
+        queue.review("s1", "a", 6)
+
+
+def test_remove_and_reuse_of_cards():
+    queue = ReviewQueue()
+    queue.add("s1", "a", due=NOW - 10)
+    queue.add("s1", "b", due=NOW - 5)
+    assert queue.remove("s1", "a") and not queue.remove("s1", "a")
+    # The freed card goes to another student; s1's stale heap entry must not surface
+    queue.add("s2", "x", due=NOW - 100)
+    assert queue.next_due("s1", now=NOW) == ["b"]
+    assert queue.next_due("s2", now=NOW) == ["x"]
+    assert len(queue) == 2
+    assert not queue.add("s1", "b")
+
+
+def test_students_are_independent():
+    queue = ReviewQueue()
+    queue.add("s1", "a", due=NOW - 1)
+    queue.add("s2", "a", due=NOW + 1)
+    queue.review("s2", "a", 5, now=NOW)
+    assert queue.next_due("s1", now=NOW) == ["a"]
+    assert queue.next_due("s2", now=NOW) == []
+
+
+def test_random_reviews_match_a_sorted_scan():
+    rng = random.Random(11)
+    queue = ReviewQueue()
+    items = [f"item{i}" for i in range(60)]
+    for item in items:
+        queue.add("s1", item, due=NOW + rng.uniform(-5, 5) * DAY_SECONDS)
+
+    now = NOW
+    for _ in range(400):
+        action = rng.random()
+        item = rng.choice(items)
+        if action < 0.6:
+            queue.review("s1", item, rng.randint(0, 5), now=now)
+        elif action < 0.7:
+            queue.remove("s1", item)
+        else:
+            queue.add("s1", item, due=now + rng.uniform(-2, 2) * DAY_SECONDS)
+        now += rng.uniform(0, 0.5) * DAY_SECONDS
+        k = rng.randint(1, 20)
+        expected = _naive_next_due(queue, "s1", items, k, now)
+        got = queue.next_due("s1", k=k, now=now)
+        # Ties in due time may come out in either order
+        assert [queue.card("s1", i)["due"] for i in got] == [queue.card("s1", i)["due"] for i in expected]
+        assert set(got) <= {i for i in items if queue.card("s1", i) and queue.card("s1", i)["due"] <= now}
+        assert queue.due_count("s1", now=now) == len(_naive_next_due(queue, "s1", items, len(items), now))
+
+
+def test_flush_and_reload(tmp_path):
+    bank = MemoryBank(str(tmp_path / "memory.json"))
+    queue = ReviewQueue(bank)
+    queue.add("s1", "a", due=NOW - 10)
+    queue.add("s1", "b", due=NOW - 20)
+    queue.review("s1", "a", 5, now=NOW)
+    queue.flush()
+
+    reloaded = ReviewQueue(MemoryBank(str(tmp_path / "memory.json")))
+    assert reloaded.next_due("s1", now=NOW) == ["b"]
+    assert reloaded.card("s1", "a") == queue.card("s1", "a")
+    assert "s1" in reloaded and "s2" not in reloaded
@@ -0,0 +1,28 @@
+"""
+Ending and evicting sessions
+"""
+
+from datetime import datetime, timedelta
+
+from session_manager import SessionManager
+
+
+def test_end_session_evicts_only_when_asked(tmp_path):
+    manager = SessionManager(str(tmp_path / "sessions.json"))
+    kept = manager.create_session("kept")
+    dropped = manager.create_session("dropped")
+
+    manager.end_session(kept.session_id)
+    manager.end_session(dropped.session_id, evict=True)
+    assert manager.get_session(kept.session_id) is kept
+    assert manager.get_session(dropped.session_id) is None
+
+
+def test_cleanup_inactive_evicts_idle_sessions(tmp_path):
+    manager = SessionManager(str(tmp_path / "sessions.json"))
+    idle = manager.create_session("idle")
+    active = manager.create_session("active")
+    idle.last_activity = datetime.now() - timedelta(hours=1)
+
+    manager.cleanup_inactive(timeout_minutes=30)
+    assert list(manager.sessions) == [active.session_id]
@@ -0,0 +1,146 @@
+"""
+Late model answers of GeminiAgent.assist_speculative
+"""
+
+import threading
+import time
+
+import pytest
+
+import model_client
+from agents import GeminiAgent
+from session_manager import SessionManager
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _GatedModel:
+    """Fake Gemini model that answers only once released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def generate_content(self, prompt):
+        self.release.wait(5)
+        return _Response("model answer")
+
+
+@pytest.fixture
+def gated(tmp_path):
+    model = _GatedModel()
+    model_client.registry.set_factory(lambda api_key, model_name, config: model)
+    agent = GeminiAgent(api_key="test-key")
+    agent.gemini_available = True
+    session = SessionManager(str(tmp_path / "sessions.json")).create_session("student")
+    try:
+        yield agent, model, session
+    finally:
+        model.release.set()
+        model_client.registry.set_factory(model_client._gemini_factory)
+
+
+def _eventually(condition, timeout=5.0):
+    stop = time.monotonic() + timeout
+    while not condition() and time.monotonic() < stop:
+        time.sleep(0.01)
+    return condition()
+
+
+def _assistant_turns(session):
+    return [turn["content"] for turn in session.conversation if turn["role"] == "assistant"]
+
+
+def test_late_answer_updates_the_same_interaction(gated):
+    agent, model, session = gated
+    answer = agent.assist_speculative("Explain photosynthesis", session, deadline=0.01)
+    assert answer.speculative
+    model.release.set()
+    answer.final.result(5)
+
+    assert session.interaction_count == 1
+    interaction = session.interactions[-1]
+    assert interaction["response"] == answer.text
+    assert interaction["final"]["response"] == "model answer"
+    # Not handed to anyone yet: the conversation still holds what the student saw
+    assert _assistant_turns(session) == [answer.text]
+
+    assert answer.result() == "model answer"
+    assert _assistant_turns(session) == ["model answer"]
+
+
+def test_on_final_delivers_and_its_errors_are_reported(gated, capsys):
+    agent, model, session = gated
+    received = []
+    agent.assist_speculative("Explain gravity", session, deadline=0.01, on_final=received.append)
+
+    def broken(text):
+        raise ValueError("display closed")
+
+    failed = agent.assist_speculative("Explain fractions", session, deadline=0.01, on_final=broken)
+    model.release.set()
+
+    output = []
+    assert _eventually(lambda: output.append(capsys.readouterr().out) or "display closed" in "".join(output))
+    assert _eventually(lambda: received == ["model answer"])
+    assert _eventually(lambda: session.conversation.turns[1]["content"] == "model answer")
+    assert session.conversation.turns[3]["content"] == failed.text
+
+
+def test_full_pool_answers_without_queueing_a_call(gated, monkeypatch):
+    import agents
+    from bounded_pool import BoundedPool
+
+    agent, model, session = gated
+    pool = BoundedPool(1, "test-speculative")
+    monkeypatch.setattr(agents, "_speculation_pool", pool)
+    try:
+        stuck = agent.assist_speculative("Explain gravity", session, deadline=0.01)
+        refused = agent.assist_speculative("Explain fractions", session, deadline=0.01)
+        assert stuck.speculative and refused.speculative
+        assert refused.final.done() and refused.result() == refused.text
+        assert pool.busy == 1
+        assert session.interaction_count == 2
+        assert "final" not in session.interactions[-1]
+    finally:
+        model.release.set()
+        pool.close()
+
+
+def test_model_error_is_recorded_as_a_local_answer(gated):
+    agent, model, session = gated
+
+    def fail(prompt):
+        raise RuntimeError("upstream down")
+
+    model.generate_content = fail
+    answer = agent.assist_speculative("Explain photosynthesis", session, deadline=1.0)
+    assert answer.source == "local"
+    assert session.interaction_count == 1
+    assert session.interactions[-1]["metadata"]["source"] == "local"
+    assert _assistant_turns(session) == [answer.text]
+
+
+def test_replace_while_appending_from_another_thread():
+    from session_manager import ConversationMemory
+
+    memory = ConversationMemory(max_turns=50)
+    target = {"role": "assistant", "content": "speculative"}
+    memory.append(target)
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            memory.append({"role": "user", "content": "more"})
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            memory.replace(target, target)
+            memory.build_context(200)
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,35 @@
+"""
+Spaced-repetition study schedules
+"""
+
+import pytest
+
+from study_scheduler import StudyScheduler
+from tools import create_study_schedule
+
+
+@pytest.mark.parametrize("hours_per_day", [1.2, 0.75, 2.5, 2, 0.2])
+def test_every_hour_is_scheduled_whatever_the_block_size(hours_per_day):
+    result = create_study_schedule(["algebra", "biology"], days=3, hours_per_day=hours_per_day)
+    days = result["schedule"].values()
+    assert [day["duration_hours"] for day in days] == [pytest.approx(hours_per_day)] * 3
+    assert sum(result["topic_hours"].values()) == pytest.approx(3 * hours_per_day)
+    for day in days:
+        assert sum(session["duration_hours"] for session in day["sessions"]) == pytest.approx(hours_per_day)
+
+
+def test_weak_areas_get_more_time_and_every_topic_is_reviewed():
+    scheduler = StudyScheduler(days=14, hours_per_day=2)
+    result = scheduler.schedule(["algebra", "biology", "history"], weak_areas=["algebra"])
+    hours = result["topic_hours"]
+    assert hours["algebra"] > hours["biology"] == pytest.approx(hours["history"])
+
+    for topic in ("algebra", "biology", "history"):
+        kinds = [session["type"] for day in result["schedule"].values()
+                 for session in day["sessions"] if session["topic"] == topic]
+        assert kinds[0] == "learn" and kinds.count("learn") == 1 and "review" in kinds
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        StudyScheduler(days=3, hours_per_day=2, block_hours=0)
@@ -0,0 +1,112 @@
+"""
+Subject classification
+"""
+
+import math
+import random
+import re
+from collections import Counter
+
+import pytest
+
+import subject_classifier
+from session_manager import Session
+from subject_classifier import DEFAULT_TAXONOMY, SubjectClassifier, get_subject_classifier, set_subject_classifier
+
+QUERIES = [
+    "Can you help with my math homework?",
+    "History of SCIENCE and mathematics",
+    "programming in Python",
+    "I love reading",
+    "",
+    "literature, history, science, programming and math",
+]
+
+
+def _naive(taxonomy, text):
+    """Subjects in taxonomy order with any keyword as a case-insensitive substring"""
+    return [subject for subject, keywords in taxonomy.items()
+            if any(keyword.lower() in text.lower() for keyword in keywords)]
+
+
+def _naive_similarities(examples, text):
+    """Dense TF-IDF cosine similarity of the text to each subject's example centroid"""
+    def tokens(value):
+        return re.findall(r"\w+", value.lower())
+
+    documents = {subject: Counter(t for example in texts for t in tokens(example)) for subject, texts in examples.items()}
+    df = Counter(t for counts in documents.values() for t in counts)
+    idf = {t: math.log((1 + len(documents)) / (1 + n)) + 1 for t, n in df.items()}
+    vocabulary = sorted(idf)
+
+    def vector(counts):
+        v = [counts.get(t, 0) * idf[t] for t in vocabulary]
+        norm = math.sqrt(sum(x * x for x in v))
+        return [x / norm for x in v] if norm else v
+
+    query = vector(Counter(tokens(text)))
+    similarities = {subject: sum(a * b for a, b in zip(query, vector(counts))) for subject, counts in documents.items()}
+    return {subject: score for subject, score in similarities.items() if score}
+
+
+def test_default_taxonomy_matches_substring_tagging():
+    classifier = SubjectClassifier()
+    for query in QUERIES:
+        assert classifier.classify(query) == _naive(DEFAULT_TAXONOMY, query), query
+    assert classifier.classify(QUERIES[-1], top_k=2) == ["math", "science"]
+    assert classifier.primary(QUERIES[1]) == "math"  # Taxonomy order, not position in the text
+    assert classifier.primary("I love reading") is None
+
+
+def test_large_taxonomy_matches_a_naive_scan():
+    rng = random.Random(5)
+    taxonomy = {f"subject{i}": tuple("".join(rng.choice("abcdef") for _ in range(rng.randint(2, 5)))
+                                     for _ in range(rng.randint(1, 6)))
+                for i in range(80)}
+    classifier = SubjectClassifier(taxonomy)
+    assert classifier.matcher._automaton is not None  # Past the matcher's scan threshold
+    for _ in range(50):
+        text = " ".join("".join(rng.choice("abcdefg") for _ in range(rng.randint(1, 6))) for _ in range(8))
+        assert classifier.classify(text) == _naive(taxonomy, text), text
+
+
+def test_word_boundary_and_stem_options():
+    taxonomy = {"biology": ("plant", "cell"), "math": ("sum",)}
+    assert SubjectClassifier(taxonomy).classify("summary of plants") == ["biology", "math"]
+    assert SubjectClassifier(taxonomy, word_boundary=True).classify("summary of plants") == []
+    assert SubjectClassifier(taxonomy, stem=True).classify("summary of plants") == ["biology"]
+
+
+def test_tfidf_fallback_matches_a_dense_computation():
+    examples = {
+        "math": ["equations and derivatives", "solve the integral of x squared"],
+        "history": ["the roman empire fell", "causes of the first world war"],
+        "science": ["atoms molecules and chemical reactions", "the theory of evolution"],
+    }
+    classifier = SubjectClassifier().fit_tfidf(examples, min_similarity=0.05)
+    for text in ["why did the empire fall", "solve this integral", "the theory of the war", "nothing relevant"]:
+        similarities = classifier.similarities(text)
+        expected = _naive_similarities(examples, text)
+        assert similarities.keys() == expected.keys(), text
+        for subject, score in expected.items():
+            assert similarities[subject] == pytest.approx(score), (text, subject)
+        # Most similar first; equal scores by name, descending
+        ranked = sorted(((score, s) for s, score in similarities.items() if score >= 0.05), reverse=True)
+        assert classifier.classify(text) == [s for _, s in ranked], text
+
+    assert classifier.primary("why did the empire fall") == "history"
+    # A keyword match always wins over the fallback
+    assert classifier.classify("math about the roman empire") == ["math"]
+    with pytest.raises(KeyError):
+        SubjectClassifier().fit_tfidf({"art": ["painting"]})
+
+
+def test_shared_classifier_is_used_by_sessions(monkeypatch):
+    monkeypatch.setattr(subject_classifier, "_default_classifier", None)
+    assert get_subject_classifier() is get_subject_classifier()
+
+    set_subject_classifier(SubjectClassifier({"biology": ("plant",)}))
+    session = Session("s1")
+    session.add_interaction("How do plants grow?", "With light.")
+    assert session.progress_tracking["subjects_studied"] == {"biology"}
+    assert list(session.context_memory["recent_topics"]) == ["biology"]
@@ -0,0 +1,76 @@
+"""
+Compiled templates against str.format
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from templates import CompiledTemplate, TemplateRegistry
+
+VALUES = {
+    "topic": "Photosynthesis",
+    "level": 3,
+    "score": 87.456,
+    "ratio": 0.5,
+    "flag": True,
+    "items": ["light", "water", "CO2"],
+    "info": SimpleNamespace(name="Ms. Rivera", room=12),
+    "width": 12,
+    "quote": 'say "hi" \\ {not a field}',
+}
+
+TEMPLATES = [
+    "Lesson on {topic}",
+    "Plain text with {{braces}}, quotes \" ' and a backslash \\ and\nnewlines",
+    "{topic!r} {topic!s} {topic!a} {quote!r}",
+    "{score:.1f} | {score:>10.2f} | {level:03d} | {ratio:%} | {level:,}",
+    "{topic:^20} | {topic:*<12}",
+    "{flag} {flag!r} {level:x} {level:#b}",
+    "{items[0]} and {items[2]} from {info.name} in room {info.room}",
+    "{topic:>{width}} / {score:.{level}f}",
+    "{quote}",
+    "",
+]
+
+
+@pytest.mark.parametrize("source", TEMPLATES)
+def test_render_matches_str_format(source):
+    compiled = CompiledTemplate(source)
+    assert compiled.render(VALUES) == source.format(**VALUES)
+
+
+def test_fields_are_the_roots_the_template_reads():
+    compiled = CompiledTemplate("{items[0]} {info.name} {topic:>{width}} {topic}")
+    assert compiled.fields == ("items", "info", "topic", "width")
+
+
+@pytest.mark.parametrize("source", ["{0}", "{}", "{topic!x}", "{topic"])
+def test_invalid_templates_are_rejected(source):
+    with pytest.raises(ValueError):
+        CompiledTemplate(source)
+
+
+def test_render_errors_match_str_format():
+    with pytest.raises(KeyError):
+        CompiledTemplate("{topic} {level}").render({"topic": "x"})
+    for source in ("{topic:d}", "{topic:{{}}}"):
+        with pytest.raises(ValueError):
+            source.format(topic="x")
+        with pytest.raises(ValueError):
+            CompiledTemplate(source).render({"topic": "x"})
+
+
+def test_registry_cache_is_typed_and_follows_source_changes():
+    sources = {"value": "{v!r}"}
+    registry = TemplateRegistry(sources, cache_size=8)
+    assert [registry.render("value", v=v) for v in (1, 1.0, True)] == ["1", "1.0", "True"]
+    assert registry.render("value", v=[1, 2]) == "[1, 2]"  # Unhashable: rendered uncached
+
+    sources["value"] = "<{v}>"
+    assert registry.render("value", v=1) == "<1>"
+    registry.register("lesson", "{topic} for {grade}")
+    assert registry.render_many("lesson", [{"topic": "a"}, {"topic": "b"}], grade=5) == ["a for 5", "b for 5"]
+    assert "lesson" in registry and len(registry) == 2
+    with pytest.raises(KeyError):
+        registry.render("missing")
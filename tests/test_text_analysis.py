@@ -0,0 +1,108 @@
+"""
+Streaming readability analysis against whole-text analysis
+"""
+
+import random
+import re
+
+import pytest
+
+from text_analysis import HyperLogLog, TextComplexityAnalyzer, analyze_file, analyze_stream
+from tools import analyze_text_complexity
+
+SAMPLES = [
+    "",
+    "   \n ",
+    "One sentence without a full stop",
+    "Photosynthesis converts light energy. Plants make glucose!  Does it need water?? Yes...",
+    "Wait... what?! Mr. Smith's class starts at 9.30 a.m. on Monday.\n\nNew paragraph here.",
+    "   leading and trailing whitespace, then a break.   ",
+]
+
+
+def _baseline(text):
+    """The original whole-text analyze_text_complexity, kept as the reference"""
+    words = text.split()
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+    avg_sentence_length = len(words) / len(sentences) if sentences else 0
+    avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
+    unique_words = len(set(word.lower() for word in words))
+    lexical_density = (unique_words / len(words)) * 100 if words else 0
+    grade_level = max(1, min(12, round(0.39 * avg_sentence_length + 11.8 * (avg_word_length/6) - 15.59)))
+    return {
+        "word_count": len(words),
+        "sentence_count": len(sentences),
+        "avg_sentence_length": round(avg_sentence_length, 1),
+        "avg_word_length": round(avg_word_length, 1),
+        "unique_words": unique_words,
+        "lexical_density": round(lexical_density, 1),
+        "estimated_grade_level": grade_level,
+        "complexity": "Easy" if grade_level <= 6 else "Moderate" if grade_level <= 9 else "Advanced",
+        "reading_time_minutes": round(len(words) / 200, 1)
+    }
+
+
+def _random_text(rng, words=400):
+    vocabulary = ["the", "Cell", "divides", "energy", "photosynthesis", "is", "a", "process", "WATER", "light"]
+    pieces = []
+    for _ in range(words):
+        pieces.append(rng.choice(vocabulary))
+        pieces.append(rng.choice([" ", " ", " ", "  ", "\n", ". ", "! ", "?? ", "... ", ".", "\t"]))
+    return "".join(pieces)
+
+
+def _split(text, rng):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 40))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def _texts():
+    rng = random.Random(5)
+    return SAMPLES + [_random_text(rng) for _ in range(10)]
+
+
+@pytest.mark.parametrize("text", _texts())
+def test_whole_text_matches_the_original_metrics(text):
+    result = analyze_text_complexity(text)
+    assert {key: result[key] for key in _baseline(text)} == _baseline(text)
+
+
+@pytest.mark.parametrize("text", _texts())
+def test_chunked_input_matches_whole_text(text):
+    expected = analyze_text_complexity(text)
+    rng = random.Random(len(text))
+    for _ in range(10):
+        assert analyze_stream(_split(text, rng)) == expected
+    assert analyze_stream(list(text)) == expected  # One character at a time
+    assert analyze_text_complexity(iter([text])) == expected
+
+
+def test_analyze_file_matches_whole_text(tmp_path):
+    text = _random_text(random.Random(9), words=5000)
+    path = tmp_path / "essay.txt"
+    path.write_text(text, encoding="utf-8")
+    assert analyze_file(str(path), chunk_size=97) == analyze_text_complexity(text)
+
+
+def test_unique_words_switch_to_an_estimate():
+    words = [f"word{i}" for i in range(20000)]
+    analyzer = TextComplexityAnalyzer(exact_unique_limit=5000)
+    analyzer.feed(" ".join(words) + " ")
+    result = analyzer.result()
+    assert result["unique_words_approximate"]
+    assert result["unique_words"] == pytest.approx(20000, rel=0.03)
+    assert result["word_count"] == 20000
+
+
+def test_hyperloglog_add_update_and_merge_agree():
+    left, right, single = HyperLogLog(12), HyperLogLog(12), HyperLogLog(12)
+    items = [f"item{i}" for i in range(30000)]
+    left.update(items[:15000])
+    right.update(items[15000:])
+    for item in items:
+        single.add(item)
+    left.merge(right)
+    assert left.count() == pytest.approx(30000, rel=0.05)
+    assert single.count() == pytest.approx(30000, rel=0.05)
+    with pytest.raises(ValueError):
+        left.merge(HyperLogLog(10))
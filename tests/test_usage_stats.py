@@ -0,0 +1,73 @@
+"""
+Concurrency of the root agent's sharded usage statistics
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from usage_stats import UsageStats
+
+
+def _run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.slow
+def test_concurrent_records_are_not_lost():
+    stats = UsageStats()
+
+    def worker():
+        for i in range(5000):
+            stats.record(["math" if i % 2 else "science"])
+            stats.record_conversation()
+
+    _run_threads(8, worker)
+    assert stats.total_requests == 8 * 5000
+    assert stats.conversations == 8 * 5000
+    assert stats.subjects_covered == {"math", "science"}
+
+
+def test_finished_threads_fold_into_the_base():
+    stats = UsageStats()
+    for _ in range(50):
+        _run_threads(4, stats.record)
+    assert stats.live_shards == 0
+    assert stats.total_requests == 200
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda _: stats.record(), range(100)))
+        assert stats.live_shards <= 2
+    assert stats.live_shards == 0
+    assert stats.total_requests == 300
+
+
+def test_dict_style_access():
+    stats = UsageStats()
+    stats["total_requests"] += 1
+    stats["total_requests"] += 1
+    stats["subjects_covered"].add("math")
+    stats["subjects_covered"].update(["history"])
+    stats["last_active"] = stats["last_active"]
+    assert stats["total_requests"] == 2
+    assert stats.get("subjects_covered") == {"math", "history"}
+    assert stats.get("unknown", 0) == 0
+    with pytest.raises(KeyError):
+        stats["unknown"] = 1
+
+
+def test_root_agent_counts_conversations_without_sharing_memory():
+    from agents import RootAgent
+
+    root = RootAgent()
+    root.assist("What is photosynthesis?")
+    root.track_and_assist("Give me a math example")
+    assert root.get_stats()["conversations"] == 2
+    assert root.get_root_stats()["total_requests"] == 1
+    assert root._memory() is not root._memory()
+    assert root._memory().total_turns == 0
@@ -0,0 +1,14 @@
+"""
+Text Utilities for EduMentor AI
+Dependency-free text helpers shared by the agents and their worker processes
+"""
+
+from typing import Set
+
+
+def tokenize_response(text: str) -> Set[str]:
+    """Word set used to compare student responses"""
+    return set(text.lower().split())
+
+
+__all__ = ['tokenize_response']
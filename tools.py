@@ -3,11 +3,14 @@ Utility Tools and Functions for EduMentor
 Educational tools and helper functions
 """
 
-import json
-import re
-from typing import Dict, List, Any, Optional
-import random
-from datetime import datetime, timedelta
+import os
+from typing import Dict, List, Any, Optional, Iterable, Iterator, AsyncIterable, AsyncIterator, Union
+
+from keyword_matcher import get_keyword_matcher
+from quiz_bank import QuizBank
+from study_scheduler import StudyScheduler, progress_areas
+from templates import TemplateRegistry
+from text_analysis import TextComplexityAnalyzer, analyze_corpus
 
 # Core educational tools
 educational_tools = [
@@ -31,6 +34,8 @@ subject_tools = {
     "literature": ["Text Analyzer", "Writing Assistant", "Literary Device Finder", "Theme Explorer"]
 }
 
+_TRUNCATION_NOTICE = "...\n\n[Response truncated. Use detailed mode for full response]"
+
 def format_response(text: str, max_length: int = 500, include_summary: bool = True) -> str:
     """Format AI responses for readability"""
     if not text:
@@ -46,10 +51,90 @@ def format_response(text: str, max_length: int = 500, include_summary: bool = Tr
     
     # Truncate if too long
     if len(text) > max_length:
-        text = text[:max_length] + "...\n\n[Response truncated. Use detailed mode for full response]"
+        text = text[:max_length] + _TRUNCATION_NOTICE
     
     return text
 
+class _ResponseStreamFormatter:
+    """Incremental equivalent of format_response for streamed chunks"""
+    
+    def __init__(self, max_length: int = 500, include_summary: bool = True):
+        self.max_length = max_length
+        self.include_summary = include_summary
+        self.head = ""
+        self.head_done = False
+        self.pending = ""  # Trailing whitespace held back until more text arrives
+        self.emitted = 0
+        self.done = False
+    
+    def feed(self, chunk: str) -> List[str]:
+        """Consume one chunk and return the formatted pieces ready to emit"""
+        if self.done:
+            return []
+        
+        if not self.head_done:
+            # The summary needs the first 50+ words, so buffer until we know
+            self.head += chunk
+            if not self.head.strip() or (self.include_summary and len(self.head.split()) <= 50):
+                return []
+            self.head_done = True
+            chunk, self.head = self._open(self.head), ""
+        
+        return self._emit(chunk)
+    
+    def close(self) -> List[str]:
+        """Flush whatever is still buffered at the end of the stream"""
+        if self.done or self.head_done:
+            return []
+        
+        self.head_done = True
+        if not self.head.strip():
+            # As format_response: nothing at all is reported, whitespace formats to ""
+            self.done = True
+            return [] if self.head else ["No response generated."]
+        return self._emit(self._open(self.head))
+    
+    def _open(self, head: str) -> str:
+        head = head.lstrip()
+        if self.include_summary and len(head.split()) > 50:
+            head = f"📌 Summary: {head[:100]}...\n\n{head}"
+        return head
+    
+    def _emit(self, piece: str) -> List[str]:
+        piece = self.pending + piece
+        stripped = piece.rstrip()
+        self.pending = piece[len(stripped):]
+        if not stripped:
+            return []
+        
+        if self.emitted + len(stripped) > self.max_length:
+            self.done = True
+            return [stripped[:self.max_length - self.emitted] + _TRUNCATION_NOTICE]
+        
+        self.emitted += len(stripped)
+        return [stripped]
+
+def format_response_stream(chunks: Iterable[str], max_length: int = 500,
+                           include_summary: bool = True) -> Iterator[str]:
+    """Format streamed AI response chunks incrementally (see format_response)"""
+    formatter = _ResponseStreamFormatter(max_length, include_summary)
+    
+    # Keep draining after truncation so the producer can finish its bookkeeping
+    for chunk in chunks:
+        yield from formatter.feed(chunk)
+    yield from formatter.close()
+
+async def aformat_response_stream(chunks: AsyncIterable[str], max_length: int = 500,
+                                  include_summary: bool = True) -> AsyncIterator[str]:
+    """Async variant of format_response_stream"""
+    formatter = _ResponseStreamFormatter(max_length, include_summary)
+    
+    async for chunk in chunks:
+        for piece in formatter.feed(chunk):
+            yield piece
+    for piece in formatter.close():
+        yield piece
+
 def calculate_score(correct: int, total: int, weights: Optional[List[float]] = None) -> float:
     """Calculate weighted percentage score"""
     if total <= 0:
@@ -64,18 +149,31 @@ def calculate_score(correct: int, total: int, weights: Optional[List[float]] = N
         # Simple percentage
         return (correct / total) * 100
 
-def get_difficulty_level(age: int, subject: str = "general") -> str:
-    """Determine appropriate difficulty level"""
+_AGE_LEVELS = ["Beginner", "Elementary", "Intermediate", "Advanced", "University"]
+
+def get_difficulty_level(age: int, subject: str = "general", performance: Optional[float] = None) -> str:
+    """Determine appropriate difficulty level
+    
+    `performance` is a recent average score (0-100), e.g. a TutorAgent
+    profile mean; strong or weak performance shifts the age level one step.
+    """
     if age < 8:
-        base_level = "Beginner"
+        index = 0
     elif age < 12:
-        base_level = "Elementary"
+        index = 1
     elif age < 16:
-        base_level = "Intermediate"
+        index = 2
     elif age < 19:
-        base_level = "Advanced"
+        index = 3
     else:
-        base_level = "University"
+        index = 4
+    
+    if performance is not None:
+        if performance >= 85:
+            index = min(index + 1, len(_AGE_LEVELS) - 1)
+        elif performance < 70:
+            index = max(index - 1, 0)
+    base_level = _AGE_LEVELS[index]
     
     # Adjust for subject
     subject_adjustments = {
@@ -86,38 +184,54 @@ def get_difficulty_level(age: int, subject: str = "general") -> str:
     
     return subject_adjustments.get(subject, {}).get(base_level, base_level)
 
-def generate_quiz(topic: str, num_questions: int = 5, q_type: str = "multiple_choice") -> Dict:
-    """Generate quiz questions on a topic"""
-    question_templates = {
-        "multiple_choice": {
-            "science": [
-                {
-                    "question": "What process do plants use to convert sunlight into energy?",
-                    "options": ["Respiration", "Photosynthesis", "Transpiration", "Germination"],
-                    "answer": 1,
-                    "explanation": "Photosynthesis is the process where plants convert light energy into chemical energy."
-                }
-            ],
-            "math": [
-                {
-                    "question": "What is the value of π (pi) approximately?",
-                    "options": ["3.14", "2.71", "1.61", "4.67"],
-                    "answer": 0,
-                    "explanation": "π is approximately 3.14159, often rounded to 3.14."
-                }
-            ]
-        },
-        "true_false": {
-            "general": [
-                {
-                    "question": "The Earth revolves around the Sun.",
-                    "answer": True,
-                    "explanation": "Yes, the Earth orbits the Sun, which is a fundamental principle of our solar system."
-                }
-            ]
-        }
+# Built-in questions; indexed once into the default quiz bank
+question_templates = {
+    "multiple_choice": {
+        "science": [
+            {
+                "question": "What process do plants use to convert sunlight into energy?",
+                "options": ["Respiration", "Photosynthesis", "Transpiration", "Germination"],
+                "answer": 1,
+                "explanation": "Photosynthesis is the process where plants convert light energy into chemical energy."
+            }
+        ],
+        "math": [
+            {
+                "question": "What is the value of π (pi) approximately?",
+                "options": ["3.14", "2.71", "1.61", "4.67"],
+                "answer": 0,
+                "explanation": "π is approximately 3.14159, often rounded to 3.14."
+            }
+        ]
+    },
+    "true_false": {
+        "general": [
+            {
+                "question": "The Earth revolves around the Sun.",
+                "answer": True,
+                "explanation": "Yes, the Earth orbits the Sun, which is a fundamental principle of our solar system."
+            }
+        ]
     }
-    
+}
+
+QUIZ_BANK_PATH_ENV = "EDUMENTOR_QUIZ_BANK"
+_quiz_bank = None
+
+def get_quiz_bank() -> QuizBank:
+    """Shared quiz bank: the built-in questions plus $EDUMENTOR_QUIZ_BANK, if set"""
+    global _quiz_bank
+    if _quiz_bank is None:
+        bank = QuizBank.from_templates(question_templates)
+        path = os.environ.get(QUIZ_BANK_PATH_ENV)
+        if path and os.path.exists(path):
+            bank.load_file(path)
+        _quiz_bank = bank
+    return _quiz_bank
+
+def generate_quiz(topic: str, num_questions: int = 5, q_type: str = "multiple_choice",
+                  difficulty: Optional[str] = None, seed: Any = None) -> Dict:
+    """Generate quiz questions on a topic"""
     # Select appropriate template
     subject = "general"
     for sub in ["science", "math", "history"]:
@@ -125,30 +239,25 @@ def generate_quiz(topic: str, num_questions: int = 5, q_type: str = "multiple_ch
             subject = sub
             break
     
-    # Generate questions
-    questions = []
-    templates = question_templates.get(q_type, {}).get(subject, [])
-    
-    for i in range(num_questions):
-        if templates:
-            template = templates[i % len(templates)].copy()
-            template["question"] = template["question"].replace("{topic}", topic)
-            questions.append(template)
-        else:
-            # Fallback question
-            questions.append({
-                "question": f"What is an important fact about {topic}?",
-                "options": ["Option A", "Option B", "Option C", "Option D"] if q_type == "multiple_choice" else None,
-                "answer": 0 if q_type == "multiple_choice" else True,
-                "explanation": f"This question tests your understanding of {topic}."
-            })
+    quiz = get_quiz_bank().generate_quiz(topic, num_questions, q_type, subject, difficulty, seed)
+    if not quiz["questions"]:
+        # Fallback questions
+        quiz["questions"] = [{
+            "question": f"What is an important fact about {topic}?",
+            "options": ["Option A", "Option B", "Option C", "Option D"] if q_type == "multiple_choice" else None,
+            "answer": 0 if q_type == "multiple_choice" else True,
+            "explanation": f"This question tests your understanding of {topic}."
+        } for _ in range(num_questions)]
     
+    return quiz
+
+def generate_class_quizzes(student_ids: List[str], topic: str, num_questions: int = 5,
+                           q_type: str = "multiple_choice", difficulty: Optional[str] = None,
+                           seed: Any = 0) -> Dict[str, Dict]:
+    """One quiz per student, reproducible from (seed, student_id)"""
     return {
-        "topic": topic,
-        "type": q_type,
-        "total_questions": num_questions,
-        "questions": questions,
-        "generated_at": datetime.now().isoformat()
+        student_id: generate_quiz(topic, num_questions, q_type, difficulty, f"{seed}:{student_id}")
+        for student_id in student_ids
     }
 
 def create_lesson_plan(topic: str, duration: str = "1 hour", level: str = "Intermediate") -> Dict:
@@ -183,34 +292,18 @@ def create_lesson_plan(topic: str, duration: str = "1 hour", level: str = "Inter
     
     return plan
 
-def analyze_text_complexity(text: str) -> Dict:
-    """Analyze text complexity for educational purposes"""
-    words = text.split()
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    # Calculate metrics
-    avg_sentence_length = len(words) / len(sentences) if sentences else 0
-    avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
-    unique_words = len(set(word.lower() for word in words))
-    lexical_density = (unique_words / len(words)) * 100 if words else 0
-    
-    # Determine grade level (simplified Flesch-Kincaid)
-    grade_level = max(1, min(12, round(0.39 * avg_sentence_length + 11.8 * (avg_word_length/6) - 15.59)))
-    
-    complexity = "Easy" if grade_level <= 6 else "Moderate" if grade_level <= 9 else "Advanced"
+def analyze_text_complexity(text: Union[str, Iterable[str]], **options) -> Dict:
+    """Analyze text complexity for educational purposes
     
-    return {
-        "word_count": len(words),
-        "sentence_count": len(sentences),
-        "avg_sentence_length": round(avg_sentence_length, 1),
-        "avg_word_length": round(avg_word_length, 1),
-        "unique_words": unique_words,
-        "lexical_density": round(lexical_density, 1),
-        "estimated_grade_level": grade_level,
-        "complexity": complexity,
-        "reading_time_minutes": round(len(words) / 200, 1)  # 200 wpm average
-    }
+    `text` may also be an iterable of chunks (e.g. a file read piece by
+    piece); see text_analysis for file helpers and the streaming options.
+    """
+    analyzer = TextComplexityAnalyzer(**options)
+    if isinstance(text, str):
+        analyzer.feed(text)
+    else:
+        analyzer.feed_all(text)
+    return analyzer.result()
 
 # Educational content templates
 lesson_templates = {
@@ -287,91 +380,82 @@ Solution: {solution2}
 """
 }
 
+# Compiled once, on first render; edits to lesson_templates are picked up
+LESSON_TEMPLATES = TemplateRegistry(lesson_templates)
+
 def get_template(template_type: str, **kwargs) -> str:
     """Get formatted template with variables filled"""
-    template = lesson_templates.get(template_type.lower(), "")
-    if template:
-        return template.format(**kwargs)
+    name = template_type.lower()
+    if lesson_templates.get(name):
+        return LESSON_TEMPLATES.render(name, **kwargs)
     return f"Template for {template_type} not found."
 
-def create_study_schedule(topics: List[str], days: int = 7, hours_per_day: int = 2) -> Dict:
-    """Create personalized study schedule"""
-    total_hours = days * hours_per_day
-    hours_per_topic = max(1, total_hours // len(topics))
-    
-    schedule = {}
-    current_date = datetime.now().date()
-    
-    for i, topic in enumerate(topics):
-        day_offset = i % days
-        study_date = current_date + timedelta(days=day_offset)
-        
-        schedule[f"Day {i+1}"] = {
-            "date": study_date.isoformat(),
-            "topic": topic,
-            "duration_hours": hours_per_topic,
-            "activities": [
-                "Review previous concepts",
-                "Study new material",
-                "Practice problems",
-                "Self-assessment"
-            ],
-            "goals": [
-                f"Understand key concepts of {topic}",
-                "Complete practice exercises",
-                "Identify areas needing review"
-            ]
-        }
-    
-    return {
-        "total_days": days,
-        "total_hours": total_hours,
-        "hours_per_day": hours_per_day,
-        "topics_covered": topics,
-        "schedule": schedule,
-        "recommendations": [
-            "Take regular breaks (5-10 minutes per hour)",
-            "Review previous topics weekly",
-            "Practice recall through self-testing"
-        ]
-    }
+def get_templates(template_type: str, rows: List[Dict], **shared) -> List[str]:
+    """Fill one template for many value sets, e.g. every topic in a syllabus"""
+    name = template_type.lower()
+    if lesson_templates.get(name):
+        return LESSON_TEMPLATES.render_many(name, rows, **shared)
+    return [f"Template for {template_type} not found." for _ in rows]
 
-def validate_student_response(response: str, expected_keywords: List[str]) -> Dict:
-    """Validate student response against expected keywords"""
-    response_lower = response.lower()
-    
-    found_keywords = []
-    missing_keywords = []
-    
-    for keyword in expected_keywords:
-        if keyword.lower() in response_lower:
-            found_keywords.append(keyword)
-        else:
-            missing_keywords.append(keyword)
-    
-    completeness = (len(found_keywords) / len(expected_keywords)) * 100 if expected_keywords else 0
+def create_study_schedule(topics: List[str], days: int = 7, hours_per_day: float = 2,
+                          session: Any = None, weak_areas: Optional[List[str]] = None,
+                          strong_areas: Optional[List[str]] = None, **options) -> Dict:
+    """Create personalized study schedule
+
+    Every available hour is allocated, weighted towards weak areas (taken
+    from `session.progress_tracking` unless given), and each topic is
+    reviewed at spaced-repetition intervals. `options` go to StudyScheduler
+    (block_hours, weak_weight, strong_weight, review_intervals, start_date).
+    """
+    session_weak, session_strong = progress_areas(session)
+    scheduler = StudyScheduler(days, hours_per_day, **options)
+    return scheduler.schedule(
+        topics,
+        session_weak if weak_areas is None else weak_areas,
+        session_strong if strong_areas is None else strong_areas
+    )
+
+def create_cohort_schedules(topics: List[str], students: Dict[str, Any], days: int = 7,
+                            hours_per_day: float = 2, **options) -> Dict[str, Dict]:
+    """Study schedules for a whole cohort ({student_id: Session or progress_tracking})"""
+    return StudyScheduler(days, hours_per_day, **options).schedule_cohort(topics, students)
+
+def validate_student_response(response: str, expected_keywords: List[str],
+                              word_boundary: bool = False, stem: bool = False) -> Dict:
+    """Validate student response against expected keywords
     
-    return {
-        "response_length": len(response),
-        "found_keywords": found_keywords,
-        "missing_keywords": missing_keywords,
-        "completeness_score": round(completeness, 1),
-        "has_adequate_detail": len(response.split()) >= 20,
-        "suggestions": f"Include concepts like: {', '.join(missing_keywords)}" if missing_keywords else "Good coverage of key concepts"
-    }
+    The keywords are compiled into a matcher once and reused for later
+    calls with the same rubric. `word_boundary` stops keywords matching
+    inside other words; `stem` also matches simple inflections.
+    """
+    return get_keyword_matcher(tuple(expected_keywords), word_boundary, stem).validate(response)
+
+def validate_responses(responses: Iterable[str], expected_keywords: List[str],
+                       word_boundary: bool = False, stem: bool = False) -> List[Dict]:
+    """Validate many responses against the same keywords in one call"""
+    return get_keyword_matcher(tuple(expected_keywords), word_boundary, stem).validate_many(responses)
 
 # Export all functions and variables
 __all__ = [
     'educational_tools',
     'subject_tools',
     'format_response',
+    'format_response_stream',
+    'aformat_response_stream',
     'calculate_score',
     'get_difficulty_level',
     'generate_quiz',
+    'generate_class_quizzes',
+    'get_quiz_bank',
     'create_lesson_plan',
     'analyze_text_complexity',
+    'analyze_corpus',
     'lesson_templates',
+    'LESSON_TEMPLATES',
     'get_template',
+    'get_templates',
     'create_study_schedule',
-    'validate_student_response'
+    'create_cohort_schedules',
+    'validate_student_response',
+    'validate_responses'
     ]
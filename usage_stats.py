@@ -0,0 +1,176 @@
+"""
+Usage Statistics for EduMentor AI
+Per-thread sharded counters for agents shared across threads and tasks
+"""
+
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+class _Shard:
+    __slots__ = ("requests", "conversations", "subjects", "last_active")
+
+    def __init__(self):
+        self.requests = 0
+        self.conversations = 0
+        self.subjects: Set[str] = set()
+        self.last_active = 0.0
+
+    def merge(self, other: "_Shard"):
+        self.requests += other.requests
+        self.conversations += other.conversations
+        self.subjects.update(list(other.subjects))
+        self.last_active = max(self.last_active, other.last_active)
+
+
+class _ShardHandle:
+    """Thread-local owner of a shard; collected when its thread ends"""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: _Shard):
+        self.shard = shard
+
+
+def _retire(stats_ref, shard: _Shard):
+    stats = stats_ref()
+    if stats is not None:
+        stats._retire(shard)
+
+
+class _SubjectSet(set):
+    """Copy of the covered subjects whose add/update are also recorded (old dict-style use)"""
+
+    def __init__(self, subjects: Iterable[str], stats: "UsageStats"):
+        super().__init__(subjects)
+        self._stats = stats
+
+    def add(self, subject: str):
+        super().add(subject)
+        self._stats._shard().subjects.add(subject)
+
+    def update(self, *others: Iterable[str]):
+        for subjects in others:
+            subjects = list(subjects)
+            super().update(subjects)
+            self._stats._shard().subjects.update(subjects)
+
+
+class UsageStats:
+    """Request and conversation counters, subject set and last-activity time for a shared agent
+
+    Each thread updates its own shard, so recording takes no lock and no
+    update is lost however many threads call in; asyncio tasks on one
+    thread share that thread's shard, which is safe because an update
+    never awaits. When a thread ends its shard is folded into a base
+    shard, so threads started per request leave nothing behind. Reads add
+    up the live shards and the base under the lock. Supports the old
+    dict-style access (`stats["total_requests"] += 1`,
+    `stats["subjects_covered"].add(subject)`), which is not atomic across
+    threads; prefer record().
+    """
+
+    KEYS = ("total_requests", "subjects_covered", "last_active")
+
+    def __init__(self):
+        self._local = threading.local()
+        self._base = _Shard()
+        self._shards: Set[_Shard] = set()  # Shards of live threads
+        self._lock = threading.Lock()  # Taken on reads, and when a thread first records or ends
+        self._created = time.time()
+
+    def _shard(self) -> _Shard:
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            shard = _Shard()
+            handle = self._local.handle = _ShardHandle(shard)
+            weakref.finalize(handle, _retire, weakref.ref(self), shard)
+            with self._lock:
+                self._shards.add(shard)
+        return handle.shard
+
+    def _retire(self, shard: _Shard):
+        """Fold a finished thread's shard into the base"""
+        with self._lock:
+            if shard in self._shards:
+                self._shards.discard(shard)
+                self._base.merge(shard)
+
+    def record(self, subjects: Iterable[str] = ()):
+        """Count one request (and the subjects it touched)"""
+        shard = self._shard()
+        shard.requests += 1
+        if subjects:
+            shard.subjects.update(subjects)
+        shard.last_active = time.time()
+
+    def record_conversation(self):
+        """Count one question-and-answer exchange"""
+        shard = self._shard()
+        shard.conversations += 1
+        shard.last_active = time.time()
+
+    def _total(self) -> _Shard:
+        total = _Shard()
+        with self._lock:
+            total.merge(self._base)
+            for shard in self._shards:
+                total.merge(shard)
+        return total
+
+    @property
+    def total_requests(self) -> int:
+        return self._total().requests
+
+    @property
+    def conversations(self) -> int:
+        return self._total().conversations
+
+    @property
+    def subjects_covered(self) -> Set[str]:
+        return self._total().subjects
+
+    @property
+    def last_active(self) -> datetime:
+        return datetime.fromtimestamp(max(self._created, self._total().last_active))
+
+    @property
+    def live_shards(self) -> int:
+        """Threads currently holding a shard"""
+        with self._lock:
+            return len(self._shards)
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self._total()
+        return {
+            "total_requests": total.requests,
+            "subjects_covered": total.subjects,
+            "last_active": datetime.fromtimestamp(max(self._created, total.last_active))
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        if key == "subjects_covered":
+            return _SubjectSet(self.subjects_covered, self)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        shard = self._shard()
+        if key == "total_requests":
+            shard.requests += value - self.total_requests
+        elif key == "subjects_covered":
+            shard.subjects.update(value)  # Subjects are only ever added
+        elif key == "last_active":
+            shard.last_active = value.timestamp()
+        else:
+            raise KeyError(key)
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        return self[key] if key in self.KEYS else default
+
+
+__all__ = ['UsageStats']